@@ -0,0 +1,180 @@
+"""
+Batched evaluation engine for the offline AtoZ_3.1 test scripts.
+
+Images are decoded (and, for the photo-based tests, run through hand
+detection and skeleton rendering) on a background thread while the
+previous batch is on the model. Then one predict_batch call is made per
+``batch_size`` images. Group and letter mapping is left to the caller,
+which gets the whole (N, 8) probability matrix to work on with numpy.
+"""
+
+import glob
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from string import ascii_uppercase
+
+import cv2
+import numpy as np
+
+from predictor import LETTER_GROUPS
+from rule_engine import classify
+from skeleton_renderer import render_skeleton
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_DIR = os.path.join(BASE_DIR, 'AtoZ_3.1')
+
+# Expected CNN group per letter, indexed like ascii_uppercase
+EXPECTED_GROUPS = np.array([LETTER_GROUPS[letter] for letter in ascii_uppercase])
+
+EvalResult = namedtuple('EvalResult', ['probs', 'ok', 'payloads', 'errors', 'timings'])
+
+
+def list_dataset(samples_per_letter=None, dataset_dir=DATASET_DIR):
+    """``{letter: [paths]}`` with the first ``samples_per_letter`` sorted images.
+
+    A letter whose folder is missing maps to None; an empty folder gives [].
+    """
+    dataset = {}
+    for letter in ascii_uppercase:
+        folder = os.path.join(dataset_dir, letter)
+        if not os.path.isdir(folder):
+            dataset[letter] = None
+            continue
+        paths = sorted(glob.glob(os.path.join(folder, '*.jpg')))
+        dataset[letter] = paths[:samples_per_letter] if samples_per_letter else paths
+    return dataset
+
+
+def flatten(dataset):
+    """Paths and their letter indices (into ascii_uppercase) as parallel lists."""
+    paths = []
+    letters = []
+    for i, letter in enumerate(ascii_uppercase):
+        for path in dataset.get(letter) or []:
+            paths.append(path)
+            letters.append(i)
+    return paths, np.array(letters, dtype=np.int64)
+
+
+def read_skeleton(path):
+    """Decode a skeleton image as model input; no per-sample payload."""
+    img = cv2.imread(path)
+    if img is None:
+        raise ValueError('Failed to load image')
+    if img.shape[:2] != (400, 400):
+        img = cv2.resize(img, (400, 400))
+    return img, None
+
+
+def load_landmarks(detector, img_path):
+    """Detect the hand in a dataset photo; returns its landmarks or raises."""
+    img = cv2.imread(img_path)
+    if img is None:
+        raise ValueError('Failed to load image')
+
+    hands = detector.findHands(img, draw=False, flipType=True)
+    if not hands or not hands[0]:
+        raise ValueError('No hand detected')
+
+    hand = hands[0]
+    hmap = hand[0] if isinstance(hand, (list, tuple)) else hand
+    return hmap['lmList']
+
+
+def predict_letter(model, pts, bbox=None):
+    """One hand through render, CNN and the letter rules; ``bbox`` as in render_skeleton."""
+    prob = np.array(model.predict(render_skeleton(pts, bbox=bbox)), dtype='float32')
+    ch1 = int(np.argmax(prob, axis=0))
+    prob[ch1] = 0
+    ch2 = int(np.argmax(prob, axis=0))
+    return classify(ch1, ch2, pts)
+
+
+def top2(prob):
+    """(ch1, ch2) per row, with the same tie-breaking as repeated np.argmax."""
+    order = np.argsort(-prob, axis=1, kind='stable')
+    return order[:, :2]
+
+
+def _prepare_batch(prepare, paths):
+    start = time.perf_counter()
+    images = []
+    ok = []
+    payloads = []
+    errors = []
+    for path in paths:
+        try:
+            image, payload = prepare(path)
+        except Exception as e:
+            images.append(None)
+            ok.append(False)
+            payloads.append(None)
+            errors.append(str(e))
+            continue
+        images.append(image)
+        ok.append(True)
+        payloads.append(payload)
+        errors.append(None)
+    return images, ok, payloads, errors, time.perf_counter() - start
+
+
+def evaluate(model, paths, prepare=read_skeleton, batch_size=32, progress=None):
+    """Run ``model`` over ``paths`` in batches.
+
+    ``prepare(path)`` returns ``(image, payload)`` or raises; the exception
+    message is kept in ``errors`` and that row's ``ok`` is False. Rows of
+    ``probs`` for failed samples are zero. ``progress(done, total)`` is
+    called after every batch.
+    """
+    n = len(paths)
+    probs = np.zeros((n, 8), dtype=np.float32)
+    ok = np.zeros(n, dtype=bool)
+    payloads = [None] * n
+    errors = [None] * n
+    decode_time = 0.0
+    predict_time = 0.0
+    batches = 0
+    start = time.perf_counter()
+
+    chunks = [(i, paths[i:i + batch_size]) for i in range(0, n, batch_size)]
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(_prepare_batch, prepare, chunks[0][1]) if chunks else None
+        for k, (offset, chunk) in enumerate(chunks):
+            images, chunk_ok, chunk_payloads, chunk_errors, elapsed = pending.result()
+            if k + 1 < len(chunks):
+                pending = pool.submit(_prepare_batch, prepare, chunks[k + 1][1])
+            decode_time += elapsed
+
+            end = offset + len(chunk)
+            ok[offset:end] = chunk_ok
+            payloads[offset:end] = chunk_payloads
+            errors[offset:end] = chunk_errors
+            rows = [j for j, good in enumerate(chunk_ok) if good]
+            if rows:
+                t = time.perf_counter()
+                probs[offset + np.array(rows)] = model.predict_batch(np.stack([images[j] for j in rows]))
+                predict_time += time.perf_counter() - t
+                batches += 1
+            if progress:
+                progress(end, n)
+
+    total_time = time.perf_counter() - start
+    timings = {
+        'batch_size': batch_size,
+        'batches': batches,
+        'images': n,
+        'decode_s': decode_time,
+        'predict_s': predict_time,
+        'total_s': total_time,
+        'images_per_s': n / total_time if total_time else 0.0,
+    }
+    return EvalResult(probs, ok, payloads, errors, timings)
+
+
+def print_timings(timings):
+    workers = f", {timings['workers']} workers" if 'workers' in timings else ''
+    print(f"⏱  {timings['images']} images in {timings['total_s']:.2f}s "
+          f"({timings['images_per_s']:.1f} img/s, batch {timings['batch_size']}{workers}): "
+          f"decode {timings['decode_s']:.2f}s, predict {timings['predict_s']:.2f}s over {timings['batches']} batches")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Replays held signs through render + CNN with and without InferenceCache.
+
+Each cached AtoZ_3.1 hand is held for --hold frames. Every frame moves the
+landmarks by up to --jitter pixels, the way a still hand shakes in front
+of the camera. The script reports the cache hit rate, CPU time per frame
+and how many emitted letters differ from running the CNN on every frame.
+"""
+
+import time
+
+import numpy as np
+
+from inference_cache import CACHE_SIZE, TOLERANCE, InferenceCache
+from landmark_cache import CACHE_PATH, FOUND, LandmarkCache
+from predictor import BACKEND, BACKENDS, VARIANT, VARIANTS, load_backend, resolve_model
+from rule_engine import classify
+from skeleton_renderer import SkeletonRenderer
+
+
+def held_frames(cache_path=CACHE_PATH, hands=100, hold=30, jitter=1, seed=0):
+    """``(pts, bbox)`` per frame: each recorded hand repeated ``hold`` times with jitter."""
+    cache = LandmarkCache.load(cache_path)
+    found = cache.status == FOUND
+    rng = np.random.default_rng(seed)
+    frames = []
+    for landmarks, bbox in zip(cache.landmarks[found][:hands], cache.bbox[found][:hands]):
+        for _ in range(hold):
+            pts = landmarks[:, :2] + rng.integers(-jitter, jitter + 1, landmarks[:, :2].shape)
+            frames.append((pts.tolist(), tuple(int(v) for v in bbox)))
+    return frames
+
+
+def run(model, frames, cache=None):
+    renderer = SkeletonRenderer()
+    letters = []
+    start = time.process_time()
+    for pts, bbox in frames:
+        _, _, w, h = bbox
+        prob = None
+        if cache is not None:
+            key, vector = cache.signature(pts, bbox)
+            prob = cache.get(key, vector)
+        # The realtime path renders every frame for the preview
+        white = renderer.render(pts, w, h).copy()
+        if prob is None:
+            prob = model.predict(white)
+            if cache is not None:
+                cache.put(key, vector, prob)
+        ch1, ch2 = np.argsort(-np.asarray(prob, dtype='float32'), kind='stable')[:2]
+        letters.append(str(classify(ch1, ch2, pts)))
+    return letters, (time.process_time() - start) / len(frames)
+
+
+def main(backend=None, variant=None, cache_path=CACHE_PATH, hands=100, hold=30, jitter=1,
+         size=CACHE_SIZE, tolerance=TOLERANCE, seed=0):
+    frames = held_frames(cache_path, hands, hold, jitter, seed)
+    if not frames:
+        print("No cached hands; build the cache with landmark_cache.py first")
+        return None
+    name, model_path = resolve_model(backend, variant)
+    model = load_backend(name, model_path)
+    cache = InferenceCache(size, tolerance)
+
+    reference, uncached = run(model, frames)
+    letters, cached = run(model, frames, cache)
+    changed = sum(a != b for a, b in zip(reference, letters))
+
+    stats = cache.stats()
+    print(f"{len(frames)} frames ({len(frames) // hold} hands x {hold}, jitter +/-{jitter}px)")
+    print(f"Cache: size {size}, tolerance {tolerance}, hit rate {stats['hit_rate'] * 100:.1f}%, "
+          f"{stats['evictions']} evictions")
+    print(f"CPU per frame: {uncached * 1000:.2f} ms uncached, {cached * 1000:.2f} ms cached "
+          f"({uncached / cached if cached else float('inf'):.1f}x)")
+    print(f"Letters changed by the cache: {changed}/{len(frames)}")
+    return stats, changed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Measure the inference cache on simulated held signs')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=None,
+                        help=f'Inference backend (default: {BACKEND})')
+    parser.add_argument('--variant', choices=VARIANTS, default=None, help=f'Model variant (default: {VARIANT})')
+    parser.add_argument('--cache', default=CACHE_PATH, help=f'Landmark cache (default: {CACHE_PATH})')
+    parser.add_argument('--hands', type=int, default=100, help='Recorded hands to replay (default: 100)')
+    parser.add_argument('--hold', type=int, default=30, help='Frames each hand is held (default: 30)')
+    parser.add_argument('--jitter', type=int, default=1, help='Per-frame landmark jitter in pixels (default: 1)')
+    parser.add_argument('--size', type=int, default=CACHE_SIZE, help=f'Cache entries (default: {CACHE_SIZE})')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help=f'Quantization cell as a fraction of the bbox (default: {TOLERANCE})')
+    parser.add_argument('--seed', type=int, default=0, help='Jitter seed (default: 0)')
+
+    args = parser.parse_args()
+    main(backend=args.backend, variant=args.variant, cache_path=args.cache, hands=args.hands, hold=args.hold,
+         jitter=args.jitter, size=args.size, tolerance=args.tolerance, seed=args.seed)
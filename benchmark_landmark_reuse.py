@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Side-by-side benchmark: second findHands pass on the ROI crop vs. reusing the
+translated first-pass landmarks.
+
+Runs both modes over the same recorded session (a video file, or a camera
+index) and reports the detection latency saved, how far the landmarks move
+and whether the predicted letters change.
+"""
+
+import json
+import time
+
+import cv2
+import numpy as np
+from cvzone.HandTrackingModule import HandDetector
+
+from batch_eval import predict_letter
+from hand_tracking import crop_landmarks, first_hand
+from predictor import load_backend
+
+
+def percentile_ms(values, q):
+    return float(np.percentile(values, q) * 1000) if values else 0.0
+
+
+def run(source, max_frames=500, offset=29, save_path=None):
+    capture = cv2.VideoCapture(int(source) if str(source).isdigit() else source)
+    model = load_backend()
+    hd = HandDetector(maxHands=1)
+    hd2 = HandDetector(maxHands=1)
+
+    first_pass = []
+    second_pass = []
+    translate = []
+    deviations = []
+    frames = 0
+    compared = 0
+    agree = 0
+    confusions = {}
+
+    while frames < max_frames:
+        ok, frame = capture.read()
+        if not ok or frame is None:
+            break
+        frames += 1
+        frame = cv2.flip(frame, 1)
+
+        start = time.perf_counter()
+        hand = first_hand(hd.findHands(frame, draw=False, flipType=True))
+        first_pass.append(time.perf_counter() - start)
+        if hand is None:
+            continue
+        x, y, w, h = hand['bbox']
+        image = frame[y - offset:y + h + offset, x - offset:x + w + offset]
+        if image.size == 0:
+            continue
+
+        start = time.perf_counter()
+        handz = first_hand(hd2.findHands(image, draw=False, flipType=True))
+        second_pass.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        reused = crop_landmarks(hand['lmList'], hand['bbox'], offset)
+        translate.append(time.perf_counter() - start)
+
+        if handz is None:
+            continue
+        pts = handz['lmList']
+        a = np.array([p[:2] for p in pts], dtype=np.float32)
+        b = np.array([p[:2] for p in reused], dtype=np.float32)
+        deviations.append(float(np.linalg.norm(a - b, axis=1).mean()))
+
+        # Sized by the first-pass bbox, like the realtime render stage
+        letter_second = predict_letter(model, pts, hand['bbox'])
+        letter_reused = predict_letter(model, reused, hand['bbox'])
+        compared += 1
+        if letter_second == letter_reused:
+            agree += 1
+        else:
+            key = f"{letter_second}->{letter_reused}"
+            confusions[key] = confusions.get(key, 0) + 1
+
+    capture.release()
+
+    report = {
+        'source': str(source),
+        'frames': frames,
+        'frames_compared': compared,
+        'first_pass_ms': {'p50': percentile_ms(first_pass, 50), 'p99': percentile_ms(first_pass, 99)},
+        'second_pass_ms': {'p50': percentile_ms(second_pass, 50), 'p99': percentile_ms(second_pass, 99)},
+        'translate_ms': {'p50': percentile_ms(translate, 50), 'p99': percentile_ms(translate, 99)},
+        'saved_ms_per_frame': (float(np.mean(second_pass)) - float(np.mean(translate))) * 1000 if second_pass else 0.0,
+        'mean_landmark_deviation_px': float(np.mean(deviations)) if deviations else 0.0,
+        'letter_agreement': (agree / compared * 100) if compared else 0.0,
+        'letter_changes': dict(sorted(confusions.items(), key=lambda kv: kv[1], reverse=True)),
+    }
+
+    print("=" * 50)
+    print(f"Frames read: {frames}, compared: {compared}")
+    print(f"First pass   p50 {report['first_pass_ms']['p50']:.2f} ms  p99 {report['first_pass_ms']['p99']:.2f} ms")
+    print(f"Second pass  p50 {report['second_pass_ms']['p50']:.2f} ms  p99 {report['second_pass_ms']['p99']:.2f} ms")
+    print(f"Translate    p50 {report['translate_ms']['p50']:.3f} ms")
+    print(f"Saved per frame: {report['saved_ms_per_frame']:.2f} ms")
+    print(f"Mean landmark deviation: {report['mean_landmark_deviation_px']:.2f} px")
+    print(f"Letter agreement: {report['letter_agreement']:.1f}%")
+    for key, n in report['letter_changes'].items():
+        print(f"  {key}: {n}")
+
+    if save_path:
+        with open(save_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {save_path}")
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark landmark reuse against the second findHands pass')
+    parser.add_argument('source', help='Recorded session video file, or a camera index')
+    parser.add_argument('--frames', type=int, default=500, help='Maximum frames to process (default: 500)')
+    parser.add_argument('--offset', type=int, default=29, help='ROI crop margin in pixels (default: 29)')
+    parser.add_argument('--save', help='Write the JSON report to this path')
+
+    args = parser.parse_args()
+    run(args.source, max_frames=args.frames, offset=args.offset, save_path=args.save)
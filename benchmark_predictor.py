@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark: keras Model.predict on one frame vs. an inference backend.
+
+Both run on the same rendered skeleton images, one image per call as in the
+realtime loop. Reports p50/p99 per call and checks that the two paths give
+the same group probabilities.
+"""
+
+import json
+import time
+
+import numpy as np
+
+from benchmark_skeleton_renderer import random_hands
+from predictor import BACKEND, BACKENDS, VARIANT, VARIANTS, KerasBackend, load_backend
+from skeleton_renderer import SkeletonRenderer
+
+
+def percentile_ms(values, q):
+    return float(np.percentile(values, q) * 1000) if values else 0.0
+
+
+def time_calls(func, images):
+    times = []
+    outputs = []
+    for white in images:
+        start = time.perf_counter()
+        outputs.append(func(white))
+        times.append(time.perf_counter() - start)
+    return times, np.array(outputs, dtype=np.float32)
+
+
+def run(samples=300, warmup=20, seed=0, backend=None, variant=None, save_path=None):
+    model = KerasBackend(warmup=False).model
+    predictor = load_backend(backend, variant=variant)
+    renderer = SkeletonRenderer()
+    images = [renderer.render(pts, w, h).copy() for pts, w, h in random_hands(samples, seed)[:samples]]
+
+    def keras_predict(white):
+        return model.predict(white.reshape(1, 400, 400, 3), verbose=0)[0]
+
+    # Model.predict builds its own predict function on the first calls
+    for white in images[:warmup]:
+        keras_predict(white)
+        predictor.predict(white)
+
+    keras_times, keras_out = time_calls(keras_predict, images)
+    backend_times, backend_out = time_calls(predictor.predict, images)
+
+    report = {
+        'samples': len(images),
+        'backend': predictor.name,
+        'model_path': predictor.model_path,
+        'model_predict_ms': {'p50': percentile_ms(keras_times, 50), 'p99': percentile_ms(keras_times, 99)},
+        'backend_ms': {'p50': percentile_ms(backend_times, 50), 'p99': percentile_ms(backend_times, 99)},
+        'max_abs_diff': float(np.abs(keras_out - backend_out).max()),
+        'top1_agreement': float((keras_out.argmax(axis=1) == backend_out.argmax(axis=1)).mean() * 100),
+    }
+
+    print("=" * 50)
+    print(f"Samples: {report['samples']}")
+    print(f"Model.predict    p50 {report['model_predict_ms']['p50']:.2f} ms  p99 {report['model_predict_ms']['p99']:.2f} ms")
+    print(f"{predictor.name + ' backend':<16} p50 {report['backend_ms']['p50']:.2f} ms  p99 {report['backend_ms']['p99']:.2f} ms")
+    print(f"Max abs difference: {report['max_abs_diff']:.2e}")
+    print(f"Top-1 agreement: {report['top1_agreement']:.1f}%")
+
+    if save_path:
+        with open(save_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {save_path}")
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark an inference backend against keras Model.predict')
+    parser.add_argument('--samples', type=int, default=300, help='Number of frames to time (default: 300)')
+    parser.add_argument('--warmup', type=int, default=20, help='Untimed calls per path before measuring (default: 20)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--backend', default=BACKEND, choices=sorted(BACKENDS),
+                        help=f'Backend to compare with Model.predict (default: {BACKEND})')
+    parser.add_argument('--variant', default=VARIANT, choices=VARIANTS,
+                        help=f'Model variant; float16/int8 need --backend tflite (default: {VARIANT})')
+    parser.add_argument('--save', help='Write the JSON report to this path')
+
+    args = parser.parse_args()
+    run(samples=args.samples, warmup=args.warmup, seed=args.seed, backend=args.backend,
+        variant=args.variant, save_path=args.save)
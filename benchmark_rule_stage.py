@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the rule stage: the old Application.predict if-chain
+against rule_engine on HandFeatures, and the throughput of classify_batch.
+
+Hands come from the landmark cache (see landmark_cache.py). Each one is
+paired with its letter's CNN group as ch1 and every other group as ch2,
+which covers the pairs the confusion rules were written for. Without a
+cache, random hands are used instead.
+"""
+
+import time
+
+import numpy as np
+
+from hand_features import HandFeatures
+from landmark_cache import CACHE_PATH, FOUND, LandmarkCache
+from predictor import LETTER_GROUPS
+from rule_engine import classify, classify_batch
+from test_rule_engine import legacy_classify, random_hands
+
+
+def recorded_cases(cache_path=CACHE_PATH):
+    cache = LandmarkCache.load(cache_path)
+    cases = []
+    for label, hand in zip(cache.labels[cache.status == FOUND], cache.landmarks[cache.status == FOUND]):
+        ch1 = LETTER_GROUPS[str(label)]
+        pts = hand.tolist()
+        cases.extend((ch1, ch2, pts) for ch2 in range(8) if ch2 != ch1)
+    return cases
+
+
+def random_cases(samples, seed=0):
+    return [(ch1, ch2, pts) for pts in random_hands(samples, seed) for ch1 in range(8) for ch2 in range(8) if ch1 != ch2]
+
+
+def time_per_case(fn, cases, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for ch1, ch2, pts in cases:
+            fn(ch1, ch2, pts)
+        best = min(best, time.perf_counter() - start)
+    return best / len(cases)
+
+
+def main(cache_path=CACHE_PATH, samples=500, seed=0, repeat=3):
+    cases = recorded_cases(cache_path)
+    source = f"{len(cases)} recorded (hand, pair) cases"
+    if not cases:
+        cases = random_cases(samples, seed)
+        source = f"no landmark cache, {len(cases)} random (hand, pair) cases"
+    print(source)
+
+    mismatches = sum(legacy_classify(ch1, ch2, pts) != classify(ch1, ch2, pts) for ch1, ch2, pts in cases)
+    print(f"Letter check: {len(cases) - mismatches}/{len(cases)} identical")
+
+    legacy = time_per_case(legacy_classify, cases, repeat)
+    engine = time_per_case(classify, cases, repeat)
+    features = time_per_case(lambda ch1, ch2, pts: HandFeatures(pts), cases, repeat)
+    matrix = time_per_case(lambda ch1, ch2, pts: HandFeatures(pts).dist, cases, repeat)
+
+    print(f"Legacy if-chain:        {legacy * 1e6:8.2f} us/frame")
+    print(f"Rule engine:            {engine * 1e6:8.2f} us/frame (including HandFeatures)")
+    print(f"  HandFeatures:         {features * 1e6:8.2f} us/frame")
+    print(f"  HandFeatures + dist:  {matrix * 1e6:8.2f} us/frame")
+    print(f"Speed-up:               {legacy / engine:8.2f}x")
+
+    landmarks = np.array([pts for _, _, pts in cases])
+    groups = np.array([(ch1, ch2) for ch1, ch2, _ in cases])
+    batch = np.array([str(letter) for letter in classify_batch(landmarks, groups)])
+    reference = np.array([str(classify(ch1, ch2, pts)) for ch1, ch2, pts in cases])
+    batch_mismatches = int((batch != reference).sum())
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        classify_batch(landmarks, groups)
+        best = min(best, time.perf_counter() - start)
+    print(f"classify_batch:         {best / len(cases) * 1e6:8.2f} us/frame "
+          f"({len(cases) / best * 60 / 1e6:.1f} M/min, {len(cases) - batch_mismatches}/{len(cases)} identical)")
+    return mismatches == 0 and batch_mismatches == 0
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the letter rule stage before and after HandFeatures')
+    parser.add_argument('--cache', default=CACHE_PATH, help=f'Landmark cache with recorded hands (default: {CACHE_PATH})')
+    parser.add_argument('--samples', type=int, default=500, help='Random hands when there is no cache (default: 500)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing runs; the best is reported (default: 3)')
+
+    args = parser.parse_args()
+    raise SystemExit(0 if main(args.cache, samples=args.samples, seed=args.seed, repeat=args.repeat) else 1)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the skeleton renderer against the original per-edge drawing.
+
+Also checks that both produce pixel-identical images, since the CNN was
+trained on the output of the original code.
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+from skeleton_renderer import SkeletonRenderer
+
+
+def legacy_draw(pts, w, h):
+    """The drawing block formerly copy-pasted across the realtime scripts."""
+    white = np.ones((400, 400, 3), dtype=np.uint8) * 255
+    x_offset = ((400 - w) // 2) - 15
+    y_offset = ((400 - h) // 2) - 15
+    for t in range(0, 4, 1):
+        cv2.line(white, (pts[t][0] + x_offset, pts[t][1] + y_offset), (pts[t + 1][0] + x_offset, pts[t + 1][1] + y_offset), (0, 255, 0), 3)
+    for t in range(5, 8, 1):
+        cv2.line(white, (pts[t][0] + x_offset, pts[t][1] + y_offset), (pts[t + 1][0] + x_offset, pts[t + 1][1] + y_offset), (0, 255, 0), 3)
+    for t in range(9, 12, 1):
+        cv2.line(white, (pts[t][0] + x_offset, pts[t][1] + y_offset), (pts[t + 1][0] + x_offset, pts[t + 1][1] + y_offset), (0, 255, 0), 3)
+    for t in range(13, 16, 1):
+        cv2.line(white, (pts[t][0] + x_offset, pts[t][1] + y_offset), (pts[t + 1][0] + x_offset, pts[t + 1][1] + y_offset), (0, 255, 0), 3)
+    for t in range(17, 20, 1):
+        cv2.line(white, (pts[t][0] + x_offset, pts[t][1] + y_offset), (pts[t + 1][0] + x_offset, pts[t + 1][1] + y_offset), (0, 255, 0), 3)
+    cv2.line(white, (pts[5][0] + x_offset, pts[5][1] + y_offset), (pts[9][0] + x_offset, pts[9][1] + y_offset), (0, 255, 0), 3)
+    cv2.line(white, (pts[9][0] + x_offset, pts[9][1] + y_offset), (pts[13][0] + x_offset, pts[13][1] + y_offset), (0, 255, 0), 3)
+    cv2.line(white, (pts[13][0] + x_offset, pts[13][1] + y_offset), (pts[17][0] + x_offset, pts[17][1] + y_offset), (0, 255, 0), 3)
+    cv2.line(white, (pts[0][0] + x_offset, pts[0][1] + y_offset), (pts[5][0] + x_offset, pts[5][1] + y_offset), (0, 255, 0), 3)
+    cv2.line(white, (pts[0][0] + x_offset, pts[0][1] + y_offset), (pts[17][0] + x_offset, pts[17][1] + y_offset), (0, 255, 0), 3)
+    for i in range(21):
+        cv2.circle(white, (pts[i][0] + x_offset, pts[i][1] + y_offset), 2, (0, 0, 255), 1)
+    return white
+
+
+def random_hands(n, seed=0):
+    """Landmark sets in ROI-crop coordinates with their bbox width/height."""
+    rng = np.random.default_rng(seed)
+    hands = []
+    for _ in range(n):
+        w, h = rng.integers(60, 330, size=2)
+        xs = rng.integers(29, 29 + w, size=21)
+        ys = rng.integers(29, 29 + h, size=21)
+        zs = rng.integers(-60, 60, size=21)
+        pts = [[int(x), int(y), int(z)] for x, y, z in zip(xs, ys, zs)]
+        hands.append((pts, int(w), int(h)))
+    # Hands larger than the canvas, so drawing gets clipped at the border
+    for _ in range(max(n // 20, 1)):
+        w, h = rng.integers(380, 520, size=2)
+        pts = [[int(rng.integers(0, w + 58)), int(rng.integers(0, h + 58)), 0] for _ in range(21)]
+        hands.append((pts, int(w), int(h)))
+    return hands
+
+
+def main(samples=2000, seed=0):
+    hands = random_hands(samples, seed)
+    renderer = SkeletonRenderer()
+
+    mismatches = 0
+    for pts, w, h in hands:
+        if not np.array_equal(legacy_draw(pts, w, h), renderer.render(pts, w, h)):
+            mismatches += 1
+    print(f"Pixel check: {len(hands) - mismatches}/{len(hands)} identical")
+
+    start = time.perf_counter()
+    for pts, w, h in hands:
+        legacy_draw(pts, w, h)
+    legacy = (time.perf_counter() - start) / len(hands)
+
+    start = time.perf_counter()
+    for pts, w, h in hands:
+        renderer.render(pts, w, h)
+    shared = (time.perf_counter() - start) / len(hands)
+
+    print(f"Legacy drawing:     {legacy * 1e6:8.1f} us/frame")
+    print(f"SkeletonRenderer:   {shared * 1e6:8.1f} us/frame")
+    print(f"Speed-up:           {legacy / shared:8.2f}x")
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the shared skeleton renderer')
+    parser.add_argument('--samples', type=int, default=2000, help='Number of random hands (default: 2000)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+
+    args = parser.parse_args()
+    raise SystemExit(0 if main(samples=args.samples, seed=args.seed) else 1)
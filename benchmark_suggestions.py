@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Latency and accuracy of the SymSpell index against enchant's suggest().
+
+Queries are frequent words from the word list, misspelled the way the
+recognizer misspells them: most get one letter swapped for another in
+its confusion group (A/E/M/N/S/T, G/H, C/O, Y/J, P/Q/Z), the rest a
+random substitution, a dropped letter or a repeated one. The script
+reports the load time, the per-word latency (mean, median, p99) and how
+often the intended word is the first suggestion or among the four the
+GUI shows. SymSpell also runs with confusions at full cost, to show what
+the cheaper substitutions buy. enchant is skipped when it is not
+installed.
+"""
+
+import random
+import time
+from string import ascii_lowercase
+
+import numpy as np
+
+from symspell import CONFUSION_COST, CONFUSIONS, INDEX_PATH, WORDS_PATH, SymSpell, read_words
+
+
+def misspell(word, rng, confusion_share=0.7):
+    """``word`` with one recognizer-like error."""
+    confusable = [i for i, ch in enumerate(word) if any(ch in group.lower() for group in CONFUSIONS)]
+    if confusable and rng.random() < confusion_share:
+        i = rng.choice(confusable)
+        group = next(group.lower() for group in CONFUSIONS if word[i] in group.lower())
+        return word[:i] + rng.choice(group.replace(word[i], '')) + word[i + 1:]
+    i = rng.randrange(len(word))
+    kind = rng.choice(('substitute', 'drop', 'repeat'))
+    if kind == 'substitute':
+        return word[:i] + rng.choice(ascii_lowercase.replace(word[i], '')) + word[i + 1:]
+    if kind == 'drop':
+        return word[:i] + word[i + 1:]
+    return word[:i] + word[i] + word[i:]
+
+
+def queries(words_path=WORDS_PATH, count=1000, min_length=3, confusion_share=0.7, seed=0):
+    """``(typed, intended)`` pairs for the ``count`` most frequent words of at least ``min_length`` letters."""
+    counts = read_words(words_path)
+    words = [w for w, _ in counts.most_common() if len(w) >= min_length][:count]
+    rng = random.Random(seed)
+    return [(misspell(w, rng, confusion_share).upper(), w) for w in words]
+
+
+def measure(suggest, pairs):
+    latencies = []
+    first = top4 = 0
+    for typed, intended in pairs:
+        start = time.perf_counter()
+        suggestions = list(suggest(typed))[:4]
+        latencies.append(time.perf_counter() - start)
+        suggestions = [s.lower() for s in suggestions]
+        first += bool(suggestions) and suggestions[0] == intended
+        top4 += intended in suggestions
+    latencies = np.array(latencies) * 1e6
+    return {
+        'mean_us': latencies.mean(),
+        'p50_us': np.percentile(latencies, 50),
+        'p99_us': np.percentile(latencies, 99),
+        'top1': first / len(pairs) * 100,
+        'top4': top4 / len(pairs) * 100,
+    }
+
+
+def load_enchant():
+    try:
+        import enchant
+    except ImportError:
+        return None
+    return enchant.Dict("en-US")
+
+
+def main(index_path=INDEX_PATH, words_path=WORDS_PATH, count=1000, confusion_share=0.7, seed=0):
+    pairs = queries(words_path, count, confusion_share=confusion_share, seed=seed)
+    print(f"{len(pairs)} misspelled words, {confusion_share:.0%} with a recognizer confusion")
+
+    engines = []
+    for label, cost in ((f'symspell (confusions {CONFUSION_COST:g})', CONFUSION_COST), ('symspell (confusions 1)', 1.0)):
+        start = time.perf_counter()
+        engine = SymSpell(index_path, confusion_cost=cost)
+        engines.append((label, engine.suggest, time.perf_counter() - start))
+    start = time.perf_counter()
+    enchant_dict = load_enchant()
+    if enchant_dict is None:
+        print("enchant is not installed; skipping it")
+    else:
+        engines.append(('enchant', enchant_dict.suggest, time.perf_counter() - start))
+
+    print(f"{'engine':<26} {'load ms':>8} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'top-1':>7} {'top-4':>7}")
+    results = {}
+    for label, suggest, load_time in engines:
+        suggest(pairs[0][0])
+        result = measure(suggest, pairs)
+        results[label] = result
+        print(f"{label:<26} {load_time * 1000:8.1f} {result['mean_us']:9.0f} {result['p50_us']:9.0f} "
+              f"{result['p99_us']:9.0f} {result['top1']:6.1f}% {result['top4']:6.1f}%")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compare SymSpell and enchant suggestions on recognizer-like misspellings')
+    parser.add_argument('--index', default=INDEX_PATH, help=f'SymSpell index directory (default: {INDEX_PATH})')
+    parser.add_argument('--words', default=WORDS_PATH, help=f'Word-frequency list for the queries (default: {WORDS_PATH})')
+    parser.add_argument('--count', type=int, default=1000, help='Words to misspell (default: 1000)')
+    parser.add_argument('--confusion-share', type=float, default=0.7,
+                        help='Share of misspellings that swap confusable letters (default: 0.7)')
+    parser.add_argument('--seed', type=int, default=0, help='Misspelling seed (default: 0)')
+
+    args = parser.parse_args()
+    main(index_path=args.index, words_path=args.words, count=args.count,
+         confusion_share=args.confusion_share, seed=args.seed)
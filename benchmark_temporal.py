@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Replay rate of temporal.LetterCommitter on a synthetic letter stream.
+
+Each character of the text is held for --hold frames and followed by the
+"next" gesture, with a --noise share of frames replaced by confusable
+letters. The script reports frames per second and the events produced.
+"""
+
+import random
+import time
+
+from temporal import NEXT, LetterCommitter
+
+
+def letter_stream(text, frames, hold=15, next_frames=10, noise=0.1, seed=0):
+    """``frames`` per-frame letters that sign ``text`` over and over."""
+    rng = random.Random(seed)
+    stream = []
+    while len(stream) < frames:
+        for ch in text:
+            for letter in [ch] * hold + [NEXT] * next_frames:
+                stream.append(rng.choice('AEMNST') if rng.random() < noise else letter)
+    return stream[:frames]
+
+
+def main(frames=200000, text='THE QUICK BROWN FOX ', hold=15, noise=0.1, seed=0):
+    stream = letter_stream(text, frames, hold=hold, noise=noise, seed=seed)
+    committer = LetterCommitter()
+    start = time.perf_counter()
+    events = committer.run(stream)
+    elapsed = time.perf_counter() - start
+    print(f"{len(stream)} frames in {elapsed:.3f}s: {len(stream) / elapsed:,.0f} frames/s, {len(events)} events")
+    return len(stream) / elapsed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Measure how fast LetterCommitter replays a letter stream')
+    parser.add_argument('--frames', type=int, default=200000, help='Frames to replay (default: 200000)')
+    parser.add_argument('--text', default='THE QUICK BROWN FOX ', help='Text signed over and over')
+    parser.add_argument('--hold', type=int, default=15, help='Frames each character is held (default: 15)')
+    parser.add_argument('--noise', type=float, default=0.1, help='Share of flickering frames (default: 0.1)')
+    parser.add_argument('--seed', type=int, default=0, help='Noise seed (default: 0)')
+
+    args = parser.parse_args()
+    main(frames=args.frames, text=args.text, hold=args.hold, noise=args.noise, seed=args.seed)
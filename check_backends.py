@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Conformance check: the TFLite and ONNX backends must pick the same top-2
+groups (ch1, ch2) as the Keras model on the AtoZ_3.1 images.
+
+ch1 and ch2 are taken the way Application.predict takes them: argmax, then
+argmax again with ch1 zeroed. The rule cascade only ever sees that pair, so
+agreement on it means identical letters.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+from batch_eval import DATASET_DIR, flatten, list_dataset, read_skeleton, top2
+from predictor import BACKENDS, load_backend, resolve_model
+
+
+def load_images(samples_per_letter=None):
+    paths, _ = flatten(list_dataset(samples_per_letter))
+    for path in paths:
+        try:
+            img, _ = read_skeleton(path)
+        except ValueError:
+            continue
+        yield path, img
+
+
+def run(backends, samples_per_letter=None, batch_size=32, min_agreement=100.0):
+    reference = load_backend('keras', variant='float')
+    # The float models, whatever SIGNTALK_VARIANT says; quantized variants have their own accuracy gate
+    engines = [load_backend(*resolve_model(name, 'float')) for name in backends]
+
+    total = 0
+    agree = {engine.name: 0 for engine in engines}
+    max_diff = {engine.name: 0.0 for engine in engines}
+    mismatches = {engine.name: [] for engine in engines}
+
+    batch_paths, batch = [], []
+
+    def flush():
+        nonlocal total
+        x = np.stack(batch)
+        ref_prob = reference.predict_batch(x)
+        ref_top = top2(ref_prob)
+        for engine in engines:
+            prob = engine.predict_batch(x)
+            same = (top2(prob) == ref_top).all(axis=1)
+            agree[engine.name] += int(same.sum())
+            max_diff[engine.name] = max(max_diff[engine.name], float(np.abs(prob - ref_prob).max()))
+            mismatches[engine.name].extend(p for p, ok in zip(batch_paths, same) if not ok)
+        total += len(batch)
+        batch_paths.clear()
+        batch.clear()
+
+    for path, img in load_images(samples_per_letter):
+        batch_paths.append(path)
+        batch.append(img)
+        if len(batch) == batch_size:
+            flush()
+    if batch:
+        flush()
+
+    if not total:
+        print(f"No images found under {DATASET_DIR}")
+        return False
+
+    passed = True
+    print("=" * 50)
+    print(f"Images: {total}")
+    for engine in engines:
+        rate = agree[engine.name] / total * 100
+        ok = rate >= min_agreement
+        passed = passed and ok
+        print(f"{engine.name:<8} top-2 agreement {rate:6.2f}%  max |dp| {max_diff[engine.name]:.2e}  {'PASS' if ok else 'FAIL'}")
+        for path in mismatches[engine.name][:10]:
+            print(f"    mismatch: {os.path.relpath(path, DATASET_DIR)}")
+    return passed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    others = [name for name in BACKENDS if name != 'keras']
+    parser = argparse.ArgumentParser(description='Check that converted backends match the Keras model on AtoZ_3.1')
+    parser.add_argument('--backend', action='append', choices=others,
+                        help='Backend to check; repeatable (default: all converted backends)')
+    parser.add_argument('--samples', type=int, default=None, help='Images per letter (default: all)')
+    parser.add_argument('--batch-size', type=int, default=32, help='Images per inference call (default: 32)')
+    parser.add_argument('--min-agreement', type=float, default=100.0,
+                        help='Required top-2 agreement in percent (default: 100)')
+
+    args = parser.parse_args()
+    ok = run(args.backend or others, samples_per_letter=args.samples,
+             batch_size=args.batch_size, min_agreement=args.min_agreement)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Held-out accuracy and latency of the recognition engines on AtoZ_3.1:
+
+- cnn: the 8-group CNN on the rendered skeleton, then the rule cascade
+- landmarks-groups: the landmark MLP's 8 groups, then the rule cascade
+- landmarks-letters: the landmark MLP's 26 letters, then the gesture rules
+
+The held-out images are the ones the landmark models were not trained on
+(stored in each model file), so every engine is scored on the same hands.
+The CNN's groups come from the side file tune_thresholds.py keeps.
+Latency is per hand, from landmarks to the final letter; for the CNN it
+includes rendering the skeleton.
+
+With the CNN and the letters model, a sweep over tier margins shows how
+many frames tiered.py would keep on the landmark tier, the accuracy, and
+the average per-frame cost (the letters model always runs, and the CNN
+runs only on the rest).
+"""
+
+import os
+import time
+from string import ascii_uppercase
+
+import numpy as np
+
+import landmark_cache
+from batch_eval import flatten, list_dataset, top2
+from landmark_classifier import MODEL_PATHS, LandmarkClassifier
+from predictor import BACKEND, BACKENDS, VARIANT, VARIANTS, load_backend, resolve_model
+from rule_engine import classify, classify_batch, classify_letter
+from tiered import MARGIN
+from tune_thresholds import GESTURES, cnn_groups
+
+MARGINS = (0.3, 0.5, 0.7, 0.9)
+
+
+def load_models(names=MODEL_PATHS):
+    models = {}
+    for target in names:
+        if os.path.exists(MODEL_PATHS[target]):
+            models[target] = LandmarkClassifier(MODEL_PATHS[target])
+        else:
+            print(f"No {target} model at {MODEL_PATHS[target]}; train it with "
+                  f"python landmark_classifier.py --target {target}")
+    return models
+
+
+def held_out_rows(keys, models):
+    """Rows of ``keys`` held out from every loaded landmark model."""
+    rows = np.ones(len(keys), dtype=bool)
+    for model in models.values():
+        with np.load(model.model_path, allow_pickle=False) as data:
+            rows &= np.isin(keys, data['held_out_paths'])
+    return rows
+
+
+def letters_from(model, landmarks):
+    """Final letters of a landmark engine for (N, 21, 2+) landmarks."""
+    prob = model.predict_batch(landmarks)
+    if model.target == 'groups':
+        return classify_batch(landmarks, top2(prob))
+    letters = np.array(list(ascii_uppercase))[prob.argmax(-1)]
+    return np.array([classify_letter(letter, pts) for letter, pts in zip(letters, landmarks.tolist())])
+
+
+def tier_sweep(letters_model, landmarks, labels, fast_letters, cnn_letters, fast_latency, cnn_latency,
+               margins=MARGINS):
+    """Share of frames the landmark tier keeps, accuracy and per-frame cost of tiered.py per margin."""
+    prob = np.sort(letters_model.predict_batch(landmarks), axis=-1)
+    gaps = prob[:, -1] - prob[:, -2]
+    print(f"\n{'Margin':<8}{'Fast tier':>10}{'Accuracy':>10}{'Avg cost':>14}")
+    for value in margins:
+        fast = gaps >= value
+        letters = np.where(fast, fast_letters, cnn_letters)
+        accuracy = (letters == labels).mean() * 100
+        cost = fast_latency + (1 - fast.mean()) * cnn_latency
+        print(f"{value:<8.2f}{fast.mean() * 100:>9.1f}%{accuracy:>9.2f}%{cost * 1e6:>11.1f} us")
+
+
+def per_hand(fn, hands, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for pts in hands:
+            fn(pts)
+        best = min(best, time.perf_counter() - start)
+    return best / len(hands)
+
+
+def landmark_latency(model, hands, repeat=3):
+    def run(pts):
+        prob = model.predict(pts)
+        if model.target == 'groups':
+            ch1, ch2 = np.argsort(-prob, kind='stable')[:2]
+            return classify(ch1, ch2, pts)
+        return classify_letter(ascii_uppercase[int(prob.argmax())], pts)
+
+    return per_hand(run, hands, repeat)
+
+
+def cnn_latency(cnn, hands, repeat=3):
+    from skeleton_renderer import render_skeleton
+
+    def run(pts):
+        prob = np.asarray(cnn.predict(render_skeleton(pts)), dtype='float32')
+        ch1, ch2 = np.argsort(-prob, kind='stable')[:2]
+        return classify(ch1, ch2, pts)
+
+    return per_hand(run, hands, repeat)
+
+
+def main(backend=None, variant=None, batch_size=32, timing_samples=200, repeat=3, skip_cnn=False,
+         margins=MARGINS):
+    models = load_models()
+    if not models:
+        return None
+
+    paths, _ = flatten(list_dataset())
+    cache, _ = landmark_cache.update(paths)
+    index = np.array([cache.row(p) for p in paths], dtype=np.int64)
+    index = index[cache.status[index] == landmark_cache.FOUND]
+    keys = cache.paths[index]
+    rows = held_out_rows(keys, models)
+    if not rows.any():
+        print("No held-out hands; retrain the landmark models with --held-out > 0")
+        return None
+    landmarks = cache.landmarks[index][:, :, :2]
+    labels = cache.labels[index]
+    hands = landmarks[rows][:timing_samples].tolist()
+
+    results = {}
+    if not skip_cnn:
+        # Computed over every found hand so the groups side file is shared with tune_thresholds.py
+        found = [os.path.join(cache.root, p) for p in keys]
+        groups = cnn_groups(cache, found, backend, variant, batch_size)
+        name, model_path = resolve_model(backend, variant)
+        results['cnn'] = (classify_batch(landmarks[rows], groups[rows]),
+                          cnn_latency(load_backend(name, model_path), hands, repeat))
+    for target, model in models.items():
+        results[f'landmarks-{target}'] = (letters_from(model, landmarks[rows]),
+                                          landmark_latency(model, hands, repeat))
+
+    print(f"\n{int(rows.sum())} held-out hands ({backend or BACKEND}/{variant or VARIANT} CNN)")
+    print(f"{'Engine':<20}{'Accuracy':>10}{'Misfires':>10}{'Latency':>14}")
+    for engine, (letters, latency) in results.items():
+        accuracy = (letters == labels[rows]).mean() * 100
+        misfires = int(np.isin(letters, GESTURES).sum())
+        print(f"{engine:<20}{accuracy:>9.2f}%{misfires:>10}{latency * 1e6:>11.1f} us")
+
+    print(f"\n{'Letter':<8}{'Samples':>8}" + ''.join(f"{engine:>20}" for engine in results))
+    for letter in ascii_uppercase:
+        letter_rows = labels[rows] == letter
+        if letter_rows.any():
+            cells = ''.join(f"{(letters[letter_rows] == letter).mean() * 100:>19.1f}%" for letters, _ in results.values())
+            print(f"{letter:<8}{int(letter_rows.sum()):>8}{cells}")
+
+    if 'cnn' in results and 'letters' in models:
+        fast_letters, fast_latency = results['landmarks-letters']
+        cnn_letters, latency = results['cnn']
+        tier_sweep(models['letters'], landmarks[rows], labels[rows], fast_letters, cnn_letters,
+                   fast_latency, latency, sorted(set(margins) | {MARGIN}))
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compare the CNN and landmark recognition engines on AtoZ_3.1')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=None,
+                        help=f'Inference backend for the CNN (default: {BACKEND})')
+    parser.add_argument('--variant', choices=VARIANTS, default=None,
+                        help=f'Model variant (default: {VARIANT})')
+    parser.add_argument('--batch-size', type=int, default=32, help='Images per CNN call (default: 32)')
+    parser.add_argument('--timing-samples', type=int, default=200, help='Hands timed per engine (default: 200)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing runs; the best is reported (default: 3)')
+    parser.add_argument('--skip-cnn', action='store_true', help='Only compare the landmark engines')
+    parser.add_argument('--margins', type=float, nargs='+', default=list(MARGINS),
+                        help=f'Tiered margins to sweep, besides SIGNTALK_TIER_MARGIN (default: {MARGINS})')
+
+    args = parser.parse_args()
+    main(backend=args.backend, variant=args.variant, batch_size=args.batch_size,
+         timing_samples=args.timing_samples, repeat=args.repeat, skip_cnn=args.skip_cnn, margins=args.margins)
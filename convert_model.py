@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+One-time conversion of cnn8grps_rad1_model.h5 for the TFLite and ONNX backends.
+
+Both converters start from the same traced forward pass that KerasBackend
+runs, with a dynamic batch dimension. That way predict_batch works on every
+backend. This script needs TensorFlow, and tf2onnx for the ONNX output. The
+kiosk running the converted files needs neither.
+"""
+
+import os
+
+from predictor import MODEL_PATH, MODEL_PATHS, KerasBackend
+
+
+def to_tflite(backend, path):
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions(
+        [backend.forward.get_concrete_function()], backend.model)
+    with open(path, 'wb') as f:
+        f.write(converter.convert())
+
+
+def to_onnx(backend, path, opset=13):
+    import tf2onnx
+
+    tf2onnx.convert.from_function(
+        backend.forward, input_signature=backend.forward.input_signature, opset=opset, output_path=path)
+
+
+FORMATS = ('tflite', 'onnx')
+
+
+def main(formats, model_path=MODEL_PATH, out_dir=None, opset=13):
+    backend = KerasBackend(model_path, warmup=False)
+    written = {}
+    for fmt in formats:
+        path = MODEL_PATHS[fmt]
+        if out_dir:
+            path = os.path.join(out_dir, os.path.basename(path))
+        print(f"Converting {model_path} -> {path}")
+        if fmt == 'tflite':
+            to_tflite(backend, path)
+        else:
+            to_onnx(backend, path, opset=opset)
+        written[fmt] = path
+        print(f"  {os.path.getsize(path) / 1e6:.2f} MB")
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert the 8-group CNN for the TFLite and ONNX backends')
+    parser.add_argument('--format', choices=FORMATS + ('all',), default='all',
+                        help='Output format (default: all)')
+    parser.add_argument('--model', default=MODEL_PATH, help='Keras .h5 model to convert')
+    parser.add_argument('--out-dir', help='Directory for the converted files (default: next to predictor.py)')
+    parser.add_argument('--opset', type=int, default=13, help='ONNX opset (default: 13)')
+
+    args = parser.parse_args()
+    formats = FORMATS if args.format == 'all' else [args.format]
+    main(formats, model_path=args.model, out_dir=args.out_dir, opset=args.opset)
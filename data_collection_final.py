@@ -3,12 +3,16 @@ from cvzone.HandTrackingModule import HandDetector
 import numpy as np
 import os as oss
 import traceback
+from hand_tracking import locate_hand
+from skeleton_renderer import SkeletonRenderer
 
 
 
 capture = cv2.VideoCapture(0)
 hd = HandDetector(maxHands=1)
-hd2 = HandDetector(maxHands=1)
+# Second findHands pass on the ROI crop; when off, the first-pass landmarks are reused.
+SECOND_PASS = False
+hd2 = HandDetector(maxHands=1) if SECOND_PASS else None
 
 count = len(oss.listdir("D:\\sign2text_dataset_3.0\\AtoZ_3.0\\A\\"))
 c_dir = 'A'
@@ -18,53 +22,20 @@ step = 1
 flag=False
 suv=0
 
-white=np.ones((400,400),np.uint8)*255
-cv2.imwrite("C:\\Users\\devansh raval\\PycharmProjects\\pythonProject\\white.jpg",white)
+renderer = SkeletonRenderer()
 
 
 while True:
     try:
         _, frame = capture.read()
         frame = cv2.flip(frame, 1)
-        hands= hd.findHands(frame, draw=False, flipType=True)
-        white = cv2.imread("C:\\Users\\devansh raval\\PycharmProjects\\pythonProject\\white.jpg")
-
-        if hands:
-            hand = hands[0]
-            x, y, w, h = hand['bbox']
-            image =np.array( frame[y - offset:y + h + offset, x - offset:x + w + offset])
-
-            handz,imz = hd2.findHands(image, draw=True, flipType=True)
-            if handz:
-                hand = handz[0]
-                pts = hand['lmList']
-                # x1,y1,w1,h1=hand['bbox']
-                os=((400-w)//2)-15
-                os1=((400-h)//2)-15
-                for t in range(0,4,1):
-                    cv2.line(white,(pts[t][0]+os,pts[t][1]+os1),(pts[t+1][0]+os,pts[t+1][1]+os1),(0,255,0),3)
-                for t in range(5,8,1):
-                    cv2.line(white,(pts[t][0]+os,pts[t][1]+os1),(pts[t+1][0]+os,pts[t+1][1]+os1),(0,255,0),3)
-                for t in range(9,12,1):
-                    cv2.line(white,(pts[t][0]+os,pts[t][1]+os1),(pts[t+1][0]+os,pts[t+1][1]+os1),(0,255,0),3)
-                for t in range(13,16,1):
-                    cv2.line(white,(pts[t][0]+os,pts[t][1]+os1),(pts[t+1][0]+os,pts[t+1][1]+os1),(0,255,0),3)
-                for t in range(17,20,1):
-                    cv2.line(white,(pts[t][0]+os,pts[t][1]+os1),(pts[t+1][0]+os,pts[t+1][1]+os1),(0,255,0),3)
-                cv2.line(white, (pts[5][0]+os, pts[5][1]+os1), (pts[9][0]+os, pts[9][1]+os1), (0, 255, 0), 3)
-                cv2.line(white, (pts[9][0]+os, pts[9][1]+os1), (pts[13][0]+os, pts[13][1]+os1), (0, 255, 0), 3)
-                cv2.line(white, (pts[13][0]+os, pts[13][1]+os1), (pts[17][0]+os, pts[17][1]+os1), (0, 255, 0), 3)
-                cv2.line(white, (pts[0][0]+os, pts[0][1]+os1), (pts[5][0]+os, pts[5][1]+os1), (0, 255, 0), 3)
-                cv2.line(white, (pts[0][0]+os, pts[0][1]+os1), (pts[17][0]+os, pts[17][1]+os1), (0, 255, 0), 3)
-
-                skeleton0=np.array(white)
-                zz=np.array(white)
-                for i in range(21):
-                    cv2.circle(white,(pts[i][0]+os,pts[i][1]+os1),2,(0 , 0 , 255),1)
-
-                skeleton1=np.array(white)
-
-                cv2.imshow("1",skeleton1)
+        bbox, pts = locate_hand(frame, hd, hd2, offset)
+
+        if pts is not None:
+            x, y, w, h = bbox
+            skeleton1 = renderer.render(pts, w, h)
+
+            cv2.imshow("1",skeleton1)
 
         frame = cv2.putText(frame, "dir=" + str(c_dir) + "  count=" + str(count), (50,50),
                             cv2.FONT_HERSHEY_SIMPLEX,
@@ -6,12 +6,12 @@ Debug script to test ASL alphabet recognition step by step
 import os
 import cv2
 import numpy as np
-from keras.models import load_model
+from predictor import load_backend
 from cvzone.HandTrackingModule import HandDetector
+from landmark_cache import LandmarkCache
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATASET_DIR = os.path.join(BASE_DIR, 'AtoZ_3.1')
-MODEL_PATH = os.path.join(BASE_DIR, 'cnn8grps_rad1_model.h5')
 
 def test_single_image_debug():
     """Test a single image with detailed debugging"""
@@ -20,7 +20,7 @@ def test_single_image_debug():
     
     # Load model
     try:
-        model = load_model(MODEL_PATH, compile=False)
+        model = load_backend()
         print("✅ Model loaded successfully")
     except Exception as e:
         print(f"❌ Error loading model: {e}")
@@ -55,38 +55,49 @@ def test_single_image_debug():
         
         print(f"✅ Image loaded successfully, shape: {img.shape}")
         
-        # Detect hands
-        hands = detector.findHands(img, draw=False, flipType=True)
-        print(f"✅ Hand detection completed, found {len(hands) if hands else 0} hands")
-        
-        if not hands:
-            print("❌ No hands detected in image")
+        # Landmarks recorded by landmark_cache.py for this exact file, if any
+        try:
+            cached = LandmarkCache.load().lookup(test_image_path)
+        except ValueError as e:
+            print(f"❌ Landmark cache: {e}")
             return
         
-        print(f"   Hands structure: {type(hands)}")
-        print(f"   First hand type: {type(hands[0])}")
-        
-        # Handle different hand result formats
-        if isinstance(hands[0], (list, tuple)):
-            print(f"   First hand is list/tuple with {len(hands[0])} elements")
-            hand = hands[0]
-            if len(hand) > 0:
-                hmap = hand[0]
-                print(f"   Hand[0] type: {type(hmap)}")
-                print(f"   Hand[0] keys: {hmap.keys() if hasattr(hmap, 'keys') else 'No keys'}")
+        if cached is not None:
+            hmap = {'lmList': cached[0], 'bbox': cached[1]}
+            print("✅ Hand landmarks read from the landmark cache")
+        else:
+            # Detect hands
+            hands = detector.findHands(img, draw=False, flipType=True)
+            print(f"✅ Hand detection completed, found {len(hands) if hands else 0} hands")
+        
+            if not hands:
+                print("❌ No hands detected in image")
+                return
+        
+            print(f"   Hands structure: {type(hands)}")
+            print(f"   First hand type: {type(hands[0])}")
+        
+            # Handle different hand result formats
+            if isinstance(hands[0], (list, tuple)):
+                print(f"   First hand is list/tuple with {len(hands[0])} elements")
+                hand = hands[0]
+                if len(hand) > 0:
+                    hmap = hand[0]
+                    print(f"   Hand[0] type: {type(hmap)}")
+                    print(f"   Hand[0] keys: {hmap.keys() if hasattr(hmap, 'keys') else 'No keys'}")
+                else:
+                    print("❌ Empty hand list")
+                    return
             else:
-                print("❌ Empty hand list")
+                hmap = hands[0]
+                print(f"   Hand is direct object, type: {type(hmap)}")
+                print(f"   Hand keys: {hmap.keys() if hasattr(hmap, 'keys') else 'No keys'}")
+        
+            # Check if we have landmarks
+            if not hasattr(hmap, 'get') or 'lmList' not in hmap:
+                print("❌ No landmarks found in hand data")
+                print(f"   Available attributes: {dir(hmap)}")
                 return
-        else:
-            hmap = hands[0]
-            print(f"   Hand is direct object, type: {type(hmap)}")
-            print(f"   Hand keys: {hmap.keys() if hasattr(hmap, 'keys') else 'No keys'}")
-        
-        # Check if we have landmarks
-        if not hasattr(hmap, 'get') or 'lmList' not in hmap:
-            print("❌ No landmarks found in hand data")
-            print(f"   Available attributes: {dir(hmap)}")
-            return
         
         pts = hmap['lmList']
         print(f"✅ Hand landmarks extracted, {len(pts)} points")
@@ -127,7 +138,7 @@ def test_single_image_debug():
         inp = white.reshape(1, 400, 400, 3)
         print(f"✅ Input prepared, shape: {inp.shape}")
         
-        prob = np.array(model.predict(inp, verbose=0)[0], dtype='float32')
+        prob = np.array(model.predict(inp), dtype='float32')
         print(f"✅ Model prediction completed, output shape: {prob.shape}")
         print(f"   Raw probabilities: {prob}")
         
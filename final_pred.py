@@ -1,63 +1,126 @@
 # Importing Libraries
+from startup import Startup
+# Created first so the startup report counts from here, numpy and cv2 included
+startup = Startup()
 import numpy as np
-import math
 import cv2
 
 import os, sys
+import time
 import traceback
-import pyttsx3
-from keras.models import load_model
-from cvzone.HandTrackingModule import HandDetector
-from string import ascii_uppercase
-import enchant
-ddd=enchant.Dict("en-US")
-hd = HandDetector(maxHands=1)
-hd2 = HandDetector(maxHands=1)
 import tkinter as tk
 from PIL import Image, ImageTk
+from string import ascii_uppercase
+from frame_grabber import FrameGrabber
+from pipeline import Pipeline, recognition_stages
+from hand_tracking import RoiTracker
+from inference_cache import InferenceCache
+from motion_gate import MotionGate
+from landmark_classifier import load_engine
+from rule_engine import classify, classify_letter
+from warmup import warm_detectors, warm_model
+from temporal import Backspace, LetterCandidate, LetterCommitted, LetterCommitter, Space
+from sentence_buffer import SentenceBuffer
+from suggestion_worker import SuggestionWorker
+from symspell import load_suggester
+from speech import Speaker
+# Second findHands pass on the ROI crop; when off, the first-pass landmarks are reused.
+SECOND_PASS = False
+# Search near the last bbox first and only fall back to the full frame when the hand is lost.
+TRACK_ROI = True
+# Reuse the CNN output while the landmarks stay within the cache tolerance.
+CACHE_INFERENCE = True
+cache = InferenceCache() if CACHE_INFERENCE else None
+# Skip recognition while the pose holds still and re-emit the last letter.
+MOTION_GATE = True
+gate = MotionGate() if MOTION_GATE else None
+# Speak each word when the "next" gesture completes it, besides the Speak button (SIGNTALK_SPEAK_WORDS=1).
+SPEAK_WORDS = os.environ.get('SIGNTALK_SPEAK_WORDS', '0') == '1'
 
 offset=29
+# Recognition starts once these startup components are ready; the user's first sign then pays no setup cost.
+RECOGNITION_COMPONENTS = ('camera', 'model', 'detectors', 'model_warmup', 'detector_warmup')
 
 
 os.environ["THEANO_FLAGS"] = "device=cuda, assert_no_cpu_op=True"
 cv2.setUseOptimized(True)
-DEBUG = False
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+
+# Startup loaders: each runs on its own thread and does its slow imports there, off the UI thread.
+
+def load_camera():
+    # Opening the capture device alone can take seconds
+    return FrameGrabber(0, width=640, height=480).start()
+
+
+def load_detectors():
+    """``(hd, hd2, tracker)``; importing cvzone pulls in MediaPipe."""
+    from cvzone.HandTrackingModule import HandDetector
+    hd = HandDetector(maxHands=1)
+    hd2 = HandDetector(maxHands=1) if SECOND_PASS else None
+    tracker = RoiTracker(hd, HandDetector(maxHands=1)) if TRACK_ROI else None
+    return hd, hd2, tracker
+
+
+def warm_up_detectors(detectors):
+    hd, hd2, tracker = detectors
+    return warm_detectors(hd, hd2, tracker.roi_detector if tracker is not None else None)
+
+
+def init_speech():
+    if sys.platform == 'win32':
+        # sapi5 needs COM initialised on the thread that creates and drives the engine
+        import comtypes
+        comtypes.CoInitialize()
+    import pyttsx3
+    speak_engine = pyttsx3.init()
+    speak_engine.setProperty("rate",100)
+    voices=speak_engine.getProperty("voices")
+    speak_engine.setProperty("voice",voices[0].id)
+    return speak_engine
+
+
+def load_speech():
+    # The engine is created and driven on the Speaker's own thread; this waits until it exists
+    return Speaker(init_speech).wait()
+
+
+def load_dictionary():
+    # enchant, or the SymSpell index with SIGNTALK_SUGGESTER=symspell
+    return load_suggester()
+
+
 # Application :
 
 class Application:
 
     def __init__(self):
-        self.vs = cv2.VideoCapture(0)
-        self.vs.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.vs.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        # The window and camera preview come up while these load; see preview()
+        self.startup = startup
+        self.startup.load('camera', load_camera)
+        self.startup.load('model', load_engine)
+        self.startup.load('detectors', load_detectors)
+        self.startup.load('model_warmup', warm_model, after=('model',))
+        self.startup.load('detector_warmup', warm_up_detectors, after=('detectors',))
+        self.startup.load('speech', load_speech)
+        self.startup.load('dictionary', load_dictionary)
+        self.startup_reported = False
+        self.model = None
+        self.tracker = None
+        self.pipeline = None
+        self.vs = None
+
+        self.frame_latency = 0.0
         self.current_image = None
-        self.model = load_model(os.path.join(BASE_DIR, 'cnn8grps_rad1_model.h5'), compile=False)
-        self.speak_engine=pyttsx3.init()
-        self.speak_engine.setProperty("rate",100)
-        voices=self.speak_engine.getProperty("voices")
-        self.speak_engine.setProperty("voice",voices[0].id)
-
-        self.ct = {}
-        self.ct['blank'] = 0
-        self.blank_flag = 0
-        self.space_flag=False
-        self.next_flag=True
-        self.prev_char=""
-        self.count=-1
-        self.ten_prev_char=[]
-        for i in range(10):
-            self.ten_prev_char.append(" ")
-
-        self.last_checked_word = ""
 
+        # Frame letters in, text events out; see temporal.py
+        self.temporal = LetterCommitter()
+        self.last_letter = None
 
-        for i in ascii_uppercase:
-            self.ct[i] = 0
-        print("Loaded model from disk")
-
+        self.last_checked_word = ""
+        self.suggestions = SuggestionWorker(self.suggest)
 
         self.root = tk.Tk()
         self.root.title("Sign Language To Text Conversion")
@@ -117,8 +180,9 @@ class Application:
 
 
 
-        self.str = " "
-        self.ccc=0
+        self.sentence = SentenceBuffer()
+        # Sentence version last drawn; see refresh_text()
+        self.shown_version = -1
         self.word = " "
         self.current_symbol = "C"
         self.photo = "Empty"
@@ -131,154 +195,65 @@ class Application:
 
         self.video_loop()
 
+    def start_recognition(self):
+        self.vs = self.startup.result('camera')
+        self.model = self.startup.result('model')
+        hd, hd2, self.tracker = self.startup.result('detectors')
+        self.pipeline = Pipeline(self.vs, recognition_stages(self.tracker or hd, hd2, self.model, offset, cache, gate)).start()
+        self.startup.mark('recognition')
+        print("Loaded model from disk")
+
+    def preview(self):
+        """Mirrored camera preview and loading status until recognition is loaded and warmed up."""
+        if self.startup.ready(*RECOGNITION_COMPONENTS):
+            self.start_recognition()
+            return
+        vs = self.startup.result('camera')
+        frame = vs.read_latest(timeout=0)[0] if vs is not None else None
+        if frame is not None:
+            self.startup.mark('first_frame')
+            cv2image = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
+            self.current_image = Image.fromarray(cv2image)
+            imgtk = ImageTk.PhotoImage(image=self.current_image)
+            self.panel.imgtk = imgtk
+            self.panel.config(image=imgtk)
+        status = "Loading " + ", ".join(self.startup.pending())
+        if self.startup.failed():
+            status += " (failed: " + ", ".join(self.startup.failed()) + ")"
+        self.panel5.config(text=status, font=("Courier", 30), wraplength=1025)
+
     def video_loop(self):
         try:
-            ok, frame = self.vs.read()
-            if not ok or frame is None:
-                self.root.after(1, self.video_loop)
+            self.startup.mark('window')
+            if not self.startup_reported and not self.startup.pending():
+                self.startup_reported = True
+                self.startup.print_report()
+            if self.pipeline is None:
+                self.preview()
                 return
-            cv2image = cv2.flip(frame, 1)
-            if cv2image is not None and cv2image.size != 0:
-                hands = hd.findHands(cv2image, draw=False, flipType=True)
-                cv2image_copy=np.array(cv2image)
-                cv2image = cv2.cvtColor(cv2image, cv2.COLOR_BGR2RGB)
-                self.current_image = Image.fromarray(cv2image)
-                imgtk = ImageTk.PhotoImage(image=self.current_image)
-                self.panel.imgtk = imgtk
-                self.panel.config(image=imgtk)
-
-                if hands and hands[0]:
-                    hand = hands[0]
-                    map = hand[0]
-                    x, y, w, h=map['bbox']
-                    image = cv2image_copy[y - offset:y + h + offset, x - offset:x + w + offset]
-
-                    white = np.ones((400, 400, 3), dtype=np.uint8) * 255
-                    # img_final=img_final1=img_final2=0
-                    if image is not None and image.size != 0:
-                        handz = hd2.findHands(image, draw=False, flipType=True)
-                        self.ccc += 1
-                        if handz and handz[0]:
-                            hand = handz[0]
-                            handmap=hand[0]
-                            self.pts = handmap['lmList']
-                            # x1,y1,w1,h1=hand['bbox']
-
-                            x_offset = ((400 - w) // 2) - 15
-                            y_offset = ((400 - h) // 2) - 15
-                            for t in range(0, 4, 1):
-                                cv2.line(white, (self.pts[t][0] + x_offset, self.pts[t][1] + y_offset), (self.pts[t + 1][0] + x_offset, self.pts[t + 1][1] + y_offset),
-                                         (0, 255, 0), 3)
-                            for t in range(5, 8, 1):
-                                cv2.line(white, (self.pts[t][0] + x_offset, self.pts[t][1] + y_offset), (self.pts[t + 1][0] + x_offset, self.pts[t + 1][1] + y_offset),
-                                          (0, 255, 0), 3)
-                            for t in range(9, 12, 1):
-                                cv2.line(white, (self.pts[t][0] + x_offset, self.pts[t][1] + y_offset), (self.pts[t + 1][0] + x_offset, self.pts[t + 1][1] + y_offset),
-                                          (0, 255, 0), 3)
-                            for t in range(13, 16, 1):
-                                cv2.line(white, (self.pts[t][0] + x_offset, self.pts[t][1] + y_offset), (self.pts[t + 1][0] + x_offset, self.pts[t + 1][1] + y_offset),
-                                          (0, 255, 0), 3)
-                            for t in range(17, 20, 1):
-                                cv2.line(white, (self.pts[t][0] + x_offset, self.pts[t][1] + y_offset), (self.pts[t + 1][0] + x_offset, self.pts[t + 1][1] + y_offset),
-                                          (0, 255, 0), 3)
-                            cv2.line(white, (self.pts[5][0] + x_offset, self.pts[5][1] + y_offset), (self.pts[9][0] + x_offset, self.pts[9][1] + y_offset), (0, 255, 0),
-                                      3)
-                            cv2.line(white, (self.pts[9][0] + x_offset, self.pts[9][1] + y_offset), (self.pts[13][0] + x_offset, self.pts[13][1] + y_offset), (0, 255, 0),
-                                      3)
-                            cv2.line(white, (self.pts[13][0] + x_offset, self.pts[13][1] + y_offset), (self.pts[17][0] + x_offset, self.pts[17][1] + y_offset),
-                                      (0, 255, 0), 3)
-                            cv2.line(white, (self.pts[0][0] + x_offset, self.pts[0][1] + y_offset), (self.pts[5][0] + x_offset, self.pts[5][1] + y_offset), (0, 255, 0),
-                                      3)
-                            cv2.line(white, (self.pts[0][0] + x_offset, self.pts[0][1] + y_offset), (self.pts[17][0] + x_offset, self.pts[17][1] + y_offset), (0, 255, 0),
-                                      3)
-
-                            for i in range(21):
-                                cv2.circle(white, (self.pts[i][0] + x_offset, self.pts[i][1] + y_offset), 2, (0, 0, 255), 1)
-
-                            res=white
-                            self.predict(res)
-
-                            self.current_image2 = Image.fromarray(res)
-
-                            imgtk = ImageTk.PhotoImage(image=self.current_image2)
-
-                            self.panel2.imgtk = imgtk
-                            self.panel2.config(image=imgtk)
-
-                            self.panel3.config(text=self.current_symbol, font=("Courier", 30))
-
-                            #self.panel4.config(text=self.word, font=("Courier", 30))
-
-
-
-                            self.b1.config(text=self.word1, font=("Courier", 20), wraplength=825, command=self.action1)
-                            self.b2.config(text=self.word2, font=("Courier", 20), wraplength=825,  command=self.action2)
-                            self.b3.config(text=self.word3, font=("Courier", 20), wraplength=825,  command=self.action3)
-                            self.b4.config(text=self.word4, font=("Courier", 20), wraplength=825,  command=self.action4)
-
-                self.panel5.config(text=self.str, font=("Courier", 30), wraplength=1025)
-        except Exception:
-            if DEBUG:
-                print(Exception.__traceback__)
-            hands = hd.findHands(cv2image, draw=False, flipType=True)
-            cv2image_copy=np.array(cv2image)
-            cv2image = cv2.cvtColor(cv2image, cv2.COLOR_BGR2RGB)
+            packet = self.pipeline.get(timeout=0)
+            if packet is None:
+                self.refresh_text()
+                return
+            self.frame_latency = time.perf_counter() - packet['timestamp']
+            cv2image = cv2.cvtColor(packet['frame'], cv2.COLOR_BGR2RGB)
             self.current_image = Image.fromarray(cv2image)
             imgtk = ImageTk.PhotoImage(image=self.current_image)
             self.panel.imgtk = imgtk
             self.panel.config(image=imgtk)
 
-            if hands:
-                # #print(" --------- lmlist=",hands[1])
-                hand = hands[0]
-                x, y, w, h = hand['bbox']
-                image = cv2image_copy[y - offset:y + h + offset, x - offset:x + w + offset]
-
-                white = np.ones((400, 400, 3), dtype=np.uint8) * 255
-                # img_final=img_final1=img_final2=0
-
-                handz = hd2.findHands(image, draw=False, flipType=True)
-                print(" ", self.ccc)
-                self.ccc += 1
-                if handz:
-                    hand = handz[0]
-                    self.pts = hand['lmList']
-                    # x1,y1,w1,h1=hand['bbox']
-
-                    x_offset = ((400 - w) // 2) - 15
-                    y_offset = ((400 - h) // 2) - 15
-                    for t in range(0, 4, 1):
-                        cv2.line(white, (self.pts[t][0] + x_offset, self.pts[t][1] + y_offset), (self.pts[t + 1][0] + x_offset, self.pts[t + 1][1] + y_offset),
-                                 (0, 255, 0), 3)
-                    for t in range(5, 8, 1):
-                        cv2.line(white, (self.pts[t][0] + x_offset, self.pts[t][1] + y_offset), (self.pts[t + 1][0] + x_offset, self.pts[t + 1][1] + y_offset),
-                                 (0, 255, 0), 3)
-                    for t in range(9, 12, 1):
-                        cv2.line(white, (self.pts[t][0] + x_offset, self.pts[t][1] + y_offset), (self.pts[t + 1][0] + x_offset, self.pts[t + 1][1] + y_offset),
-                                 (0, 255, 0), 3)
-                    for t in range(13, 16, 1):
-                        cv2.line(white, (self.pts[t][0] + x_offset, self.pts[t][1] + y_offset), (self.pts[t + 1][0] + x_offset, self.pts[t + 1][1] + y_offset),
-                                 (0, 255, 0), 3)
-                    for t in range(17, 20, 1):
-                        cv2.line(white, (self.pts[t][0] + x_offset, self.pts[t][1] + y_offset), (self.pts[t + 1][0] + x_offset, self.pts[t + 1][1] + y_offset),
-                                 (0, 255, 0), 3)
-                    cv2.line(white, (self.pts[5][0] + x_offset, self.pts[5][1] + y_offset), (self.pts[9][0] + x_offset, self.pts[9][1] + y_offset), (0, 255, 0),
-                             3)
-                    cv2.line(white, (self.pts[9][0] + x_offset, self.pts[9][1] + y_offset), (self.pts[13][0] + x_offset, self.pts[13][1] + y_offset), (0, 255, 0),
-                             3)
-                    cv2.line(white, (self.pts[13][0] + x_offset, self.pts[13][1] + y_offset), (self.pts[17][0] + x_offset, self.pts[17][1] + y_offset),
-                             (0, 255, 0), 3)
-                    cv2.line(white, (self.pts[0][0] + x_offset, self.pts[0][1] + y_offset), (self.pts[5][0] + x_offset, self.pts[5][1] + y_offset), (0, 255, 0),
-                             3)
-                    cv2.line(white, (self.pts[0][0] + x_offset, self.pts[0][1] + y_offset), (self.pts[17][0] + x_offset, self.pts[17][1] + y_offset), (0, 255, 0),
-                             3)
-
-                    for i in range(21):
-                        cv2.circle(white, (self.pts[i][0] + x_offset, self.pts[i][1] + y_offset), 2, (0, 0, 255), 1)
-
-                    res=white
-                    self.predict(res)
+            if packet['prob'] is not None or packet['skipped']:
+                self.pts = packet['pts']
+                res = packet['white']
+                self.startup.mark('first_prediction')
+                if packet['skipped']:
+                    # Pose unchanged: hand the last letter to the temporal logic again
+                    if self.last_letter is not None:
+                        self.emit(self.last_letter)
+                else:
+                    self.predict(packet['prob'])
 
+                if res is not None:
                     self.current_image2 = Image.fromarray(res)
 
                     imgtk = ImageTk.PhotoImage(image=self.current_image2)
@@ -286,76 +261,52 @@ class Application:
                     self.panel2.imgtk = imgtk
                     self.panel2.config(image=imgtk)
 
-                    self.panel3.config(text=self.current_symbol, font=("Courier", 30))
-
-                    #self.panel4.config(text=self.word, font=("Courier", 30))
-
-
-
-                    self.b1.config(text=self.word1, font=("Courier", 20), wraplength=825, command=self.action1)
-                    self.b2.config(text=self.word2, font=("Courier", 20), wraplength=825,  command=self.action2)
-                    self.b3.config(text=self.word3, font=("Courier", 20), wraplength=825,  command=self.action3)
-                    self.b4.config(text=self.word4, font=("Courier", 20), wraplength=825,  command=self.action4)
-
-            self.panel5.config(text=self.str, font=("Courier", 30), wraplength=1025)
+            self.refresh_text()
         except Exception:
             print("==", traceback.format_exc())
         finally:
             self.root.after(10, self.video_loop)
 
-    def distance(self,x,y):
-        return math.sqrt(((x[0] - y[0]) ** 2) + ((x[1] - y[1]) ** 2))
-
     def action1(self):
-        idx_space = self.str.rfind(" ")
-        idx_word = self.str.find(self.word, idx_space)
-        last_idx = len(self.str)
-        self.str = self.str[:idx_word]
-        self.str = self.str + self.word1.upper()
-
+        self.sentence.replace_current_word(self.word1.upper())
+        self.refresh_text()
 
     def action2(self):
-        idx_space = self.str.rfind(" ")
-        idx_word = self.str.find(self.word, idx_space)
-        last_idx = len(self.str)
-        self.str=self.str[:idx_word]
-        self.str=self.str+self.word2.upper()
-        #self.str[idx_word:last_idx] = self.word2
-
+        self.sentence.replace_current_word(self.word2.upper())
+        self.refresh_text()
 
     def action3(self):
-        idx_space = self.str.rfind(" ")
-        idx_word = self.str.find(self.word, idx_space)
-        last_idx = len(self.str)
-        self.str = self.str[:idx_word]
-        self.str = self.str + self.word3.upper()
-
-
+        self.sentence.replace_current_word(self.word3.upper())
+        self.refresh_text()
 
     def action4(self):
-        idx_space = self.str.rfind(" ")
-        idx_word = self.str.find(self.word, idx_space)
-        last_idx = len(self.str)
-        self.str = self.str[:idx_word]
-        self.str = self.str + self.word4.upper()
-
+        self.sentence.replace_current_word(self.word4.upper())
+        self.refresh_text()
 
     def speak_fun(self):
-        self.speak_engine.say(self.str)
-        self.speak_engine.runAndWait()
+        self.say(self.sentence.text())
+
+    def say(self, text):
+        """Queue ``text`` on the speech thread; see speech.Speaker."""
+        speaker = self.startup.result('speech')
+        if speaker is None:
+            print("Speech engine is not loaded yet")
+            return
+        speaker.say(text)
 
 
     def clear_fun(self):
-        self.str=" "
+        self.sentence.clear()
+        self.temporal.reset()
+        self.last_checked_word = ""
         self.word1 = " "
         self.word2 = " "
         self.word3 = " "
         self.word4 = " "
+        self.refresh_text()
 
-    def predict(self, test_image):
-        white=test_image
-        white = white.reshape(1, 400, 400, 3)
-        prob = np.array(self.model.predict(white, verbose=0)[0], dtype='float32')
+    def predict(self, prob):
+        prob = np.array(prob, dtype='float32')
         ch1 = np.argmax(prob, axis=0)
         prob[ch1] = 0
         ch2 = np.argmax(prob, axis=0)
@@ -363,448 +314,105 @@ class Application:
         ch3 = np.argmax(prob, axis=0)
         prob[ch3] = 0
 
-        pl = [ch1, ch2]
-
-        # condition for [Aemnst]
-        l = [[5, 2], [5, 3], [3, 5], [3, 6], [3, 0], [3, 2], [6, 4], [6, 1], [6, 2], [6, 6], [6, 7], [6, 0], [6, 5],
-             [4, 1], [1, 0], [1, 1], [6, 3], [1, 6], [5, 6], [5, 1], [4, 5], [1, 4], [1, 5], [2, 0], [2, 6], [4, 6],
-             [1, 0], [5, 7], [1, 6], [6, 1], [7, 6], [2, 5], [7, 1], [5, 4], [7, 0], [7, 5], [7, 2]]
-        if pl in l:
-            if (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][
-                1]):
-                ch1 = 0
-
-        # condition for [o][s]
-        l = [[2, 2], [2, 1]]
-        if pl in l:
-            if (self.pts[5][0] < self.pts[4][0]):
-                ch1 = 0
-                print("++++++++++++++++++")
-                # print("00000")
-
-        # condition for [c0][aemnst]
-        l = [[0, 0], [0, 6], [0, 2], [0, 5], [0, 1], [0, 7], [5, 2], [7, 6], [7, 1]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[0][0] > self.pts[8][0] and self.pts[0][0] > self.pts[4][0] and self.pts[0][0] > self.pts[12][0] and self.pts[0][0] > self.pts[16][
-                0] and self.pts[0][0] > self.pts[20][0]) and self.pts[5][0] > self.pts[4][0]:
-                ch1 = 2
-
-        # condition for [c0][aemnst]
-        l = [[6, 0], [6, 6], [6, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.distance(self.pts[8], self.pts[16]) < 52:
-                ch1 = 2
-
-
-        # condition for [gh][bdfikruvw]
-        l = [[1, 4], [1, 5], [1, 6], [1, 3], [1, 0]]
-        pl = [ch1, ch2]
-
-        if pl in l:
-            if self.pts[6][1] > self.pts[8][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1] and self.pts[0][0] < self.pts[8][
-                0] and self.pts[0][0] < self.pts[12][0] and self.pts[0][0] < self.pts[16][0] and self.pts[0][0] < self.pts[20][0]:
-                ch1 = 3
-
-
-
-        # con for [gh][l]
-        l = [[4, 6], [4, 1], [4, 5], [4, 3], [4, 7]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[4][0] > self.pts[0][0]:
-                ch1 = 3
-
-        # con for [gh][pqz]
-        l = [[5, 3], [5, 0], [5, 7], [5, 4], [5, 2], [5, 1], [5, 5]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[2][1] + 15 < self.pts[16][1]:
-                ch1 = 3
-
-        # con for [l][x]
-        l = [[6, 4], [6, 1], [6, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.distance(self.pts[4], self.pts[11]) > 55:
-                ch1 = 4
-
-        # con for [l][d]
-        l = [[1, 4], [1, 6], [1, 1]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.distance(self.pts[4], self.pts[11]) > 50) and (
-                    self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] <
-                    self.pts[20][1]):
-                ch1 = 4
-
-        # con for [l][gh]
-        l = [[3, 6], [3, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[4][0] < self.pts[0][0]):
-                ch1 = 4
-
-        # con for [l][c0]
-        l = [[2, 2], [2, 5], [2, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[1][0] < self.pts[12][0]):
-                ch1 = 4
-
-        # con for [l][c0]
-        l = [[2, 2], [2, 5], [2, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[1][0] < self.pts[12][0]):
-                ch1 = 4
-
-        # con for [gh][z]
-        l = [[3, 6], [3, 5], [3, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][
-                1]) and self.pts[4][1] > self.pts[10][1]:
-                ch1 = 5
-
-        # con for [gh][pq]
-        l = [[3, 2], [3, 1], [3, 6]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[4][1] + 17 > self.pts[8][1] and self.pts[4][1] + 17 > self.pts[12][1] and self.pts[4][1] + 17 > self.pts[16][1] and self.pts[4][
-                1] + 17 > self.pts[20][1]:
-                ch1 = 5
-
-        # con for [l][pqz]
-        l = [[4, 4], [4, 5], [4, 2], [7, 5], [7, 6], [7, 0]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[4][0] > self.pts[0][0]:
-                ch1 = 5
-
-        # con for [pqz][aemnst]
-        l = [[0, 2], [0, 6], [0, 1], [0, 5], [0, 0], [0, 7], [0, 4], [0, 3], [2, 7]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[0][0] < self.pts[8][0] and self.pts[0][0] < self.pts[12][0] and self.pts[0][0] < self.pts[16][0] and self.pts[0][0] < self.pts[20][0]:
-                ch1 = 5
-
-        # con for [pqz][yj]
-        l = [[5, 7], [5, 2], [5, 6]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[3][0] < self.pts[0][0]:
-                ch1 = 7
-
-        # con for [l][yj]
-        l = [[4, 6], [4, 2], [4, 4], [4, 1], [4, 5], [4, 7]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[6][1] < self.pts[8][1]:
-                ch1 = 7
-
-        # con for [x][yj]
-        l = [[6, 7], [0, 7], [0, 1], [0, 0], [6, 4], [6, 6], [6, 5], [6, 1]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[18][1] > self.pts[20][1]:
-                ch1 = 7
-
-        # condition for [x][aemnst]
-        l = [[0, 4], [0, 2], [0, 3], [0, 1], [0, 6]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[5][0] > self.pts[16][0]:
-                ch1 = 6
-
-
-        # condition for [yj][x]
-        if DEBUG:
-            print("2222  ch1=+++++++++++++++++", ch1, ",", ch2)
-        l = [[7, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[18][1] < self.pts[20][1] and self.pts[8][1] < self.pts[10][1]:
-                ch1 = 6
-
-        # condition for [c0][x]
-        l = [[2, 1], [2, 2], [2, 6], [2, 7], [2, 0]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.distance(self.pts[8], self.pts[16]) > 50:
-                ch1 = 6
-
-        # con for [l][x]
-
-        l = [[4, 6], [4, 2], [4, 1], [4, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.distance(self.pts[4], self.pts[11]) < 60:
-                ch1 = 6
-
-        # con for [x][d]
-        l = [[1, 4], [1, 6], [1, 0], [1, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[5][0] - self.pts[4][0] - 15 > 0:
-                ch1 = 6
-
-        # con for [b][pqz]
-        l = [[5, 0], [5, 1], [5, 4], [5, 5], [5, 6], [6, 1], [7, 6], [0, 2], [7, 1], [7, 4], [6, 6], [7, 2], [5, 0],
-             [6, 3], [6, 4], [7, 5], [7, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][
-                1]):
-                ch1 = 1
-
-        # con for [f][pqz]
-        l = [[6, 1], [6, 0], [0, 3], [6, 4], [2, 2], [0, 6], [6, 2], [7, 6], [4, 6], [4, 1], [4, 2], [0, 2], [7, 1],
-             [7, 4], [6, 6], [7, 2], [7, 5], [7, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and
-                    self.pts[18][1] > self.pts[20][1]):
-                ch1 = 1
-
-        l = [[6, 1], [6, 0], [4, 2], [4, 1], [4, 6], [4, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and
-                    self.pts[18][1] > self.pts[20][1]):
-                ch1 = 1
-
-        # con for [d][pqz]
-        fg = 19
-        # print("_________________ch1=",ch1," ch2=",ch2)
-        l = [[5, 0], [3, 4], [3, 0], [3, 1], [3, 5], [5, 5], [5, 4], [5, 1], [7, 6]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if ((self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and
-                 self.pts[18][1] < self.pts[20][1]) and (self.pts[2][0] < self.pts[0][0]) and self.pts[4][1] > self.pts[14][1]):
-                ch1 = 1
-
-        l = [[4, 1], [4, 2], [4, 4]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.distance(self.pts[4], self.pts[11]) < 50) and (
-                    self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] <
-                    self.pts[20][1]):
-                ch1 = 1
-
-        l = [[3, 4], [3, 0], [3, 1], [3, 5], [3, 6]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if ((self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and
-                 self.pts[18][1] < self.pts[20][1]) and (self.pts[2][0] < self.pts[0][0]) and self.pts[14][1] < self.pts[4][1]):
-                ch1 = 1
-
-        l = [[6, 6], [6, 4], [6, 1], [6, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[5][0] - self.pts[4][0] - 15 < 0:
-                ch1 = 1
-
-        # con for [i][pqz]
-        l = [[5, 4], [5, 5], [5, 1], [0, 3], [0, 7], [5, 0], [0, 2], [6, 2], [7, 5], [7, 1], [7, 6], [7, 7]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if ((self.pts[6][1] < self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and
-                 self.pts[18][1] > self.pts[20][1])):
-                ch1 = 1
-
-        # con for [yj][bfdi]
-        l = [[1, 5], [1, 7], [1, 1], [1, 6], [1, 3], [1, 0]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[4][0] < self.pts[5][0] + 15) and (
-            (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and
-             self.pts[18][1] > self.pts[20][1])):
-                ch1 = 7
-
-        # con for [uvr]
-        l = [[5, 5], [5, 0], [5, 4], [5, 1], [4, 6], [4, 1], [7, 6], [3, 0], [3, 5]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if ((self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and
-                 self.pts[18][1] < self.pts[20][1])) and self.pts[4][1] > self.pts[14][1]:
-                ch1 = 1
-
-        # con for [w]
-        fg = 13
-        l = [[3, 5], [3, 0], [3, 6], [5, 1], [4, 1], [2, 0], [5, 0], [5, 5]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if not (self.pts[0][0] + fg < self.pts[8][0] and self.pts[0][0] + fg < self.pts[12][0] and self.pts[0][0] + fg < self.pts[16][0] and
-                    self.pts[0][0] + fg < self.pts[20][0]) and not (
-                    self.pts[0][0] > self.pts[8][0] and self.pts[0][0] > self.pts[12][0] and self.pts[0][0] > self.pts[16][0] and self.pts[0][0] > self.pts[20][
-                0]) and self.distance(self.pts[4], self.pts[11]) < 50:
-                ch1 = 1
-
-        # con for [w]
-
-        l = [[5, 0], [5, 5], [0, 1]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1]:
-                ch1 = 1
-
-        # -------------------------condn for 8 groups  ends
-
-        # -------------------------condn for subgroups  starts
-        #
-        if ch1 == 0:
-            ch1 = 'S'
-            if self.pts[4][0] < self.pts[6][0] and self.pts[4][0] < self.pts[10][0] and self.pts[4][0] < self.pts[14][0] and self.pts[4][0] < self.pts[18][0]:
-                ch1 = 'A'
-            if self.pts[4][0] > self.pts[6][0] and self.pts[4][0] < self.pts[10][0] and self.pts[4][0] < self.pts[14][0] and self.pts[4][0] < self.pts[18][
-                0] and self.pts[4][1] < self.pts[14][1] and self.pts[4][1] < self.pts[18][1]:
-                ch1 = 'T'
-            if self.pts[4][1] > self.pts[8][1] and self.pts[4][1] > self.pts[12][1] and self.pts[4][1] > self.pts[16][1] and self.pts[4][1] > self.pts[20][1]:
-                ch1 = 'E'
-            if self.pts[4][0] > self.pts[6][0] and self.pts[4][0] > self.pts[10][0] and self.pts[4][0] > self.pts[14][0] and self.pts[4][1] < self.pts[18][1]:
-                ch1 = 'M'
-            if self.pts[4][0] > self.pts[6][0] and self.pts[4][0] > self.pts[10][0] and self.pts[4][1] < self.pts[18][1] and self.pts[4][1] < self.pts[14][1]:
-                ch1 = 'N'
-
-        if ch1 == 2:
-            if self.distance(self.pts[12], self.pts[4]) > 42:
-                ch1 = 'C'
-            else:
-                ch1 = 'O'
-
-        if ch1 == 3:
-            if (self.distance(self.pts[8], self.pts[12])) > 72:
-                ch1 = 'G'
-            else:
-                ch1 = 'H'
-
-        if ch1 == 7:
-            if self.distance(self.pts[8], self.pts[4]) > 42:
-                ch1 = 'Y'
-            else:
-                ch1 = 'J'
-
-        if ch1 == 4:
-            ch1 = 'L'
-
-        if ch1 == 6:
-            ch1 = 'X'
-
-        if ch1 == 5:
-            if self.pts[4][0] > self.pts[12][0] and self.pts[4][0] > self.pts[16][0] and self.pts[4][0] > self.pts[20][0]:
-                if self.pts[8][1] < self.pts[5][1]:
-                    ch1 = 'Z'
-                else:
-                    ch1 = 'Q'
-            else:
-                ch1 = 'P'
-
-        if ch1 == 1:
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][
-                1]):
-                ch1 = 'B'
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][
-                1]):
-                ch1 = 'D'
-            if (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][
-                1]):
-                ch1 = 'F'
-            if (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] > self.pts[20][
-                1]):
-                ch1 = 'I'
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] < self.pts[20][
-                1]):
-                ch1 = 'W'
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][
-                1]) and self.pts[4][1] < self.pts[9][1]:
-                ch1 = 'K'
-            if ((self.distance(self.pts[8], self.pts[12]) - self.distance(self.pts[6], self.pts[10])) < 8) and (
-                    self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] <
-                    self.pts[20][1]):
-                ch1 = 'U'
-            if ((self.distance(self.pts[8], self.pts[12]) - self.distance(self.pts[6], self.pts[10])) >= 8) and (
-                    self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] <
-                    self.pts[20][1]) and (self.pts[4][1] > self.pts[9][1]):
-                ch1 = 'V'
-
-            if (self.pts[8][0] > self.pts[12][0]) and (
-                    self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] <
-                    self.pts[20][1]):
-                ch1 = 'R'
-
-        if ch1 == 1 or ch1 =='E' or ch1 =='S' or ch1 =='X' or ch1 =='Y' or ch1 =='B':
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] > self.pts[20][1]):
-                ch1=" "
-
-
-
-        if DEBUG:
-            print(self.pts[4][0] < self.pts[5][0])
-        if ch1 == 'E' or ch1=='Y' or ch1=='B':
-            if (self.pts[4][0] < self.pts[5][0]) and (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][1]):
-                ch1="next"
-
-
-        if ch1 in ['Next', 'B', 'C', 'H', 'F', 'X']:
-            if (self.pts[0][0] > self.pts[8][0] and self.pts[0][0] > self.pts[12][0] and self.pts[0][0] > self.pts[16][0] and self.pts[0][0] > self.pts[20][0]) and (self.pts[4][1] < self.pts[8][1] and self.pts[4][1] < self.pts[12][1] and self.pts[4][1] < self.pts[16][1] and self.pts[4][1] < self.pts[20][1]) and (self.pts[4][1] < self.pts[6][1] and self.pts[4][1] < self.pts[10][1] and self.pts[4][1] < self.pts[14][1] and self.pts[4][1] < self.pts[18][1]):
-                ch1 = 'Backspace'
-
-
-        if ch1=="next" and self.prev_char!="next":
-            if self.ten_prev_char[(self.count-2)%10]!="next":
-                if self.ten_prev_char[(self.count-2)%10]=="Backspace":
-                    self.str=self.str[0:-1]
-                else:
-                    if self.ten_prev_char[(self.count - 2) % 10] != "Backspace":
-                        self.str = self.str + self.ten_prev_char[(self.count-2)%10]
-            else:
-                if self.ten_prev_char[(self.count - 0) % 10] != "Backspace":
-                    self.str = self.str + self.ten_prev_char[(self.count - 0) % 10]
-
-
-        if ch1=="  " and self.prev_char!="  ":
-            self.str = self.str + "  "
-
-        self.prev_char=ch1
-        self.current_symbol=ch1
-        self.count += 1
-        self.ten_prev_char[self.count%10]=ch1
-
-
-        if len(self.str.strip())!=0:
-            st=self.str.rfind(" ")
-            ed=len(self.str)
-            word=self.str[st+1:ed]
-            self.word=word
-            if len(word.strip())!=0 and word != self.last_checked_word:
-                self.last_checked_word = word
-                _ = ddd.check(word)
-                suggestions = ddd.suggest(word)
-                lenn = len(suggestions)
-                if lenn >= 4:
-                    self.word4 = suggestions[3]
-
-                if lenn >= 3:
-                    self.word3 = suggestions[2]
-
-                if lenn >= 2:
-                    self.word2 = suggestions[1]
-
-                if lenn >= 1:
-                    self.word1 = suggestions[0]
-            else:
-                self.word1 = " "
-                self.word2 = " "
-                self.word3 = " "
-                self.word4 = " "
+        if len(prob) == 26:
+            # Letter-level landmark engine: only the gesture rules apply
+            ch1 = classify_letter(ascii_uppercase[ch1], self.pts)
+        else:
+            ch1 = classify(ch1, ch2, self.pts)
+
+        self.emit(ch1)
+
+    def emit(self, ch1):
+        self.last_letter = ch1
+        for event in self.temporal.update(ch1):
+            if isinstance(event, LetterCandidate):
+                self.current_symbol = event.letter
+                self.panel3.config(text=self.current_symbol, font=("Courier", 30))
+            elif isinstance(event, LetterCommitted):
+                self.sentence.append(event.letter)
+            elif isinstance(event, Backspace):
+                self.sentence.backspace()
+            elif isinstance(event, Space):
+                # The buffer's word includes suggestion clicks and reopened words; WordCompleted.word does not
+                word = self.sentence.space()
+                if word and SPEAK_WORDS:
+                    self.say(word)
+
+    def refresh_text(self):
+        """Redraw the sentence when it changed and the suggestion buttons when new suggestions arrived."""
+        if self.sentence.version != self.shown_version:
+            self.shown_version = self.sentence.version
+            self.update_suggestions()
+            self.panel5.config(text=self.sentence.text(), font=("Courier", 30), wraplength=1025)
+        result = self.suggestions.poll()
+        if result is not None and result[0] == self.sentence.current_word:
+            suggestions = result[1]
+            lenn = len(suggestions)
+            if lenn >= 4:
+                self.word4 = suggestions[3]
+
+            if lenn >= 3:
+                self.word3 = suggestions[2]
+
+            if lenn >= 2:
+                self.word2 = suggestions[1]
+
+            if lenn >= 1:
+                self.word1 = suggestions[0]
+            self.draw_suggestions()
+
+    def draw_suggestions(self):
+        self.b1.config(text=self.word1, font=("Courier", 20), wraplength=825, command=self.action1)
+        self.b2.config(text=self.word2, font=("Courier", 20), wraplength=825,  command=self.action2)
+        self.b3.config(text=self.word3, font=("Courier", 20), wraplength=825,  command=self.action3)
+        self.b4.config(text=self.word4, font=("Courier", 20), wraplength=825,  command=self.action4)
+
+    def update_suggestions(self):
+        word=self.sentence.current_word
+        self.word=word
+        if len(word.strip())==0:
+            # The same word typed again must ask for suggestions again
+            self.last_checked_word = ""
+            self.word1 = " "
+            self.word2 = " "
+            self.word3 = " "
+            self.word4 = " "
+            self.draw_suggestions()
+            return
+        if word != self.last_checked_word:
+            self.last_checked_word = word
+            # Answered on the suggestion thread; refresh_text picks up the result
+            self.suggestions.request(word)
+
+    def suggest(self, word):
+        # Runs on the suggestion thread, which waits here until the dictionary has loaded
+        ddd = self.startup.result('dictionary', timeout=None)
+        return ddd.suggest(word) if ddd is not None else []
 
 
     def destructor(self):
-        print(self.ten_prev_char)
+        self.startup.print_report()
+        if self.pipeline is not None:
+            print("Pipeline stats:", self.pipeline.stats())
+            if hasattr(self.model, 'stats'):
+                print("Engine stats:", self.model.stats())
+            if self.tracker is not None:
+                print("ROI tracker stats:", self.tracker.stats())
+            if cache is not None:
+                print("Inference cache stats:", cache.stats())
+            if gate is not None:
+                print("Motion gate stats:", gate.stats(self.pipeline.stats()))
+        print("Suggestion stats:", self.suggestions.stats())
+        self.suggestions.stop()
+        speaker = self.startup.result('speech')
+        if speaker is not None:
+            speaker.stop()
         self.root.destroy()
-        self.vs.release()
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        vs = self.startup.result('camera')
+        if vs is not None:
+            vs.release()
         cv2.destroyAllWindows()
 
 
@@ -0,0 +1,108 @@
+"""
+Threaded camera capture with a single-slot "latest frame wins" buffer.
+
+The capture device is drained on its own thread so the driver buffer never
+backs up behind slow recognition; readers always get the newest frame.
+"""
+
+import threading
+import time
+
+import cv2
+
+
+class FrameGrabber:
+    """Reads frames from a cv2.VideoCapture on a background thread.
+
+    Only the most recent frame is kept. A frame that is overwritten before
+    anyone read it counts as dropped, so ``frames_dropped`` tells how far
+    recognition is falling behind the camera.
+    """
+
+    def __init__(self, source=0, width=640, height=480):
+        self.capture = cv2.VideoCapture(source) if isinstance(source, (int, str)) else source
+        if width:
+            self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+        self._cond = threading.Condition()
+        self._frame = None
+        self._timestamp = 0.0
+        self._frame_id = 0
+        self._last_read_id = 0
+        self._running = False
+        self._thread = None
+
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.read_failures = 0
+
+    def start(self):
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while self._running:
+            ok, frame = self.capture.read()
+            timestamp = time.perf_counter()
+            if not ok or frame is None:
+                self.read_failures += 1
+                time.sleep(0.005)
+                continue
+            with self._cond:
+                if self._frame_id > self._last_read_id:
+                    self.frames_dropped += 1
+                self._frame = frame
+                self._timestamp = timestamp
+                self._frame_id += 1
+                self.frames_captured += 1
+                self._cond.notify_all()
+
+    def read_latest(self, timeout=None):
+        """Return ``(frame, timestamp, frame_id)`` for the newest unread frame.
+
+        Blocks up to ``timeout`` seconds for a new frame (``0`` never blocks,
+        ``None`` waits forever). Returns ``(None, None, None)`` if nothing new
+        arrived in time.
+        """
+        with self._cond:
+            if self._frame_id == self._last_read_id:
+                if timeout == 0:
+                    return None, None, None
+                self._cond.wait_for(lambda: self._frame_id > self._last_read_id or not self._running, timeout)
+                if self._frame_id == self._last_read_id:
+                    return None, None, None
+            self._last_read_id = self._frame_id
+            return self._frame, self._timestamp, self._frame_id
+
+    def read(self):
+        """cv2.VideoCapture-compatible read that never waits for the camera."""
+        frame, _, _ = self.read_latest(timeout=0)
+        return frame is not None, frame
+
+    def set(self, prop, value):
+        return self.capture.set(prop, value)
+
+    def stats(self):
+        return {
+            'captured': self.frames_captured,
+            'dropped': self.frames_dropped,
+            'read_failures': self.read_failures,
+        }
+
+    def stop(self):
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def release(self):
+        self.stop()
+        self.capture.release()
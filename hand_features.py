@@ -0,0 +1,121 @@
+"""
+Per-frame hand features for the letter rules.
+
+HandFeatures reads a detector lmList once and derives everything the
+rules in rule_engine test:
+
+- x, y: landmark coordinates
+- up, down: index..pinky bitmasks (bit 0 = index), set when the finger
+  tip is above / below its PIP joint
+- distance(i, j): 2-D distance between two landmarks
+- xy, dist: the (21, 2) array and the 21x21 matrix of pairwise distances
+
+Rules combine these with ``&`` / ``|`` and all_of/any_of rather than
+``and`` / ``or``, so the same predicate also works on BatchHandFeatures,
+where x and y hold one (N,) array per landmark for a whole batch of
+hands and every test yields an (N,) mask.
+"""
+
+import math
+from functools import cached_property, lru_cache, reduce
+from operator import and_, or_
+
+import numpy as np
+
+# Tip landmarks of the index, middle, ring and pinky fingers; each PIP joint is tip - 2
+TIPS = (8, 12, 16, 20)
+PIPS = tuple(tip - 2 for tip in TIPS)
+
+
+def all_of(*conditions):
+    return reduce(and_, conditions)
+
+
+def any_of(*conditions):
+    return reduce(or_, conditions)
+
+
+def extension_bits(y):
+    """``(up, down)`` finger bitmasks from the landmark y coordinates."""
+    up = sum((y[tip - 2] > y[tip]) << i for i, tip in enumerate(TIPS))
+    down = sum((y[tip - 2] < y[tip]) << i for i, tip in enumerate(TIPS))
+    return up, down
+
+
+@lru_cache(maxsize=None)
+def finger_masks(pattern):
+    """``(up, down)`` bitmasks for a pattern such as 'UDD.'.
+
+    One character per finger from index to pinky: 'U' the tip must be
+    above its PIP joint, 'D' below, '.' either.
+    """
+    up = sum(1 << i for i, shape in enumerate(pattern) if shape == 'U')
+    down = sum(1 << i for i, shape in enumerate(pattern) if shape == 'D')
+    return up, down
+
+
+class HandFeatures:
+    """Features of one hand, computed once per frame.
+
+    x and y are plain lists and up/down are ints, so the per-frame rules
+    compare Python numbers rather than NumPy scalars. A frame's rules need
+    at most a few distances, which distance() computes on demand; the
+    full xy array and dist matrix are built on first access.
+    """
+
+    def __init__(self, pts):
+        self.x = [float(p[0]) for p in pts[:21]]
+        self.y = [float(p[1]) for p in pts[:21]]
+        self.up, self.down = extension_bits(self.y)
+
+    @cached_property
+    def xy(self):
+        return np.array((self.x, self.y)).T
+
+    @cached_property
+    def dist(self):
+        x, y = self.xy.T
+        dx = x[:, None] - x
+        dy = y[:, None] - y
+        return np.sqrt(dx * dx + dy * dy)
+
+    def distance(self, i, j):
+        return math.sqrt((self.x[i] - self.x[j]) ** 2 + (self.y[i] - self.y[j]) ** 2)
+
+    def fingers(self, pattern):
+        """True if the index..pinky fingers match ``pattern`` (see finger_masks)."""
+        up, down = finger_masks(pattern)
+        return ((self.up & up) == up) & ((self.down & down) == down)
+
+
+class BatchHandFeatures(HandFeatures):
+    """HandFeatures for N hands at once, from an (N, 21, 2+) landmark array.
+
+    x[i] and y[i] are (N,) arrays for landmark i, so every rule predicate
+    evaluates to an (N,) bool mask.
+    """
+
+    def __init__(self, landmarks):
+        landmarks = np.asarray(landmarks)
+        self.x = list(np.ascontiguousarray(landmarks[:, :21, 0].T, dtype=np.float64))
+        self.y = list(np.ascontiguousarray(landmarks[:, :21, 1].T, dtype=np.float64))
+        self.up, self.down = extension_bits(self.y)
+        self._distances = {}
+
+    @cached_property
+    def xy(self):
+        return np.stack([np.stack(self.x, axis=1), np.stack(self.y, axis=1)], axis=2)
+
+    @cached_property
+    def dist(self):
+        """(N, 21, 21) pairwise distances; 3.5 KB per hand."""
+        x, y = self.xy[..., 0], self.xy[..., 1]
+        dx = x[:, :, None] - x[:, None, :]
+        dy = y[:, :, None] - y[:, None, :]
+        return np.sqrt(dx * dx + dy * dy)
+
+    def distance(self, i, j):
+        # Kept, since the same batch is rescored many times while tuning thresholds
+        if (i, j) not in self._distances:
+            self._distances[i, j] = np.sqrt((self.x[i] - self.x[j]) ** 2 + (self.y[i] - self.y[j]) ** 2)
+        return self._distances[i, j]
@@ -0,0 +1,183 @@
+"""
+Hand detection helpers shared by the realtime scripts.
+"""
+
+
+def first_hand(result):
+    """Return the first hand dict from a HandDetector.findHands result, or None.
+
+    cvzone returns either ``allHands`` or ``(allHands, img)`` depending on
+    version and the ``draw`` flag; both shapes are accepted here.
+    """
+    if not result:
+        return None
+    hands = result[0] if isinstance(result, tuple) else result
+    if isinstance(hands, dict):
+        return hands
+    if hands and isinstance(hands[0], dict):
+        return hands[0]
+    return None
+
+
+def detection_score(hand, detector):
+    """Confidence of the hand ``detector`` just returned, or None when it does not report one.
+
+    cvzone 1.x keeps the MediaPipe result on ``detector.results``, whose
+    ``multi_handedness`` carries the classification score; a ``'score'`` key
+    on the hand dict is used first. cvzone 2.x (Tasks API) exposes neither.
+    """
+    if 'score' in hand:
+        return float(hand['score'])
+    handedness = getattr(getattr(detector, 'results', None), 'multi_handedness', None)
+    if handedness:
+        return float(handedness[0].classification[0].score)
+    return None
+
+
+def crop_landmarks(lm_list, bbox, offset):
+    """Translate full-frame landmarks into the coordinates of the ROI crop.
+
+    The crop is ``frame[y - offset:y + h + offset, x - offset:x + w + offset]``,
+    so its origin is ``(x - offset, y - offset)``. This gives the same points a
+    second ``findHands`` pass over that crop would report, without running it.
+    """
+    x0 = bbox[0] - offset
+    y0 = bbox[1] - offset
+    return [[p[0] - x0, p[1] - y0] + list(p[2:]) for p in lm_list]
+
+
+def locate_hand(frame, hd, hd2=None, offset=29):
+    """Find one hand and return ``(bbox, pts)`` with ``pts`` relative to the ROI crop.
+
+    With ``hd2`` set, the landmarks come from a second detection pass over the
+    crop (the original behaviour); otherwise the first-pass landmarks are
+    translated with crop_landmarks(). Returns ``(None, None)`` when no hand
+    is found or the crop is empty.
+    """
+    hand = first_hand(hd.findHands(frame, draw=False, flipType=True))
+    if hand is None:
+        return None, None
+    x, y, w, h = hand['bbox']
+    image = frame[y - offset:y + h + offset, x - offset:x + w + offset]
+    if image is None or image.size == 0:
+        return None, None
+    if hd2 is None:
+        return hand['bbox'], crop_landmarks(hand['lmList'], hand['bbox'], offset)
+    handz = first_hand(hd2.findHands(image, draw=False, flipType=True))
+    if handz is None:
+        return None, None
+    return hand['bbox'], handz['lmList']
+
+
+class RoiTracker:
+    """Runs hand detection on a predicted ROI instead of the whole frame.
+
+    The next ROI is the last bbox moved by its last displacement and grown by
+    ``margin`` (a fraction of the bbox size). The frame is searched in full
+    when the hand is not found in the ROI, when its detection score (see
+    detection_score) is below ``min_score``, or when its bbox touches the ROI
+    border (the hand is leaving it and the landmarks are likely clipped).
+    Detectors that report no score only get the border check.
+
+    Exposes the same ``findHands`` call as cvzone's HandDetector, so it can be
+    passed anywhere a detector is expected. Landmarks and bbox are returned in
+    full-frame coordinates.
+
+    ``roi_detector`` is used for the crops so MediaPipe's own frame-to-frame
+    tracking in ``detector`` is not confused by changing image sizes.
+    """
+
+    def __init__(self, detector, roi_detector=None, margin=0.5, min_size=120, min_score=0.8):
+        self.detector = detector
+        self.roi_detector = roi_detector or detector
+        self.margin = margin
+        self.min_size = min_size
+        self.min_score = min_score
+        self.last_bbox = None
+        self.velocity = (0, 0)
+        self.hits = 0
+        self.misses = 0
+        self.full_searches = 0
+        self.low_score = 0
+        self.lost = 0
+
+    def predict_roi(self, frame_shape):
+        """ROI ``(x0, y0, x1, y1)`` expected to contain the hand in the next frame."""
+        x, y, w, h = self.last_bbox
+        cx = x + w / 2 + self.velocity[0]
+        cy = y + h / 2 + self.velocity[1]
+        half_w = max(w * (1 + 2 * self.margin), self.min_size) / 2
+        half_h = max(h * (1 + 2 * self.margin), self.min_size) / 2
+        height, width = frame_shape[:2]
+        x0 = max(int(cx - half_w), 0)
+        y0 = max(int(cy - half_h), 0)
+        x1 = min(int(cx + half_w), width)
+        y1 = min(int(cy + half_h), height)
+        return x0, y0, x1, y1
+
+    def _track(self, hand):
+        x, y, w, h = hand['bbox']
+        if self.last_bbox is not None:
+            lx, ly, lw, lh = self.last_bbox
+            self.velocity = ((x + w / 2) - (lx + lw / 2), (y + h / 2) - (ly + lh / 2))
+        else:
+            self.velocity = (0, 0)
+        self.last_bbox = (x, y, w, h)
+
+    def _search_roi(self, img, flipType):
+        x0, y0, x1, y1 = self.predict_roi(img.shape)
+        if x1 - x0 <= 1 or y1 - y0 <= 1:
+            return None
+        hand = first_hand(self.roi_detector.findHands(img[y0:y1, x0:x1], draw=False, flipType=flipType))
+        if hand is None:
+            return None
+        score = detection_score(hand, self.roi_detector)
+        if score is not None and score < self.min_score:
+            self.low_score += 1
+            return None
+        bx, by, bw, bh = hand['bbox']
+        # Touching the ROI border means part of the hand may be outside it
+        if (bx <= 0 and x0 > 0) or (by <= 0 and y0 > 0) or \
+                (bx + bw >= x1 - x0 and x1 < img.shape[1]) or (by + bh >= y1 - y0 and y1 < img.shape[0]):
+            return None
+        hand = dict(hand)
+        hand['lmList'] = [[p[0] + x0, p[1] + y0] + list(p[2:]) for p in hand['lmList']]
+        hand['bbox'] = (bx + x0, by + y0, bw, bh)
+        if 'center' in hand:
+            hand['center'] = (hand['center'][0] + x0, hand['center'][1] + y0)
+        return hand
+
+    def findHands(self, img, draw=False, flipType=True):
+        hand = None
+        if self.last_bbox is not None:
+            hand = self._search_roi(img, flipType)
+            if hand is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if hand is None:
+            self.full_searches += 1
+            hand = first_hand(self.detector.findHands(img, draw=False, flipType=flipType))
+        if hand is None:
+            if self.last_bbox is not None:
+                self.lost += 1
+            self.last_bbox = None
+            self.velocity = (0, 0)
+            return []
+        self._track(hand)
+        return [hand]
+
+    def reset(self):
+        self.last_bbox = None
+        self.velocity = (0, 0)
+
+    def stats(self):
+        tracked = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'full_searches': self.full_searches,
+            'low_score': self.low_score,
+            'lost': self.lost,
+            'hit_rate': self.hits / tracked if tracked else 0.0,
+        }
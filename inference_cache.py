@@ -0,0 +1,108 @@
+"""
+LRU cache of CNN results keyed on quantized hand landmarks.
+
+While a sign is held, consecutive frames give nearly the same lmList, and
+rendering the skeleton and running the CNN again yields the same
+probabilities. InferenceCache maps a landmark signature to the CNN
+output of the first frame that produced it. The pipeline then skips the
+CNN for the frames after it. The skeleton is still rendered from each
+frame's own landmarks, so the preview follows the hand; rendering costs
+well under a millisecond next to the CNN.
+
+The signature is the landmarks divided by the bbox width and height,
+plus the bbox size divided by the 400px canvas, since the CNN sees the
+skeleton at its pixel size. It is rounded to cells of ``tolerance`` for
+the key. A frame also hits when no coordinate is more than ``tolerance``
+from the most recent entry. Only the CNN output is reused; the letter
+rules still run on each frame's own landmarks.
+
+Call invalidate() when the model changes. recognition_stages binds the
+cache to its model, which also clears it when a different model is bound.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from skeleton_renderer import CANVAS_SIZE
+
+CACHE_SIZE = int(os.environ.get('SIGNTALK_CACHE_SIZE', '256'))
+TOLERANCE = float(os.environ.get('SIGNTALK_CACHE_TOLERANCE', '0.03'))
+
+
+class InferenceCache:
+    """Bounded LRU from landmark signatures to CNN outputs.
+
+    The lookup and predict stages use it from different threads, so every
+    access holds a lock.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE, tolerance=TOLERANCE):
+        self.maxsize = maxsize
+        self.tolerance = tolerance
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.model = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def signature(self, pts, bbox):
+        """``(key, vector)``: the landmarks over the bbox size plus the bbox size over the canvas."""
+        _, _, w, h = bbox
+        xy = np.asarray(pts, dtype=np.float64)[:21, :2] / (max(w, 1), max(h, 1))
+        vector = np.concatenate([xy.ravel(), (w / CANVAS_SIZE, h / CANVAS_SIZE)])
+        return np.rint(vector / self.tolerance).astype(np.int16).tobytes(), vector
+
+    def get(self, key, vector):
+        """Entry for ``key``, else the most recent entry if ``vector`` is within tolerance of it.
+
+        A held hand jitters across cell borders, and with 44 coordinates
+        one of them nearly always crosses, so the exact key alone rarely
+        matches. The recent-entry check catches those frames.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None and self.entries:
+                last = next(reversed(self.entries))
+                if np.abs(self.entries[last][1] - vector).max() <= self.tolerance:
+                    key, entry = last, self.entries[last]
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, vector, prob):
+        with self.lock:
+            self.entries[key] = (prob, vector)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def bind(self, model):
+        """Use the cache for ``model``; clears it if another model was bound."""
+        if self.model is not None and self.model is not model:
+            self.invalidate()
+        self.model = model
+
+    def invalidate(self):
+        with self.lock:
+            self.entries.clear()
+            self.invalidations += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
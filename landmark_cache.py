@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of MediaPipe landmarks for the AtoZ_3.1 images.
+
+The evaluation scripts otherwise decode every JPG and rerun hand
+detection on each run, although the dataset never changes. The cache is
+a single .npz of columnar arrays, one row per image:
+
+- paths: path relative to the dataset root
+- labels: letter folder
+- sha1: content hash of the file when it was extracted
+- status: 0 hand found, 1 no hand detected, 2 unreadable image
+- landmarks: int16 (N, 21, 3), the detector's lmList
+- bbox: int32 (N, 4), the detector's (x, y, w, h)
+
+update() hashes the requested files and runs detection only on files that
+are new or whose content changed since they were cached.
+"""
+
+import hashlib
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+from hand_tracking import first_hand
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_DIR = os.path.join(BASE_DIR, 'AtoZ_3.1')
+CACHE_PATH = os.path.join(BASE_DIR, 'AtoZ_3.1_landmarks.npz')
+
+FOUND, NO_HAND, UNREADABLE = 0, 1, 2
+STATUS_ERRORS = {NO_HAND: 'No hand detected', UNREADABLE: 'Failed to load image'}
+
+
+def file_sha1(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def extract(detector, path):
+    """``(status, landmarks, bbox)`` for one image, as stored in the cache."""
+    landmarks = np.zeros((21, 3), dtype=np.int16)
+    bbox = np.zeros(4, dtype=np.int32)
+    img = cv2.imread(path)
+    if img is None:
+        return UNREADABLE, landmarks, bbox
+    hand = first_hand(detector.findHands(img, draw=False, flipType=True))
+    if hand is None:
+        return NO_HAND, landmarks, bbox
+    landmarks[:] = np.asarray(hand['lmList'])[:21, :3]
+    bbox[:] = hand['bbox']
+    return FOUND, landmarks, bbox
+
+
+class LandmarkCache:
+    """Columnar landmark store indexed by dataset-relative path."""
+
+    def __init__(self, root=DATASET_DIR, paths=(), labels=(), sha1=(), status=(), landmarks=None, bbox=None):
+        self.root = root
+        self.paths = np.asarray(paths, dtype=str)
+        self.labels = np.asarray(labels, dtype=str)
+        self.sha1 = np.asarray(sha1, dtype='S40')
+        self.status = np.asarray(status, dtype=np.int8)
+        self.landmarks = np.zeros((0, 21, 3), dtype=np.int16) if landmarks is None else landmarks
+        self.bbox = np.zeros((0, 4), dtype=np.int32) if bbox is None else bbox
+        self._index = {p: i for i, p in enumerate(self.paths.tolist())}
+
+    @classmethod
+    def load(cls, cache_path=CACHE_PATH, root=DATASET_DIR):
+        """The stored cache, or an empty one when the file does not exist."""
+        if not os.path.exists(cache_path):
+            return cls(root)
+        with np.load(cache_path, allow_pickle=False) as data:
+            return cls(root, data['paths'], data['labels'], data['sha1'], data['status'],
+                       data['landmarks'], data['bbox'])
+
+    def save(self, cache_path=CACHE_PATH):
+        fd, tmp_path = tempfile.mkstemp(suffix='.npz', dir=os.path.dirname(cache_path) or '.')
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, paths=self.paths, labels=self.labels, sha1=self.sha1, status=self.status,
+                     landmarks=self.landmarks, bbox=self.bbox)
+        os.replace(tmp_path, cache_path)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def key(self, path):
+        return os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, '/')
+
+    def row(self, path, digest=None):
+        """Row index for ``path``; None if not cached or cached with a different ``digest``."""
+        i = self._index.get(self.key(path))
+        if i is None or (digest is not None and self.sha1[i].decode() != digest):
+            return None
+        return i
+
+    def lookup(self, path):
+        """``(lmList, bbox)`` for a cached image whose file is unchanged, else None."""
+        i = self.row(path, file_sha1(path)) if os.path.exists(path) else None
+        if i is None:
+            return None
+        if self.status[i] != FOUND:
+            raise ValueError(STATUS_ERRORS[int(self.status[i])])
+        return self.landmarks[i].tolist(), tuple(int(v) for v in self.bbox[i])
+
+    def landmarks_for(self, path):
+        """Cached lmList for ``path``; raises ValueError with the detection failure."""
+        i = self._index[self.key(path)]
+        if self.status[i] != FOUND:
+            raise ValueError(STATUS_ERRORS[int(self.status[i])])
+        return self.landmarks[i].tolist()
+
+
+def update(paths, cache_path=CACHE_PATH, root=DATASET_DIR, detector=None, progress=None):
+    """Bring the cache up to date for ``paths`` and return ``(cache, stats)``.
+
+    Only new or modified files are run through the detector. Entries for
+    files that no longer exist are dropped. The cache is written back only
+    when something changed.
+    """
+    cache = LandmarkCache.load(cache_path, root)
+    keep = np.array([os.path.exists(os.path.join(root, p)) for p in cache.paths.tolist()], dtype=bool)
+    removed = int((~keep).sum())
+
+    rows = {p: i for i, p in enumerate(cache.paths.tolist()) if keep[i]}
+    stale = []
+    for path in paths:
+        key = cache.key(path)
+        digest = file_sha1(path)
+        i = rows.get(key)
+        if i is None or cache.sha1[i].decode() != digest:
+            stale.append((key, os.path.basename(os.path.dirname(path)), digest, path))
+
+    if not stale and not removed:
+        return cache, {'total': len(cache), 'reused': len(paths), 'extracted': 0, 'removed': 0}
+
+    if stale and detector is None:
+        from cvzone.HandTrackingModule import HandDetector
+        detector = HandDetector(maxHands=1)
+
+    new_status = np.zeros(len(stale), dtype=np.int8)
+    new_landmarks = np.zeros((len(stale), 21, 3), dtype=np.int16)
+    new_bbox = np.zeros((len(stale), 4), dtype=np.int32)
+    for n, (_, _, _, path) in enumerate(stale):
+        new_status[n], new_landmarks[n], new_bbox[n] = extract(detector, path)
+        if progress:
+            progress(n + 1, len(stale))
+
+    keys, labels, digests, _ = zip(*stale) if stale else ((), (), (), ())
+    # Stale rows are replaced, so drop their old versions along with deleted files
+    for key in keys:
+        if key in rows:
+            keep[rows[key]] = False
+    cache = LandmarkCache(
+        root,
+        np.concatenate([cache.paths[keep], np.asarray(keys, dtype=str)]),
+        np.concatenate([cache.labels[keep], np.asarray(labels, dtype=str)]),
+        np.concatenate([cache.sha1[keep], np.asarray(digests, dtype='S40')]),
+        np.concatenate([cache.status[keep], new_status]),
+        np.concatenate([cache.landmarks[keep], new_landmarks]),
+        np.concatenate([cache.bbox[keep], new_bbox]),
+    )
+    cache.save(cache_path)
+    return cache, {'total': len(cache), 'reused': len(paths) - len(stale), 'extracted': len(stale), 'removed': removed}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from batch_eval import flatten, list_dataset
+
+    parser = argparse.ArgumentParser(description='Extract AtoZ_3.1 hand landmarks into the on-disk cache')
+    parser.add_argument('--cache', default=CACHE_PATH, help=f'Cache file (default: {CACHE_PATH})')
+    parser.add_argument('--rebuild', action='store_true', help='Discard the existing cache first')
+
+    args = parser.parse_args()
+    if args.rebuild and os.path.exists(args.cache):
+        os.remove(args.cache)
+    paths, _ = flatten(list_dataset())
+
+    def progress(done, total):
+        if done % 100 == 0 or done == total:
+            print(f"  Extracted {done}/{total}")
+
+    cache, stats = update(paths, cache_path=args.cache, progress=progress)
+    found = int((cache.status == FOUND).sum())
+    print(f"Cache {args.cache}: {stats['total']} images ({found} with a hand), "
+          f"{stats['extracted']} extracted, {stats['reused']} reused, {stats['removed']} removed")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Landmark-only recognizer: a small MLP on the 21 normalized hand landmarks.
+
+The CNN path draws the landmarks onto a 400x400 canvas so the network can
+find them again in pixels. This engine skips the CNN and classifies the
+landmarks directly. Inference is NumPy matrix products, tens of
+microseconds per hand, with no TensorFlow import.
+
+Two targets are trained from the AtoZ_3.1 landmark cache:
+
+- groups: the CNN's 8 groups. It is a drop-in replacement for the CNN's
+  probabilities, and the rule cascade in rule_engine still picks the letter.
+- letters: all 26 letters. Only the gesture rules (space, next,
+  Backspace) are applied on top.
+
+The engine is chosen with SIGNTALK_ENGINE: cnn (default), landmarks-groups,
+landmarks-letters or tiered (the letters model, falling back to the CNN
+when unsure; see tiered.py). Train with
+``python landmark_classifier.py --target groups``.
+"""
+
+import os
+import time
+from string import ascii_uppercase
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATHS = {
+    'groups': os.path.join(BASE_DIR, 'landmark_mlp_groups.npz'),
+    'letters': os.path.join(BASE_DIR, 'landmark_mlp_letters.npz'),
+}
+
+ENGINE = os.environ.get('SIGNTALK_ENGINE', 'cnn')
+ENGINES = ('cnn', 'landmarks-groups', 'landmarks-letters', 'tiered')
+
+
+def normalize(landmarks):
+    """(N, 42) float32 features from (N, 21, 2+) landmarks, or (42,) from one hand.
+
+    Coordinates are taken relative to the wrist and divided by the largest
+    wrist distance, so position and hand size in the frame do not matter.
+    """
+    xy = np.asarray(landmarks, dtype=np.float32)[..., :21, :2]
+    xy = xy - xy[..., :1, :]
+    scale = np.sqrt((xy * xy).sum(-1)).max(-1)[..., None, None]
+    xy = xy / np.where(scale > 0, scale, 1)
+    return xy.reshape(xy.shape[:-2] + (42,))
+
+
+def forward(layers, x):
+    """Class probabilities of the MLP ``layers`` [(W, b), ...] for features ``x``."""
+    for W, b in layers[:-1]:
+        x = np.maximum(x @ W + b, 0)
+    W, b = layers[-1]
+    z = x @ W + b
+    z = np.exp(z - z.max(-1, keepdims=True))
+    return z / z.sum(-1, keepdims=True)
+
+
+class LandmarkClassifier:
+    """A trained landmark MLP. predict() takes one lmList, predict_batch() (N, 21, 2+) landmarks."""
+
+    name = 'landmarks'
+    # Tells the pipeline to feed landmarks instead of rendered skeletons
+    from_landmarks = True
+
+    def __init__(self, model_path):
+        self.model_path = model_path
+        with np.load(model_path, allow_pickle=False) as data:
+            self.target = str(data['target'])
+            self.classes = [str(c) for c in data['classes']]
+            self.layers = [(data[f'W{i}'], data[f'b{i}']) for i in range(int(data['depth']))]
+
+    def predict_batch(self, landmarks):
+        return forward(self.layers, normalize(landmarks))
+
+    def predict(self, pts):
+        return forward(self.layers, normalize(pts))
+
+
+def load_engine(name=None):
+    """The CNN backend (predictor.load_backend) or a LandmarkClassifier, per SIGNTALK_ENGINE."""
+    name = (name or ENGINE).lower()
+    if name not in ENGINES:
+        raise ValueError(f"Unknown recognition engine {name!r}; choose from {', '.join(ENGINES)}")
+    if name in ('cnn', 'tiered'):
+        from predictor import load_backend
+        cnn = load_backend()
+        if name == 'cnn':
+            return cnn
+        from tiered import TieredRecognizer
+        return TieredRecognizer(LandmarkClassifier(MODEL_PATHS['letters']), cnn)
+    return LandmarkClassifier(MODEL_PATHS[name.split('-', 1)[1]])
+
+
+def train(x, y, n_classes, hidden=(64, 64), epochs=300, batch_size=128, lr=1e-3, weight_decay=1e-4, seed=0):
+    """Fit an MLP with Adam on softmax cross-entropy; returns [(W, b), ...]."""
+    rng = np.random.default_rng(seed)
+    sizes = (x.shape[1],) + tuple(hidden) + (n_classes,)
+    params = []
+    for n_in, n_out in zip(sizes[:-1], sizes[1:]):
+        params.append(rng.normal(0, np.sqrt(2 / n_in), (n_in, n_out)).astype(np.float32))
+        params.append(np.zeros(n_out, dtype=np.float32))
+    m = [np.zeros_like(p) for p in params]
+    v = [np.zeros_like(p) for p in params]
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    onehot = np.eye(n_classes, dtype=np.float32)[y]
+    step = 0
+    for _ in range(epochs):
+        order = rng.permutation(len(x))
+        for start in range(0, len(x), batch_size):
+            idx = order[start:start + batch_size]
+            # Forward, keeping each layer's input for backprop
+            acts = [x[idx]]
+            for i in range(0, len(params) - 2, 2):
+                acts.append(np.maximum(acts[-1] @ params[i] + params[i + 1], 0))
+            z = acts[-1] @ params[-2] + params[-1]
+            z = np.exp(z - z.max(-1, keepdims=True))
+            grad = (z / z.sum(-1, keepdims=True) - onehot[idx]) / len(idx)
+
+            grads = [None] * len(params)
+            for i in range(len(params) - 2, -1, -2):
+                grads[i] = acts[i // 2].T @ grad + weight_decay * params[i]
+                grads[i + 1] = grad.sum(0)
+                if i:
+                    grad = (grad @ params[i].T) * (acts[i // 2] > 0)
+
+            step += 1
+            for p, g, mp, vp in zip(params, grads, m, v):
+                mp *= beta1
+                mp += (1 - beta1) * g
+                vp *= beta2
+                vp += (1 - beta2) * g * g
+                p -= lr * (mp / (1 - beta1 ** step)) / (np.sqrt(vp / (1 - beta2 ** step)) + eps)
+    return [(params[i], params[i + 1]) for i in range(0, len(params), 2)]
+
+
+def save(path, layers, target, classes, held_out_paths=()):
+    arrays = {f'W{i}': W for i, (W, _) in enumerate(layers)}
+    arrays.update({f'b{i}': b for i, (_, b) in enumerate(layers)})
+    np.savez(path, depth=len(layers), target=target, classes=np.asarray(classes, dtype=str),
+             held_out_paths=np.asarray(held_out_paths, dtype=str), **arrays)
+
+
+def split(n, held_out=0.3, seed=0):
+    """Boolean mask of the training rows; the rest are held out."""
+    return np.random.default_rng(seed).random(n) >= held_out
+
+
+def cached_hands(cache_path=None):
+    """``(paths, landmarks, labels)`` for every cached AtoZ_3.1 image with a hand."""
+    from landmark_cache import CACHE_PATH, FOUND, LandmarkCache
+
+    cache = LandmarkCache.load(cache_path or CACHE_PATH)
+    found = cache.status == FOUND
+    return cache.paths[found], cache.landmarks[found], cache.labels[found]
+
+
+def main(target='groups', hidden=(64, 64), epochs=300, held_out=0.3, seed=0, cache_path=None, output=None):
+    from predictor import LETTER_GROUPS
+
+    paths, landmarks, labels = cached_hands(cache_path)
+    if not len(labels):
+        print("No cached hands; build the cache with landmark_cache.py first")
+        return None
+    if target == 'groups':
+        classes = [str(g) for g in range(8)]
+        y = np.array([LETTER_GROUPS[str(letter)] for letter in labels])
+    else:
+        classes = list(ascii_uppercase)
+        y = np.array([ascii_uppercase.index(str(letter)) for letter in labels])
+
+    x = normalize(landmarks)
+    fit = split(len(y), held_out, seed)
+    start = time.perf_counter()
+    layers = train(x[fit], y[fit], len(classes), hidden=hidden, epochs=epochs, seed=seed)
+    print(f"Trained on {int(fit.sum())} hands in {time.perf_counter() - start:.1f}s")
+
+    for label, rows in (('train', fit), ('held-out', ~fit)):
+        if rows.any():
+            accuracy = (forward(layers, x[rows]).argmax(-1) == y[rows]).mean() * 100
+            print(f"{label:<9} {target} accuracy {accuracy:.2f}% ({int(rows.sum())} hands)")
+
+    output = output or MODEL_PATHS[target]
+    save(output, layers, target, classes, held_out_paths=paths[~fit])
+    print(f"Model saved to: {output}")
+    return layers
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Train the landmark MLP on the AtoZ_3.1 landmark cache')
+    parser.add_argument('--target', choices=sorted(MODEL_PATHS), default='groups',
+                        help='Predict the 8 CNN groups or the 26 letters (default: groups)')
+    parser.add_argument('--hidden', type=int, nargs='+', default=[64, 64], help='Hidden layer sizes (default: 64 64)')
+    parser.add_argument('--epochs', type=int, default=300, help='Training epochs (default: 300)')
+    parser.add_argument('--held-out', type=float, default=0.3, help='Fraction of hands held out (default: 0.3)')
+    parser.add_argument('--seed', type=int, default=0, help='Split and initialisation seed (default: 0)')
+    parser.add_argument('--cache', default=None, help='Landmark cache (default: AtoZ_3.1_landmarks.npz)')
+    parser.add_argument('--output', default=None, help='Model path (default: landmark_mlp_<target>.npz)')
+
+    args = parser.parse_args()
+    main(target=args.target, hidden=tuple(args.hidden), epochs=args.epochs, held_out=args.held_out,
+         seed=args.seed, cache_path=args.cache, output=args.output)
@@ -0,0 +1,73 @@
+"""
+Skips recognition while the hand holds still.
+
+MotionGate compares each frame's landmarks with the ones recognition last
+ran on. The score is the mean landmark displacement divided by the larger
+bbox side. Below ``threshold``, the frame skips rendering, the CNN and
+the rule cascade, and the app re-emits its last letter to the temporal
+logic instead. Every ``refresh`` frames recognition runs anyway, so a slow
+drift or a wrong first guess is corrected.
+"""
+
+import os
+
+import numpy as np
+
+THRESHOLD = float(os.environ.get('SIGNTALK_MOTION_THRESHOLD', '0.02'))
+REFRESH = int(os.environ.get('SIGNTALK_MOTION_REFRESH', '15'))
+
+# Pipeline stages a skipped frame does not run
+GATED_STAGES = ('cache', 'render', 'predict')
+
+
+class MotionGate:
+    """Decides per frame whether the pose changed enough to recognize it again."""
+
+    def __init__(self, threshold=THRESHOLD, refresh=REFRESH):
+        self.threshold = threshold
+        self.refresh = refresh
+        self.reference = None
+        self.since_refresh = 0
+        self.frames = 0
+        self.skipped = 0
+        self.forced = 0
+
+    def score(self, pts, bbox):
+        """Mean landmark displacement from the reference pose, over the larger bbox side."""
+        _, _, w, h = bbox
+        xy = np.asarray(pts, dtype=np.float64)[:21, :2]
+        return float(np.sqrt(((xy - self.reference) ** 2).sum(-1)).mean() / max(w, h, 1))
+
+    def check(self, pts, bbox):
+        """True if the frame should be recognized; False to re-emit the last letter."""
+        self.frames += 1
+        if self.reference is not None and self.score(pts, bbox) < self.threshold:
+            if self.since_refresh + 1 < self.refresh:
+                self.since_refresh += 1
+                self.skipped += 1
+                return False
+            self.forced += 1
+        self.reference = np.asarray(pts, dtype=np.float64)[:21, :2]
+        self.since_refresh = 0
+        return True
+
+    def reset(self):
+        """Forget the reference pose, e.g. when the hand is lost."""
+        self.reference = None
+        self.since_refresh = 0
+
+    def stats(self, pipeline_stats=None):
+        """Counters; with Pipeline.stats(), also the stage time the skipped frames saved."""
+        stats = {
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'forced': self.forced,
+            'skip_rate': self.skipped / self.frames if self.frames else 0.0,
+        }
+        recognized = self.frames - self.skipped
+        if pipeline_stats is not None and recognized:
+            # Skipped frames pass through these stages almost for free, so charge their time to the rest
+            busy = sum(pipeline_stats[name]['avg_ms'] * pipeline_stats[name]['processed']
+                       for name in GATED_STAGES if name in pipeline_stats)
+            stats['saved_ms'] = self.skipped * busy / recognized
+        return stats
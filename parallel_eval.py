@@ -0,0 +1,115 @@
+"""
+Process-pool evaluator for test_all_letters.
+
+The image list is cut into shards and spread over worker processes. Each
+worker builds its own HandDetector (or opens the landmark cache),
+inference backend and skeleton renderer once, in the pool initializer. It then runs every shard it
+receives through the batched engine in batch_eval and sends back one
+predicted letter (or error) per image. Results stream back as shards
+finish and are put back in dataset order.
+
+Workers are started with the spawn method, because TensorFlow and
+MediaPipe do not survive a fork. Each worker is limited to
+``threads_per_worker`` inference threads, so N workers use about N cores.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from batch_eval import evaluate, load_landmarks, top2
+from landmark_cache import CACHE_PATH, LandmarkCache
+from rule_engine import classify
+from skeleton_renderer import render_skeleton
+
+_worker = {}
+
+
+def _init_worker(backend, variant, batch_size, threads_per_worker, cache_path):
+    from cvzone.HandTrackingModule import HandDetector
+    from predictor import load_backend
+    from skeleton_renderer import SkeletonRenderer
+
+    _worker['cache'] = LandmarkCache.load(cache_path) if cache_path else None
+    _worker['detector'] = None if _worker['cache'] else HandDetector(maxHands=1)
+    _worker['model'] = load_backend(backend, variant=variant, num_threads=threads_per_worker)
+    _worker['renderer'] = SkeletonRenderer()
+    _worker['batch_size'] = batch_size
+
+
+def _prepare(img_path):
+    if _worker['cache']:
+        pts = _worker['cache'].landmarks_for(img_path)
+    else:
+        pts = load_landmarks(_worker['detector'], img_path)
+    return render_skeleton(pts, _worker['renderer']).copy(), pts
+
+
+def _evaluate_shard(shard):
+    """Predict every ``(index, path)`` in the shard; returns ``(index, letter, error)`` rows and timings."""
+    indices = [i for i, _ in shard]
+    result = evaluate(_worker['model'], [path for _, path in shard], _prepare, batch_size=_worker['batch_size'])
+    groups = top2(result.probs)
+    rows = []
+    for k, i in enumerate(indices):
+        if result.ok[k]:
+            rows.append((i, classify(groups[k, 0], groups[k, 1], result.payloads[k]), None))
+        else:
+            rows.append((i, None, result.errors[k]))
+    return rows, result.timings
+
+
+def run(paths, workers=None, backend=None, variant=None, batch_size=32, shard_size=64,
+        threads_per_worker=1, use_cache=False, cache_path=CACHE_PATH, progress=None):
+    """Predict a letter for every path in parallel.
+
+    With ``use_cache`` the workers read landmarks from ``cache_path``, which
+    must already cover ``paths`` (see landmark_cache.update).
+
+    Returns ``(predictions, errors, timings)``. ``predictions[i]`` is the
+    letter for ``paths[i]``, or None when ``errors[i]`` says why it failed.
+    ``progress(done, total)`` is called as each shard comes back.
+    """
+    workers = workers or os.cpu_count()
+    n = len(paths)
+    predictions = [None] * n
+    errors = [None] * n
+    decode_time = 0.0
+    predict_time = 0.0
+    batches = 0
+    done = 0
+    start = time.perf_counter()
+
+    items = list(enumerate(paths))
+    shards = [items[i:i + shard_size] for i in range(0, n, shard_size)]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_worker,
+                             initargs=(backend, variant, batch_size, threads_per_worker,
+                                       cache_path if use_cache else None)) as pool:
+        futures = [pool.submit(_evaluate_shard, shard) for shard in shards]
+        for future in as_completed(futures):
+            rows, timings = future.result()
+            for i, letter, error in rows:
+                predictions[i] = letter
+                errors[i] = error
+            decode_time += timings['decode_s']
+            predict_time += timings['predict_s']
+            batches += timings['batches']
+            done += len(rows)
+            if progress:
+                progress(done, n)
+
+    total_time = time.perf_counter() - start
+    timings = {
+        'workers': workers,
+        'batch_size': batch_size,
+        'shards': len(shards),
+        'batches': batches,
+        'images': n,
+        'decode_s': decode_time,
+        'predict_s': predict_time,
+        'total_s': total_time,
+        'images_per_s': n / total_time if total_time else 0.0,
+    }
+    return predictions, errors, timings
@@ -0,0 +1,263 @@
+"""
+Staged recognition pipeline.
+
+capture -> detection -> skeleton rendering -> CNN inference run as separate
+stages, each on its own worker thread, connected by small bounded queues.
+While the CNN works on frame N, detection is already busy with frame N+1.
+Queues drop their oldest packet when full so latency stays bounded.
+
+Packets are plain dicts that every stage annotates in place:
+    frame_id, timestamp, frame, bbox, pts, white, prob, skipped
+(and cache_key when an inference cache is in front of render and predict).
+"""
+
+import queue
+import threading
+import time
+import traceback
+
+import cv2
+
+from hand_tracking import locate_hand
+from skeleton_renderer import SkeletonRenderer
+
+
+def put_latest(q, item):
+    """Put ``item`` on ``q``, evicting the oldest entries if it is full.
+
+    Returns how many packets were dropped to make room.
+    """
+    dropped = 0
+    while True:
+        try:
+            q.put_nowait(item)
+            return dropped
+        except queue.Full:
+            try:
+                q.get_nowait()
+                dropped += 1
+            except queue.Empty:
+                pass
+
+
+class Stage:
+    """One pipeline step: ``func(packet)`` returns the packet (or None to discard it)."""
+
+    def __init__(self, name, func, maxsize=2):
+        self.name = name
+        self.func = func
+        self.input = queue.Queue(maxsize)
+        self.processed = 0
+        self.dropped = 0
+        self.busy_time = 0.0
+
+    def stats(self):
+        avg = self.busy_time / self.processed if self.processed else 0.0
+        return {'processed': self.processed, 'dropped': self.dropped, 'avg_ms': avg * 1000}
+
+
+class Pipeline:
+    """Runs ``stages`` on worker threads, fed from a FrameGrabber."""
+
+    def __init__(self, grabber, stages, maxsize=2):
+        self.grabber = grabber
+        self.stages = stages
+        self.output = queue.Queue(maxsize)
+        self.output_dropped = 0
+        self._running = False
+        self._threads = []
+
+    def start(self):
+        if self._running:
+            return self
+        self._running = True
+        self.grabber.start()
+        self._threads = [threading.Thread(target=self._feed, name="pipeline-source", daemon=True)]
+        for i, stage in enumerate(self.stages):
+            next_stage = self.stages[i + 1] if i + 1 < len(self.stages) else None
+            self._threads.append(threading.Thread(target=self._work, args=(stage, next_stage),
+                                                  name="pipeline-" + stage.name, daemon=True))
+        for t in self._threads:
+            t.start()
+        return self
+
+    def _feed(self):
+        first = self.stages[0] if self.stages else None
+        while self._running:
+            frame, timestamp, frame_id = self.grabber.read_latest(timeout=0.1)
+            if frame is None:
+                continue
+            packet = {'frame_id': frame_id, 'timestamp': timestamp, 'frame': frame,
+                      'bbox': None, 'pts': None, 'white': None, 'prob': None, 'skipped': False}
+            self._forward(packet, first)
+
+    def _forward(self, packet, stage):
+        if stage is None:
+            self.output_dropped += put_latest(self.output, packet)
+        else:
+            stage.dropped += put_latest(stage.input, packet)
+
+    def _work(self, stage, next_stage):
+        while self._running:
+            try:
+                packet = stage.input.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            start = time.perf_counter()
+            try:
+                packet = stage.func(packet)
+            except Exception:
+                print("==", stage.name, traceback.format_exc())
+                packet = None
+            stage.busy_time += time.perf_counter() - start
+            stage.processed += 1
+            if packet is not None:
+                self._forward(packet, next_stage)
+
+    def get(self, timeout=None):
+        """Next finished packet, or None if none is ready within ``timeout``."""
+        try:
+            if timeout == 0:
+                return self.output.get_nowait()
+            return self.output.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stats(self):
+        stats = {stage.name: stage.stats() for stage in self.stages}
+        stats['output_dropped'] = self.output_dropped
+        stats['capture'] = self.grabber.stats()
+        return stats
+
+    def stop(self):
+        self._running = False
+        for t in self._threads:
+            t.join(timeout=1.0)
+        self._threads = []
+        self.grabber.stop()
+
+
+def detect_stage(hd, hd2=None, offset=29, flip=True):
+    """Hand detection on the mirrored frame; see hand_tracking.locate_hand for ``hd2``."""
+
+    def detect(packet):
+        frame = packet['frame']
+        if flip:
+            frame = cv2.flip(frame, 1)
+            packet['frame'] = frame
+        packet['bbox'], packet['pts'] = locate_hand(frame, hd, hd2, offset)
+        return packet
+
+    return Stage("detect", detect)
+
+
+def motion_gate_stage(gate):
+    """Mark frames whose pose barely moved as ``skipped``; see motion_gate.MotionGate."""
+
+    def check(packet):
+        if packet['pts'] is None:
+            gate.reset()
+        else:
+            packet['skipped'] = not gate.check(packet['pts'], packet['bbox'])
+        return packet
+
+    return Stage("gate", check)
+
+
+def render_stage():
+    renderer = SkeletonRenderer()
+
+    def render(packet):
+        # Rendered on cache hits too, so the preview shows the current hand
+        if packet['pts'] is not None and packet['white'] is None and not packet['skipped']:
+            _, _, w, h = packet['bbox']
+            # Downstream stages hold the image while the next frame renders
+            packet['white'] = renderer.render(packet['pts'], w, h).copy()
+        return packet
+
+    return Stage("render", render)
+
+
+def cache_lookup_stage(cache):
+    """Fill ``prob`` from an inference_cache.InferenceCache hit; stores the signature."""
+
+    def lookup(packet):
+        if packet['pts'] is not None and not packet['skipped']:
+            packet['cache_key'] = cache.signature(packet['pts'], packet['bbox'])
+            packet['prob'] = cache.get(*packet['cache_key'])
+        return packet
+
+    return Stage("cache", lookup)
+
+
+def predict_stage(model, cache=None):
+    """Run the 8-group CNN on the rendered skeleton; stores the probability vector.
+
+    ``model`` is a predictor.InferenceBackend. With ``cache``, results are
+    stored under the key cache_lookup_stage left in the packet.
+    """
+
+    def predict(packet):
+        if packet['white'] is not None and packet['prob'] is None:
+            packet['prob'] = model.predict(packet['white'])
+            if cache is not None:
+                cache.put(*packet['cache_key'], packet['prob'])
+        return packet
+
+    return Stage("predict", predict)
+
+
+def landmark_predict_stage(model):
+    """Classify the landmarks directly; ``model`` is a landmark_classifier.LandmarkClassifier."""
+
+    def predict(packet):
+        if packet['pts'] is not None and not packet['skipped']:
+            packet['prob'] = model.predict(packet['pts'])
+        return packet
+
+    return Stage("predict", predict)
+
+
+def tiered_predict_stage(recognizer):
+    """Landmark tier first, CNN on the rendered skeleton when unsure; see tiered.TieredRecognizer.
+
+    The skeleton is only rendered for frames that reach the CNN, so
+    fast-tier frames carry no ``white``.
+    """
+    renderer = SkeletonRenderer()
+
+    def predict(packet):
+        if packet['pts'] is not None and not packet['skipped']:
+            def render():
+                _, _, w, h = packet['bbox']
+                packet['white'] = renderer.render(packet['pts'], w, h).copy()
+                return packet['white']
+
+            packet['prob'] = recognizer.predict(packet['pts'], render)
+        return packet
+
+    return Stage("predict", predict)
+
+
+def recognition_stages(hd, hd2, model, offset=29, cache=None, gate=None):
+    """The standard detect -> render -> predict chain used by the realtime scripts.
+
+    Pass ``hd2=None`` to reuse the first-pass landmarks instead of detecting
+    the hand a second time on the ROI crop. A landmark engine predicts from
+    ``pts``; the skeleton is still rendered, off its path, for display.
+    The tiered engine renders only the frames it sends to the CNN. With an
+    inference_cache.InferenceCache, held poses skip the CNN. With a
+    motion_gate.MotionGate, frames whose pose barely moved skip recognition
+    and arrive with ``skipped`` set.
+    """
+    stages = [detect_stage(hd, hd2, offset)]
+    if gate is not None:
+        stages.append(motion_gate_stage(gate))
+    if getattr(model, 'tiered', False):
+        return stages + [tiered_predict_stage(model)]
+    if getattr(model, 'from_landmarks', False):
+        return stages + [landmark_predict_stage(model), render_stage()]
+    if cache is not None:
+        cache.bind(model)
+        return stages + [cache_lookup_stage(cache), render_stage(), predict_stage(model, cache)]
+    return stages + [render_stage(), predict_stage(model)]
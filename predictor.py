@@ -0,0 +1,198 @@
+"""
+Inference backends for the 8-group CNN (cnn8grps_rad1_model.h5).
+
+Every backend takes 400x400x3 skeleton images and returns the group
+probabilities: ``predict`` gives shape (8,) for one image, and
+``predict_batch`` gives (N, 8) for a stack.
+
+- keras: the .h5 model, traced once into a tf.function with a fixed input
+  signature. This avoids the data adapter and callback loop that keras
+  Model.predict sets up on every call.
+- tflite: a converted .tflite file on the TFLite interpreter (XNNPACK).
+- onnx: a converted .onnx file on ONNX Runtime's CPU provider.
+
+The tflite and onnx files are produced once by convert_model.py. Each
+backend imports its runtime only when it is constructed. With
+tflite_runtime or onnxruntime, the kiosk never imports TensorFlow.
+
+The backend is chosen with the SIGNTALK_BACKEND environment variable,
+which defaults to keras. SIGNTALK_VARIANT=float16 or int8 loads the
+quantized .tflite files written by quantize_model.py instead of the float
+model; those only run on the tflite backend.
+"""
+
+import os
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(BASE_DIR, 'cnn8grps_rad1_model.h5')
+INPUT_SHAPE = (400, 400, 3)
+
+BACKEND = os.environ.get('SIGNTALK_BACKEND', 'keras')
+MODEL_PATHS = {
+    'keras': MODEL_PATH,
+    'tflite': os.path.join(BASE_DIR, 'cnn8grps_rad1_model.tflite'),
+    'onnx': os.path.join(BASE_DIR, 'cnn8grps_rad1_model.onnx'),
+}
+
+VARIANT = os.environ.get('SIGNTALK_VARIANT', 'float')
+VARIANTS = ('float', 'float16', 'int8')
+QUANTIZED_PATHS = {
+    'float16': os.path.join(BASE_DIR, 'cnn8grps_rad1_model_float16.tflite'),
+    'int8': os.path.join(BASE_DIR, 'cnn8grps_rad1_model_int8.tflite'),
+}
+
+# Which of the 8 CNN groups each letter's AtoZ_3.1 images belong to
+LETTER_GROUPS = {
+    'A': 0, 'E': 0, 'M': 0, 'N': 0, 'S': 0, 'T': 0,
+    'B': 1, 'D': 1, 'F': 1, 'I': 1, 'K': 1, 'R': 1, 'U': 1, 'V': 1, 'W': 1,
+    'C': 2, 'O': 2,
+    'G': 3, 'H': 3,
+    'L': 4,
+    'P': 5, 'Q': 5, 'Z': 5,
+    'X': 6,
+    'Y': 7, 'J': 7,
+}
+
+
+class InferenceBackend:
+    """Common interface; subclasses implement ``_run`` on a float32 (N, 400, 400, 3) batch."""
+
+    name = None
+
+    def __init__(self, model_path):
+        self.model_path = model_path
+
+    def _run(self, x):
+        raise NotImplementedError
+
+    def warmup(self, runs=2):
+        """Run blank frames so the first real frame does not pay for setup."""
+        blank = np.full((1,) + INPUT_SHAPE, 255, dtype=np.float32)
+        for _ in range(runs):
+            self._run(blank)
+
+    def predict_batch(self, images):
+        """Group probabilities, shape (N, 8), for a stack of 400x400x3 skeleton images."""
+        x = np.asarray(images, dtype=np.float32).reshape((-1,) + INPUT_SHAPE)
+        return np.asarray(self._run(x), dtype=np.float32)
+
+    def predict(self, image):
+        """Group probabilities, shape (8,), for one 400x400x3 skeleton image."""
+        return self.predict_batch(image)[0]
+
+
+class KerasBackend(InferenceBackend):
+    """Keras model wrapped in a traced tf.function and warmed up at construction."""
+
+    name = 'keras'
+
+    def __init__(self, model_path=MODEL_PATH, num_threads=None, warmup=True):
+        super().__init__(model_path)
+        import tensorflow as tf
+        from keras.models import load_model
+
+        if num_threads:
+            # Only takes effect before TensorFlow runs its first op in this process
+            tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+            tf.config.threading.set_inter_op_parallelism_threads(num_threads)
+
+        self.model = load_model(model_path, compile=False)
+        self.forward = tf.function(
+            lambda x: self.model(x, training=False),
+            input_signature=[tf.TensorSpec((None,) + INPUT_SHAPE, tf.float32, name='input')],
+        )
+        if warmup:
+            self.warmup()
+
+    def _run(self, x):
+        return self.forward(x).numpy()
+
+
+class TFLiteBackend(InferenceBackend):
+    """TFLite interpreter; XNNPACK is the default CPU delegate for float models.
+
+    Uses tflite_runtime when installed, otherwise the interpreter bundled
+    with TensorFlow.
+    """
+
+    name = 'tflite'
+
+    def __init__(self, model_path=MODEL_PATHS['tflite'], num_threads=None, warmup=True):
+        super().__init__(model_path)
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+        self.interpreter = Interpreter(model_path=model_path, num_threads=num_threads or os.cpu_count())
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch = int(self._input['shape'][0])
+        if warmup:
+            self.warmup()
+
+    def _run(self, x):
+        if x.shape[0] != self._batch:
+            self.interpreter.resize_tensor_input(self._input['index'], x.shape)
+            self.interpreter.allocate_tensors()
+            self._batch = x.shape[0]
+        self.interpreter.set_tensor(self._input['index'], x)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self._output['index'])
+
+
+class OnnxBackend(InferenceBackend):
+    """ONNX Runtime session on the CPU execution provider."""
+
+    name = 'onnx'
+
+    def __init__(self, model_path=MODEL_PATHS['onnx'], num_threads=None, warmup=True):
+        super().__init__(model_path)
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=['CPUExecutionProvider'])
+        self._input_name = self.session.get_inputs()[0].name
+        if warmup:
+            self.warmup()
+
+    def _run(self, x):
+        return self.session.run(None, {self._input_name: x})[0]
+
+
+BACKENDS = {
+    'keras': KerasBackend,
+    'tflite': TFLiteBackend,
+    'onnx': OnnxBackend,
+}
+
+
+def load_backend(name=None, model_path=None, variant=None, **kwargs):
+    """Construct the backend ``name`` (default: SIGNTALK_BACKEND, else keras).
+
+    ``model_path`` defaults to the model file for that backend and ``variant``
+    (default: SIGNTALK_VARIANT, else float) next to this module.
+    """
+    name, default_path = resolve_model(name, variant)
+    return BACKENDS[name](model_path or default_path, **kwargs)
+
+
+def resolve_model(name=None, variant=None):
+    """``(backend name, model path)`` that load_backend would use, without loading anything."""
+    name = (name or BACKEND).lower()
+    variant = (variant or VARIANT).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend {name!r}; choose from {', '.join(BACKENDS)}")
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown model variant {variant!r}; choose from {', '.join(VARIANTS)}")
+    if variant == 'float':
+        return name, MODEL_PATHS[name]
+    if name == 'tflite':
+        return name, QUANTIZED_PATHS[variant]
+    raise ValueError(f"The {variant} model variant runs on the tflite backend, not {name}")
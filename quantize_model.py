@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Post-training quantization of cnn8grps_rad1_model.h5 to float16 and int8 TFLite.
+
+The int8 model is calibrated on skeleton images drawn at random from
+AtoZ_3.1. Group accuracy is then measured on a disjoint held-out split:
+the first ``--samples`` images per letter, as test_skeleton_images.py does.
+A variant is only written if it loses no more than ``--max-accuracy-drop``
+points against the Keras model.
+
+Inputs and outputs stay float32, so the quantized files load through
+TFLiteBackend unchanged. Select one at runtime with
+SIGNTALK_BACKEND=tflite SIGNTALK_VARIANT=int8.
+"""
+
+import glob
+import os
+import sys
+import tempfile
+import time
+from string import ascii_uppercase
+
+import cv2
+import numpy as np
+
+from predictor import LETTER_GROUPS, MODEL_PATH, QUANTIZED_PATHS, KerasBackend, TFLiteBackend
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_DIR = os.path.join(BASE_DIR, 'AtoZ_3.1')
+
+
+def read_image(path):
+    img = cv2.imread(path)
+    if img is None:
+        return None
+    if img.shape[:2] != (400, 400):
+        img = cv2.resize(img, (400, 400))
+    return img
+
+
+def split_dataset(samples_per_letter, calibration_size, seed=0):
+    """Held-out ``(path, letter)`` pairs for evaluation, and calibration paths from the rest."""
+    evaluation = []
+    remaining = []
+    for letter in ascii_uppercase:
+        paths = sorted(glob.glob(os.path.join(DATASET_DIR, letter, '*.jpg')))
+        evaluation.extend((p, letter) for p in paths[:samples_per_letter])
+        remaining.extend(paths[samples_per_letter:])
+    rng = np.random.default_rng(seed)
+    pick = rng.permutation(len(remaining))[:calibration_size]
+    return evaluation, [remaining[i] for i in pick]
+
+
+def representative_dataset(paths):
+    def generate():
+        for path in paths:
+            img = read_image(path)
+            if img is not None:
+                yield [img.reshape(1, 400, 400, 3).astype(np.float32)]
+    return generate
+
+
+def quantize(backend, variant, calibration_paths):
+    """Convert the traced Keras model to a quantized TFLite flatbuffer."""
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions(
+        [backend.forward.get_concrete_function()], backend.model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if variant == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    else:
+        converter.representative_dataset = representative_dataset(calibration_paths)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    return converter.convert()
+
+
+def evaluate(engine, evaluation, images):
+    """Group accuracy in percent, and single-image p50 latency in ms."""
+    correct = 0
+    times = []
+    for (path, letter), img in zip(evaluation, images):
+        start = time.perf_counter()
+        prob = engine.predict(img)
+        times.append(time.perf_counter() - start)
+        if int(np.argmax(prob)) == LETTER_GROUPS[letter]:
+            correct += 1
+    accuracy = correct / len(images) * 100 if images else 0.0
+    return accuracy, float(np.percentile(times, 50) * 1000) if times else 0.0
+
+
+def main(variants, samples_per_letter=5, calibration_size=200, max_accuracy_drop=1.0,
+         model_path=MODEL_PATH, seed=0):
+    evaluation, calibration = split_dataset(samples_per_letter, calibration_size, seed)
+    loaded = [(item, read_image(item[0])) for item in evaluation]
+    evaluation = [item for item, img in loaded if img is not None]
+    images = [img for _, img in loaded if img is not None]
+    if not images:
+        print(f"No evaluation images found under {DATASET_DIR}")
+        return False
+    print(f"Evaluation images: {len(images)}, calibration images: {len(calibration)}")
+
+    reference = KerasBackend(model_path)
+    ref_accuracy, ref_latency = evaluate(reference, evaluation, images)
+    ref_size = os.path.getsize(model_path)
+    print(f"{'keras':<8} accuracy {ref_accuracy:6.2f}%  p50 {ref_latency:7.2f} ms  size {ref_size / 1e6:6.2f} MB")
+
+    passed = True
+    for variant in variants:
+        flatbuffer = quantize(reference, variant, calibration)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tflite', dir=os.path.dirname(QUANTIZED_PATHS[variant]))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(flatbuffer)
+        try:
+            accuracy, latency = evaluate(TFLiteBackend(tmp_path), evaluation, images)
+            drop = ref_accuracy - accuracy
+            print(f"{variant:<8} accuracy {accuracy:6.2f}%  p50 {latency:7.2f} ms  size {len(flatbuffer) / 1e6:6.2f} MB"
+                  f"  (drop {drop:+.2f} pts, {ref_latency / latency if latency else 0:.2f}x faster,"
+                  f" {ref_size / len(flatbuffer):.1f}x smaller)")
+            if drop > max_accuracy_drop:
+                passed = False
+                print(f"  REFUSED: accuracy drop {drop:.2f} pts exceeds --max-accuracy-drop {max_accuracy_drop}")
+                continue
+            os.replace(tmp_path, QUANTIZED_PATHS[variant])
+            print(f"  Written to {QUANTIZED_PATHS[variant]}")
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return passed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Quantize the 8-group CNN to float16/int8 TFLite with an accuracy gate')
+    parser.add_argument('--variant', choices=sorted(QUANTIZED_PATHS) + ['all'], default='all',
+                        help='Variant to produce (default: all)')
+    parser.add_argument('--samples', type=int, default=5,
+                        help='Held-out images per letter for the accuracy check (default: 5)')
+    parser.add_argument('--calibration', type=int, default=200,
+                        help='Calibration images for int8 (default: 200)')
+    parser.add_argument('--max-accuracy-drop', type=float, default=1.0,
+                        help='Largest allowed group accuracy loss in percentage points (default: 1.0)')
+    parser.add_argument('--model', default=MODEL_PATH, help='Keras .h5 model to quantize')
+    parser.add_argument('--seed', type=int, default=0, help='Calibration sampling seed (default: 0)')
+
+    args = parser.parse_args()
+    variants = sorted(QUANTIZED_PATHS) if args.variant == 'all' else [args.variant]
+    ok = main(variants, samples_per_letter=args.samples, calibration_size=args.calibration,
+              max_accuracy_drop=args.max_accuracy_drop, model_path=args.model, seed=args.seed)
+    sys.exit(0 if ok else 1)
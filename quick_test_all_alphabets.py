@@ -5,139 +5,126 @@ Run this to get a fast overview of model performance
 """
 
 import os
-import glob
+import json
 import cv2
 import numpy as np
-from keras.models import load_model
+from predictor import BACKEND, BACKENDS, VARIANT, VARIANTS, load_backend
+from batch_eval import DATASET_DIR, evaluate, flatten, list_dataset, print_timings
+import landmark_cache
 from cvzone.HandTrackingModule import HandDetector
 from string import ascii_uppercase
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATASET_DIR = os.path.join(BASE_DIR, 'AtoZ_3.1')
-MODEL_PATH = os.path.join(BASE_DIR, 'cnn8grps_rad1_model.h5')
+# Group 0: A, E, M, N, S, T / 1: B, D, F, I, K, R, U, V, W / 2: C, O / 3: G, H
+# 4: L / 5: P, Q, Z / 6: X / 7: Y, J
+GROUP_LETTERS = np.array(['A', 'B', 'C', 'G', 'L', 'P', 'X', 'Y'])
 
-def quick_test(samples_per_letter=5):
+def quick_test(samples_per_letter=5, backend=None, variant=None, batch_size=32, use_cache=True, save_path=None):
     """Quick test with minimal output"""
     print("🔍 Quick ASL Alphabet Test")
     print("=" * 40)
     
     # Load model
     try:
-        model = load_model(MODEL_PATH, compile=False)
+        model = load_backend(backend, variant=variant)
         print("✅ Model loaded successfully")
     except Exception as e:
         print(f"❌ Error loading model: {e}")
         return
     
-    # Load detector
-    detector = HandDetector(maxHands=1)
-    
     # Check dataset
     if not os.path.isdir(DATASET_DIR):
         print(f"❌ Dataset directory not found: {DATASET_DIR}")
         return
     
+    dataset = list_dataset(samples_per_letter)
+    paths, letter_idx = flatten(dataset)
+    
+    # Landmarks from the on-disk cache, or a detector when it is disabled
+    cache = None
+    detector = None
+    if use_cache:
+        cache, stats = landmark_cache.update(paths)
+        print(f"✅ Landmark cache: {stats['reused']} cached, {stats['extracted']} extracted")
+    else:
+        detector = HandDetector(maxHands=1)
+    
+    def landmarks(img_path):
+        if cache:
+            return cache.landmarks_for(img_path)
+        
+        img = cv2.imread(img_path)
+        if img is None:
+            raise ValueError('Failed to load image')
+        
+        hands = detector.findHands(img, draw=False, flipType=True)
+        if not hands or not hands[0]:
+            raise ValueError('No hand detected')
+        
+        hand = hands[0]
+        hmap = hand[0] if isinstance(hand, (list, tuple)) else hand
+        return hmap['lmList']
+    
+    def prepare(img_path):
+        pts = landmarks(img_path)
+        
+        # Simple prediction (using the same logic as main script)
+        # This is a simplified version - for full testing use test_all_letters.py
+        xs = [p[0] for p in pts]
+        ys = [p[1] for p in pts]
+        w = max(xs) - min(xs) + 1
+        h = max(ys) - min(ys) + 1
+        
+        # Create skeleton image
+        white = np.ones((400, 400, 3), dtype=np.uint8) * 255
+        x_offset = ((400 - w) // 2) - 15
+        y_offset = ((400 - h) // 2) - 15
+        
+        # Draw basic skeleton (simplified)
+        for i in range(21):
+            cv2.circle(white, (pts[i][0] + x_offset, pts[i][1] + y_offset), 2, (0, 0, 255), 1)
+        return white, None
+    
+    result = evaluate(model, paths, prepare, batch_size=batch_size)
+    
+    # Simple group to letter mapping (basic): first letter of each group
+    predicted = GROUP_LETTERS[result.probs.argmax(axis=1)]
+    correct_mask = result.ok & (predicted == np.array(list(ascii_uppercase))[letter_idx])
+    
     # Test each letter
     results = {}
-    total_correct = 0
-    total_tested = 0
-    
-    for letter in ascii_uppercase:
-        folder = os.path.join(DATASET_DIR, letter)
-        if not os.path.isdir(folder):
+    for i, letter in enumerate(ascii_uppercase):
+        if dataset[letter] is None:
             results[letter] = "No data"
             continue
-        
-        images = sorted(glob.glob(os.path.join(folder, '*.jpg')))[:samples_per_letter]
-        if not images:
+        if not dataset[letter]:
             results[letter] = "No images"
             continue
         
-        correct = 0
-        tested = 0
-        
-        for img_path in images:
-            try:
-                img = cv2.imread(img_path)
-                if img is None:
-                    continue
-                
-                hands = detector.findHands(img, draw=False, flipType=True)
-                if not hands or not hands[0]:
-                    continue
-                
-                hand = hands[0]
-                hmap = hand[0] if isinstance(hand, (list, tuple)) else hand
-                pts = hmap['lmList']
-                
-                # Simple prediction (using the same logic as main script)
-                # This is a simplified version - for full testing use test_all_letters.py
-                xs = [p[0] for p in pts]
-                ys = [p[1] for p in pts]
-                w = max(xs) - min(xs) + 1
-                h = max(ys) - min(ys) + 1
-                
-                # Create skeleton image
-                white = np.ones((400, 400, 3), dtype=np.uint8) * 255
-                x_offset = ((400 - w) // 2) - 15
-                y_offset = ((400 - h) // 2) - 15
-                
-                # Draw basic skeleton (simplified)
-                for i in range(21):
-                    cv2.circle(white, (pts[i][0] + x_offset, pts[i][1] + y_offset), 2, (0, 0, 255), 1)
-                
-                # Predict
-                inp = white.reshape(1, 400, 400, 3)
-                prob = np.array(model.predict(inp, verbose=0)[0], dtype='float32')
-                predicted_group = int(np.argmax(prob, axis=0))
-                
-                # Simple group to letter mapping (basic)
-                if predicted_group == 0:  # Group 0: A, E, M, N, S, T
-                    predicted = 'A'  # Simplified - just use first letter
-                elif predicted_group == 1:  # Group 1: B, D, F, I, K, R, U, V, W
-                    predicted = 'B'
-                elif predicted_group == 2:  # Group 2: C, O
-                    predicted = 'C'
-                elif predicted_group == 3:  # Group 3: G, H
-                    predicted = 'G'
-                elif predicted_group == 4:  # Group 4: L
-                    predicted = 'L'
-                elif predicted_group == 5:  # Group 5: P, Q, Z
-                    predicted = 'P'
-                elif predicted_group == 6:  # Group 6: X
-                    predicted = 'X'
-                elif predicted_group == 7:  # Group 7: Y, J
-                    predicted = 'Y'
-                else:
-                    predicted = '?'
-                
-                if predicted == letter:
-                    correct += 1
-                tested += 1
-                
-            except Exception as e:
-                continue
-        
+        in_letter = letter_idx == i
+        tested = int((in_letter & result.ok).sum())
+        correct = int((in_letter & correct_mask).sum())
         if tested > 0:
             accuracy = (correct / tested) * 100
             results[letter] = f"{correct}/{tested} ({accuracy:.0f}%)"
-            total_correct += correct
-            total_tested += tested
         else:
             results[letter] = "Failed"
     
+    total_tested = int(result.ok.sum())
+    total_correct = int(correct_mask.sum())
+    
     # Print results
     print("\n📊 Results Summary:")
     print("-" * 40)
     
     for letter in ascii_uppercase:
-        result = results.get(letter, "Unknown")
-        status = "✅" if isinstance(result, str) and "/" in result and "100" in result else "⚠️"
-        print(f"{status} {letter}: {result}")
+        outcome = results.get(letter, "Unknown")
+        status = "✅" if isinstance(outcome, str) and "/" in outcome and "100" in outcome else "⚠️"
+        print(f"{status} {letter}: {outcome}")
     
     if total_tested > 0:
         overall_accuracy = (total_correct / total_tested) * 100
         print(f"\n🎯 Overall: {total_correct}/{total_tested} ({overall_accuracy:.1f}%)")
+        print_timings(result.timings)
         
         if overall_accuracy >= 90:
             print("🎉 Excellent performance!")
@@ -149,6 +136,25 @@ def quick_test(samples_per_letter=5):
             print("❌ Poor performance - significant issues detected")
     else:
         print("\n❌ No tests completed successfully")
+    
+    if save_path:
+        report = {
+            'test_parameters': {
+                'samples_per_letter': samples_per_letter,
+                'batch_size': batch_size,
+                'backend': model.name,
+                'model_path': model.model_path,
+                'landmark_cache': use_cache
+            },
+            'total_tested': total_tested,
+            'total_correct': total_correct,
+            'overall_accuracy': (total_correct / total_tested) * 100 if total_tested > 0 else 0.0,
+            'timings': result.timings,
+            'letter_results': results
+        }
+        with open(save_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to: {save_path}")
 
 if __name__ == "__main__":
     import argparse
@@ -156,8 +162,18 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Quick test of all ASL alphabets')
     parser.add_argument('--samples', type=int, default=5, 
                        help='Number of samples to test per letter (default: 5)')
+    parser.add_argument('--backend', default=BACKEND, choices=sorted(BACKENDS),
+                       help=f'Inference backend (default: {BACKEND}, from SIGNTALK_BACKEND)')
+    parser.add_argument('--variant', default=VARIANT, choices=VARIANTS,
+                       help=f'Model variant; float16/int8 need --backend tflite (default: {VARIANT})')
+    parser.add_argument('--batch-size', type=int, default=32,
+                       help='Images per inference call (default: 32)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Run hand detection on every image instead of reading the landmark cache')
+    parser.add_argument('--save', help='Write the per-letter results and stage timings to this JSON file')
     
     args = parser.parse_args()
     
     print(f"Testing {args.samples} samples per letter...")
-    quick_test(samples_per_letter=args.samples)
+    quick_test(samples_per_letter=args.samples, backend=args.backend, variant=args.variant,
+               batch_size=args.batch_size, use_cache=not args.no_cache, save_path=args.save)
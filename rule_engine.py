@@ -0,0 +1,321 @@
+"""
+Landmark rules that turn the CNN's top-2 groups into a letter.
+
+The CNN only separates the 8 groups
+[0->aemnst][1->bfdiuvwkr][2->co][3->gh][4->l][5->pqz][6->x][7->yj].
+Three rule tables, in the order Application.predict has always applied
+them, do the rest:
+
+- GROUP_RULES move ch1 to another group when the (ch1, ch2) pair is one
+  the CNN is known to confuse and the landmarks say so. They run in
+  order, and a rule sees the pair as left by the rules before it.
+- LETTER_RULES pick the letter inside the final group: the default, then
+  every matching rule in order, the last match winning.
+- SYMBOL_RULES turn some letters into the " ", "next" and "Backspace"
+  gestures.
+
+GROUP_RULES are compiled once into a dict from (ch1, ch2) to the sorted
+indices of the rules listing that pair, so a frame only tests the few
+rules its pair can trigger instead of scanning every list. Every
+predicate reads the frame's HandFeatures, which are computed once.
+
+classify_letter applies only SYMBOL_RULES, for the landmark engine that
+predicts all 26 letters itself (see landmark_classifier.py).
+
+classify_batch applies the same tables to N hands at once with masked
+NumPy operations, for offline scoring and threshold tuning.
+
+The pixel thresholds live in THRESHOLDS. Set SIGNTALK_THRESHOLDS to a
+JSON file written by tune_thresholds.py to run with tuned values.
+"""
+
+import json
+import os
+from bisect import bisect_left
+from collections import namedtuple
+
+import numpy as np
+
+from hand_features import PIPS, TIPS, BatchHandFeatures, HandFeatures, all_of, any_of
+
+# JSON file with tuned thresholds (see tune_thresholds.py); unset keeps THRESHOLDS
+THRESHOLDS_PATH = os.environ.get('SIGNTALK_THRESHOLDS')
+
+# Pixel thresholds of the rules, by name; every predicate gets them as ``t``
+THRESHOLDS = {
+    'c0_x_index_ring': 52,      # [c0][x]: index-ring tip distance below
+    'x_c0_index_ring': 50,      # [c0][x] spread: index-ring tip distance above
+    'gh_pqz_thumb_drop': 15,    # [gh][pqz]: thumb base above the ring tip by more than
+    'pq_thumb_drop': 17,        # [gh][pq]: thumb tip no more than this above every finger tip
+    'l_x_thumb_gap': 55,        # [l][x]: thumb tip to middle DIP above
+    'l_d_thumb_gap': 50,        # [l][d]: above
+    'x_l_thumb_gap': 60,        # [l][x] closed: below
+    'd_l_thumb_gap': 50,        # [d][l]: below
+    'w_thumb_gap': 50,          # [w]: below
+    'w_wrist_margin': 13,       # [w]: wrist this far left of all finger tips excludes w
+    'x_d_thumb_offset': 15,     # [x][d]: index MCP right of the thumb tip by more than
+    'd_x_thumb_offset': 15,     # [d][x]: by less than
+    'yj_thumb_offset': 15,      # [yj][bfdi]: thumb tip left of the index MCP + this
+    'uv_spread': 8,             # U below / V from: index-middle tip spread minus PIP spread
+    'co_thumb_middle': 42,      # C above / O: thumb-middle tip distance
+    'gh_index_middle': 72,      # G above / H: index-middle tip distance
+    'yj_thumb_index': 42,       # Y above / J: thumb-index tip distance
+}
+
+Rule = namedtuple('Rule', ['name', 'keys', 'test', 'target'])
+
+
+def load_thresholds(path):
+    """Thresholds from a tune_thresholds.py report, or a plain {name: value} JSON file."""
+    with open(path) as f:
+        data = json.load(f)
+    thresholds = data.get('thresholds', data)
+    unknown = set(thresholds) - set(THRESHOLDS)
+    if unknown:
+        raise ValueError(f"Unknown rule thresholds in {path}: {sorted(unknown)}")
+    return thresholds
+
+
+def _rule(name, pairs, test, target):
+    return Rule(name, frozenset(tuple(p) for p in pairs), test, target)
+
+
+GROUP_RULES = (
+    _rule('[aemnst]',
+          [[5, 2], [5, 3], [3, 5], [3, 6], [3, 0], [3, 2], [6, 4], [6, 1], [6, 2], [6, 6], [6, 7], [6, 0], [6, 5],
+           [4, 1], [1, 0], [1, 1], [6, 3], [1, 6], [5, 6], [5, 1], [4, 5], [1, 4], [1, 5], [2, 0], [2, 6], [4, 6],
+           [5, 7], [7, 6], [2, 5], [7, 1], [5, 4], [7, 0], [7, 5], [7, 2]],
+          lambda f, t: f.fingers('DDDD'), 0),
+    _rule('[o][s]', [[2, 2], [2, 1]],
+          lambda f, t: f.x[5] < f.x[4], 0),
+    _rule('[c0][aemnst]', [[0, 0], [0, 6], [0, 2], [0, 5], [0, 1], [0, 7], [5, 2], [7, 6], [7, 1]],
+          lambda f, t: all_of(*(f.x[0] > f.x[i] for i in (8, 4, 12, 16, 20))) & (f.x[5] > f.x[4]), 2),
+    _rule('[c0][x]', [[6, 0], [6, 6], [6, 2]],
+          lambda f, t: f.distance(8, 16) < t['c0_x_index_ring'], 2),
+    _rule('[gh][bdfikruvw]', [[1, 4], [1, 5], [1, 6], [1, 3], [1, 0]],
+          lambda f, t: f.fingers('U.DD') & all_of(*(f.x[0] < f.x[i] for i in TIPS)), 3),
+    _rule('[gh][l]', [[4, 6], [4, 1], [4, 5], [4, 3], [4, 7]],
+          lambda f, t: f.x[4] > f.x[0], 3),
+    _rule('[gh][pqz]', [[5, 3], [5, 0], [5, 7], [5, 4], [5, 2], [5, 1], [5, 5]],
+          lambda f, t: f.y[2] + t['gh_pqz_thumb_drop'] < f.y[16], 3),
+    _rule('[l][x]', [[6, 4], [6, 1], [6, 2]],
+          lambda f, t: f.distance(4, 11) > t['l_x_thumb_gap'], 4),
+    _rule('[l][d]', [[1, 4], [1, 6], [1, 1]],
+          lambda f, t: (f.distance(4, 11) > t['l_d_thumb_gap']) & f.fingers('UDDD'), 4),
+    _rule('[l][gh]', [[3, 6], [3, 4]],
+          lambda f, t: f.x[4] < f.x[0], 4),
+    _rule('[l][c0]', [[2, 2], [2, 5], [2, 4]],
+          lambda f, t: f.x[1] < f.x[12], 4),
+    _rule('[gh][z]', [[3, 6], [3, 5], [3, 4]],
+          lambda f, t: f.fingers('UDDD') & (f.y[4] > f.y[10]), 5),
+    _rule('[gh][pq]', [[3, 2], [3, 1], [3, 6]],
+          lambda f, t: all_of(*(f.y[4] + t['pq_thumb_drop'] > f.y[i] for i in TIPS)), 5),
+    _rule('[l][pqz]', [[4, 4], [4, 5], [4, 2], [7, 5], [7, 6], [7, 0]],
+          lambda f, t: f.x[4] > f.x[0], 5),
+    _rule('[pqz][aemnst]', [[0, 2], [0, 6], [0, 1], [0, 5], [0, 0], [0, 7], [0, 4], [0, 3], [2, 7]],
+          lambda f, t: all_of(*(f.x[0] < f.x[i] for i in TIPS)), 5),
+    _rule('[pqz][yj]', [[5, 7], [5, 2], [5, 6]],
+          lambda f, t: f.x[3] < f.x[0], 7),
+    _rule('[l][yj]', [[4, 6], [4, 2], [4, 4], [4, 1], [4, 5], [4, 7]],
+          lambda f, t: f.y[6] < f.y[8], 7),
+    _rule('[x][yj]', [[6, 7], [0, 7], [0, 1], [0, 0], [6, 4], [6, 6], [6, 5], [6, 1]],
+          lambda f, t: f.y[18] > f.y[20], 7),
+    _rule('[x][aemnst]', [[0, 4], [0, 2], [0, 3], [0, 1], [0, 6]],
+          lambda f, t: f.x[5] > f.x[16], 6),
+    _rule('[yj][x]', [[7, 2]],
+          lambda f, t: (f.y[18] < f.y[20]) & (f.y[8] < f.y[10]), 6),
+    _rule('[c0][x] spread', [[2, 1], [2, 2], [2, 6], [2, 7], [2, 0]],
+          lambda f, t: f.distance(8, 16) > t['x_c0_index_ring'], 6),
+    _rule('[l][x] closed', [[4, 6], [4, 2], [4, 1], [4, 4]],
+          lambda f, t: f.distance(4, 11) < t['x_l_thumb_gap'], 6),
+    _rule('[x][d]', [[1, 4], [1, 6], [1, 0], [1, 2]],
+          lambda f, t: f.x[5] - f.x[4] - t['x_d_thumb_offset'] > 0, 6),
+    _rule('[b][pqz]',
+          [[5, 0], [5, 1], [5, 4], [5, 5], [5, 6], [6, 1], [7, 6], [0, 2], [7, 1], [7, 4], [6, 6], [7, 2],
+           [6, 3], [6, 4], [7, 5]],
+          lambda f, t: f.fingers('UUUU'), 1),
+    _rule('[f][pqz]',
+          [[6, 1], [6, 0], [0, 3], [6, 4], [2, 2], [0, 6], [6, 2], [7, 6], [4, 6], [4, 1], [4, 2], [0, 2], [7, 1],
+           [7, 4], [6, 6], [7, 2], [7, 5]],
+          lambda f, t: f.fingers('DUUU'), 1),
+    _rule('[f][x][l]', [[6, 1], [6, 0], [4, 2], [4, 1], [4, 6], [4, 4]],
+          lambda f, t: f.fingers('.UUU'), 1),
+    _rule('[d][pqz]', [[5, 0], [3, 4], [3, 0], [3, 1], [3, 5], [5, 5], [5, 4], [5, 1], [7, 6]],
+          lambda f, t: f.fingers('UDDD') & (f.x[2] < f.x[0]) & (f.y[4] > f.y[14]), 1),
+    _rule('[d][l]', [[4, 1], [4, 2], [4, 4]],
+          lambda f, t: (f.distance(4, 11) < t['d_l_thumb_gap']) & f.fingers('UDDD'), 1),
+    _rule('[d][gh]', [[3, 4], [3, 0], [3, 1], [3, 5], [3, 6]],
+          lambda f, t: f.fingers('UDDD') & (f.x[2] < f.x[0]) & (f.y[14] < f.y[4]), 1),
+    _rule('[d][x]', [[6, 6], [6, 4], [6, 1], [6, 2]],
+          lambda f, t: f.x[5] - f.x[4] - t['d_x_thumb_offset'] < 0, 1),
+    _rule('[i][pqz]', [[5, 4], [5, 5], [5, 1], [0, 3], [0, 7], [5, 0], [0, 2], [6, 2], [7, 5], [7, 1], [7, 6], [7, 7]],
+          lambda f, t: f.fingers('DDDU'), 1),
+    _rule('[yj][bfdi]', [[1, 5], [1, 7], [1, 1], [1, 6], [1, 3], [1, 0]],
+          lambda f, t: (f.x[4] < f.x[5] + t['yj_thumb_offset']) & f.fingers('DDDU'), 7),
+    _rule('[uvr]', [[5, 5], [5, 0], [5, 4], [5, 1], [4, 6], [4, 1], [7, 6], [3, 0], [3, 5]],
+          lambda f, t: f.fingers('UUDD') & (f.y[4] > f.y[14]), 1),
+    # Wrist neither well left of all four finger tips nor right of all of them
+    _rule('[w]', [[3, 5], [3, 0], [3, 6], [5, 1], [4, 1], [2, 0], [5, 0], [5, 5]],
+          lambda f, t: (any_of(*(f.x[0] + t['w_wrist_margin'] >= f.x[i] for i in TIPS))
+                     & any_of(*(f.x[0] <= f.x[i] for i in TIPS))
+                     & (f.distance(4, 11) < t['w_thumb_gap'])), 1),
+    _rule('[w] three up', [[5, 0], [5, 5], [0, 1]],
+          lambda f, t: f.fingers('UUU.'), 1),
+)
+
+# group -> (default, [(test, letter), ...]); every matching test overrides the
+# letter chosen so far. Group 1 has no default and stays 1 if nothing matches.
+LETTER_RULES = {
+    0: ('S', [
+        (lambda f, t: all_of(*(f.x[4] < f.x[i] for i in (6, 10, 14, 18))), 'A'),
+        (lambda f, t: ((f.x[4] > f.x[6]) & all_of(*(f.x[4] < f.x[i] for i in (10, 14, 18)))
+                    & (f.y[4] < f.y[14]) & (f.y[4] < f.y[18])), 'T'),
+        (lambda f, t: all_of(*(f.y[4] > f.y[i] for i in TIPS)), 'E'),
+        (lambda f, t: all_of(*(f.x[4] > f.x[i] for i in (6, 10, 14))) & (f.y[4] < f.y[18]), 'M'),
+        (lambda f, t: (f.x[4] > f.x[6]) & (f.x[4] > f.x[10]) & (f.y[4] < f.y[18]) & (f.y[4] < f.y[14]), 'N'),
+    ]),
+    1: (None, [
+        (lambda f, t: f.fingers('UUUU'), 'B'),
+        (lambda f, t: f.fingers('UDDD'), 'D'),
+        (lambda f, t: f.fingers('DUUU'), 'F'),
+        (lambda f, t: f.fingers('DDDU'), 'I'),
+        (lambda f, t: f.fingers('UUUD'), 'W'),
+        (lambda f, t: f.fingers('UUDD') & (f.y[4] < f.y[9]), 'K'),
+        (lambda f, t: (f.distance(8, 12) - f.distance(6, 10) < t['uv_spread']) & f.fingers('UUDD'), 'U'),
+        (lambda f, t: (f.distance(8, 12) - f.distance(6, 10) >= t['uv_spread']) & f.fingers('UUDD') & (f.y[4] > f.y[9]), 'V'),
+        (lambda f, t: (f.x[8] > f.x[12]) & f.fingers('UUDD'), 'R'),
+    ]),
+    2: ('O', [(lambda f, t: f.distance(12, 4) > t['co_thumb_middle'], 'C')]),
+    3: ('H', [(lambda f, t: f.distance(8, 12) > t['gh_index_middle'], 'G')]),
+    4: ('L', []),
+    5: ('P', [
+        (lambda f, t: all_of(*(f.x[4] > f.x[i] for i in (12, 16, 20))) & (f.y[8] < f.y[5]), 'Z'),
+        (lambda f, t: all_of(*(f.x[4] > f.x[i] for i in (12, 16, 20))) & (f.y[8] >= f.y[5]), 'Q'),
+    ]),
+    6: ('X', []),
+    7: ('J', [(lambda f, t: f.distance(8, 4) > t['yj_thumb_index'], 'Y')]),
+}
+
+# Applied in order to the letter; keys are the letters (or group) a rule applies to.
+# 'Next' never occurs, the Backspace rule has always listed it with that spelling.
+SYMBOL_RULES = (
+    Rule('space', frozenset([1, 'E', 'S', 'X', 'Y', 'B']),
+         lambda f, t: f.fingers('UDDU'), ' '),
+    Rule('next', frozenset(['E', 'Y', 'B']),
+         lambda f, t: (f.x[4] < f.x[5]) & f.fingers('UUUU'), 'next'),
+    Rule('backspace', frozenset(['Next', 'B', 'C', 'H', 'F', 'X']),
+         lambda f, t: (all_of(*(f.x[0] > f.x[i] for i in TIPS))
+                    & all_of(*(f.y[4] < f.y[i] for i in TIPS))
+                    & all_of(*(f.y[4] < f.y[i] for i in PIPS))), 'Backspace'),
+)
+
+
+class RuleEngine:
+    """Applies the rule tables to one frame's top-2 groups and landmarks."""
+
+    def __init__(self, thresholds=None, group_rules=GROUP_RULES, letter_rules=LETTER_RULES, symbol_rules=SYMBOL_RULES):
+        self.thresholds = dict(THRESHOLDS, **(thresholds or {}))
+        self.group_rules = tuple(group_rules)
+        self.letter_rules = letter_rules
+        self.symbol_rules = tuple(symbol_rules)
+        self.by_pair = {}
+        for i, rule in enumerate(self.group_rules):
+            for pair in rule.keys:
+                self.by_pair.setdefault(pair, []).append(i)
+        # Per rule, an 8x8 table of the (ch1, ch2) pairs it applies to, for batches
+        self.pair_tables = np.zeros((len(self.group_rules), 8, 8), dtype=bool)
+        for i, rule in enumerate(self.group_rules):
+            for ch1, ch2 in rule.keys:
+                self.pair_tables[i, ch1, ch2] = True
+
+    def refine_group(self, ch1, ch2, features):
+        """Final group for ch1 after the pair-specific GROUP_RULES."""
+        candidates = self.by_pair.get((ch1, ch2))
+        start = 0
+        while candidates:
+            k = bisect_left(candidates, start)
+            if k == len(candidates):
+                break
+            rule = self.group_rules[candidates[k]]
+            start = candidates[k] + 1
+            if rule.target != ch1 and rule.test(features, self.thresholds):
+                ch1 = rule.target
+                candidates = self.by_pair.get((ch1, ch2))
+        return ch1
+
+    def letter(self, group, features):
+        letter, rules = self.letter_rules[group]
+        for test, candidate in rules:
+            if test(features, self.thresholds):
+                letter = candidate
+        return group if letter is None else letter
+
+    def symbol(self, letter, features):
+        for rule in self.symbol_rules:
+            if letter in rule.keys and rule.test(features, self.thresholds):
+                letter = rule.target
+        return letter
+
+    def classify(self, ch1, ch2, pts):
+        """Letter, gesture (' ', 'next', 'Backspace') or unresolved group 1 for a frame."""
+        features = HandFeatures(pts)
+        group = self.refine_group(int(ch1), int(ch2), features)
+        return self.symbol(self.letter(group, features), features)
+
+    def classify_letter(self, letter, pts):
+        """Only the SYMBOL_RULES, for engines that predict the letter directly."""
+        return self.symbol(letter, HandFeatures(pts))
+
+    def classify_batch(self, landmarks, groups, chunk_size=65536):
+        """classify() for N hands: (N, 21, 2+) landmarks and (N, 2) top-2 groups.
+
+        Returns an (N,) str array. Group 1 hands that match no sub-rule,
+        which classify() returns as the int 1, come back as '1'.
+        """
+        landmarks = np.asarray(landmarks)
+        groups = np.asarray(groups, dtype=np.int64)
+        letters = np.empty(len(groups), dtype='<U9')
+        for start in range(0, len(groups), chunk_size):
+            end = start + chunk_size
+            letters[start:end] = self.classify_features(BatchHandFeatures(landmarks[start:end]), groups[start:end])
+        return letters
+
+    def classify_features(self, features, groups):
+        """classify_batch() on prebuilt BatchHandFeatures, e.g. to rescore them with new thresholds."""
+        ch1 = groups[:, 0].copy()
+        ch2 = groups[:, 1]
+        # Rules run in order on every row whose current pair they list, as refine_group does
+        for table, rule in zip(self.pair_tables, self.group_rules):
+            hit = table[ch1, ch2]
+            if hit.any():
+                ch1[hit & rule.test(features, self.thresholds)] = rule.target
+
+        letters = np.empty(len(ch1), dtype='<U9')
+        for group, (default, rules) in self.letter_rules.items():
+            rows = ch1 == group
+            if not rows.any():
+                continue
+            letters[rows] = str(group) if default is None else default
+            for test, letter in rules:
+                letters[rows & test(features, self.thresholds)] = letter
+
+        for rule in self.symbol_rules:
+            hit = np.isin(letters, [str(key) for key in rule.keys])
+            if hit.any():
+                letters[hit & rule.test(features, self.thresholds)] = rule.target
+        return letters
+
+
+ENGINE = RuleEngine(load_thresholds(THRESHOLDS_PATH) if THRESHOLDS_PATH else None)
+
+
+def classify(ch1, ch2, pts):
+    return ENGINE.classify(ch1, ch2, pts)
+
+
+def classify_letter(letter, pts):
+    return ENGINE.classify_letter(letter, pts)
+
+
+def classify_batch(landmarks, groups, chunk_size=65536):
+    return ENGINE.classify_batch(landmarks, groups, chunk_size)
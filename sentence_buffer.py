@@ -0,0 +1,66 @@
+"""
+The dictated sentence as committed words plus the word being spelled.
+
+Application used to keep the sentence as one string and re-find the
+current word with rfind/find on every frame and on every suggestion
+click. SentenceBuffer keeps the committed words in a list and the
+current word in a character list. Appending a letter, backspace,
+space and replacing the current word are all O(1) apart from the word
+itself.
+
+Every change bumps ``version``. The GUI and the suggestions compare it
+with the version they last drew and skip work when it has not moved.
+text() joins the sentence once per version.
+"""
+
+
+class SentenceBuffer:
+    """Committed words, the current word, and a version counter bumped on every change."""
+
+    def __init__(self):
+        self.words = []
+        self.current = []
+        self.version = 0
+        self._text = ''
+        self._text_version = 0
+
+    @property
+    def current_word(self):
+        return ''.join(self.current)
+
+    def append(self, letter):
+        self.current.append(letter)
+        self.version += 1
+
+    def space(self):
+        """End the current word; returns it (empty for repeated spaces)."""
+        word = ''.join(self.current)
+        self.words.append(word)
+        self.current = []
+        self.version += 1
+        return word
+
+    def backspace(self):
+        """Delete the last character; deleting a space reopens the word before it."""
+        if self.current:
+            self.current.pop()
+        elif self.words:
+            self.current = list(self.words.pop())
+        else:
+            return
+        self.version += 1
+
+    def replace_current_word(self, word):
+        self.current = list(word)
+        self.version += 1
+
+    def clear(self):
+        self.words = []
+        self.current = []
+        self.version += 1
+
+    def text(self):
+        if self._text_version != self.version:
+            self._text = ' '.join(self.words + [self.current_word])
+            self._text_version = self.version
+        return self._text
@@ -3,12 +3,8 @@
 Simple test to verify the model works with basic input
 """
 
-import os
 import numpy as np
-from keras.models import load_model
-
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-MODEL_PATH = os.path.join(BASE_DIR, 'cnn8grps_rad1_model.h5')
+from predictor import load_backend
 
 def test_model_basic():
     """Test the model with basic input"""
@@ -17,7 +13,7 @@ def test_model_basic():
     
     # Load model
     try:
-        model = load_model(MODEL_PATH, compile=False)
+        model = load_backend()
         print("✅ Model loaded successfully")
     except Exception as e:
         print(f"❌ Error loading model: {e}")
@@ -35,7 +31,7 @@ def test_model_basic():
     
     # Make prediction
     try:
-        prob = model.predict(test_input, verbose=0)
+        prob = model.predict_batch(test_input)
         print(f"✅ Model prediction successful, output shape: {prob.shape}")
         
         # Get probabilities
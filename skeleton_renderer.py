@@ -0,0 +1,105 @@
+"""
+Hand skeleton renderer producing the 400x400 images the 8-group CNN is fed.
+
+Output is pixel-identical to the original per-edge cv2.line / cv2.circle
+drawing used to collect the AtoZ_3.1 training set: green 3px bones, then a
+red radius-2 ring on each of the 21 landmarks, on a white canvas with the
+hand shifted by ((400 - w) // 2 - 15, (400 - h) // 2 - 15).
+"""
+
+import cv2
+import numpy as np
+
+CANVAS_SIZE = 400
+BONE_COLOR = (0, 255, 0)
+JOINT_COLOR = (0, 0, 255)
+
+# (start, end) landmark indices of every bone, in the original drawing order
+SKELETON_EDGES = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (5, 6), (6, 7), (7, 8),
+    (9, 10), (10, 11), (11, 12),
+    (13, 14), (14, 15), (15, 16),
+    (17, 18), (18, 19), (19, 20),
+    (5, 9), (9, 13), (13, 17), (0, 5), (0, 17),
+)
+
+# The same edges grouped into polylines: the five finger chains (thumb starts
+# at the wrist) and the closed palm outline 0-5-9-13-17-0.
+FINGER_CHAINS = (
+    np.array([0, 1, 2, 3, 4]),
+    np.array([5, 6, 7, 8]),
+    np.array([9, 10, 11, 12]),
+    np.array([13, 14, 15, 16]),
+    np.array([17, 18, 19, 20]),
+)
+PALM_LOOP = np.array([0, 5, 9, 13, 17])
+
+
+def _circle_stamp(radius=2, thickness=1):
+    """Pixel offsets cv2.circle sets for an integer centre; translation invariant."""
+    size = 2 * (radius + thickness) + 1
+    mask = np.zeros((size, size), dtype=np.uint8)
+    c = size // 2
+    cv2.circle(mask, (c, c), radius, 255, thickness)
+    dy, dx = np.nonzero(mask)
+    return dy - c, dx - c
+
+
+class SkeletonRenderer:
+    """Draws landmarks onto a preallocated canvas that is reset in place.
+
+    ``render`` returns the shared canvas, so callers that keep the image
+    past the next ``render`` call must copy it.
+    """
+
+    def __init__(self, size=CANVAS_SIZE):
+        self.size = size
+        self.canvas = np.full((size, size, 3), 255, dtype=np.uint8)
+        self._stamp_dy, self._stamp_dx = _circle_stamp()
+
+    def offsets(self, w, h):
+        return ((self.size - w) // 2) - 15, ((self.size - h) // 2) - 15
+
+    def clear(self):
+        self.canvas.fill(255)
+        return self.canvas
+
+    def render(self, pts, w, h):
+        canvas = self.clear()
+        x_offset, y_offset = self.offsets(w, h)
+        p = np.asarray(pts)[:, :2].astype(np.int32)
+        p += (x_offset, y_offset)
+
+        cv2.polylines(canvas, [p[chain] for chain in FINGER_CHAINS], False, BONE_COLOR, 3)
+        cv2.polylines(canvas, [p[PALM_LOOP]], True, BONE_COLOR, 3)
+
+        ys = (p[:, 1:2] + self._stamp_dy).ravel()
+        xs = (p[:, 0:1] + self._stamp_dx).ravel()
+        inside = (ys >= 0) & (ys < self.size) & (xs >= 0) & (xs < self.size)
+        canvas[ys[inside], xs[inside]] = JOINT_COLOR
+        return canvas
+
+
+def landmark_size(pts):
+    """``(w, h)`` of the landmarks' own extent, for images with no detector bbox."""
+    p = np.asarray(pts)[:, :2]
+    w, h = p.max(axis=0) - p.min(axis=0) + 1
+    return int(w), int(h)
+
+
+_renderer = None
+
+
+def render_skeleton(pts, renderer=None, bbox=None):
+    """Render ``pts`` sized by the detector ``bbox`` (x, y, w, h), as the realtime path does.
+
+    Without a bbox, as for the dataset photos, the size comes from
+    landmark_size(). Uses a shared module renderer unless one is given, so
+    copy the result to keep it.
+    """
+    global _renderer
+    if renderer is None:
+        renderer = _renderer = _renderer or SkeletonRenderer()
+    w, h = (bbox[2], bbox[3]) if bbox is not None else landmark_size(pts)
+    return renderer.render(pts, w, h)
@@ -0,0 +1,54 @@
+"""
+Text-to-speech on one dedicated thread.
+
+pyttsx3's sapi5 driver on Windows is COM apartment-threaded: the engine
+has to be created and driven on the same thread. Speaker creates it on
+its own thread and speaks queued texts there one after another, so the
+Tk loop never waits on runAndWait and no other thread touches the engine.
+"""
+
+import queue
+import threading
+import traceback
+
+
+class Speaker:
+    """A TTS engine made by ``init()`` on a private thread; say() queues text for it."""
+
+    def __init__(self, init):
+        self.error = None
+        self._queue = queue.Queue()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(init,), name="speech", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout=None):
+        """Block until the engine exists and return self; re-raises an error from ``init()``."""
+        self._ready.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        return self
+
+    def say(self, text):
+        self._queue.put(text)
+
+    def stop(self):
+        self._queue.put(None)
+
+    def _run(self, init):
+        try:
+            engine = init()
+        except Exception as e:
+            self.error = e
+            return
+        finally:
+            self._ready.set()
+        while True:
+            text = self._queue.get()
+            if text is None:
+                return
+            try:
+                engine.say(text)
+                engine.runAndWait()
+            except Exception:
+                print("==", traceback.format_exc())
@@ -0,0 +1,106 @@
+"""
+Background initialization with readiness state and a startup-time report.
+
+Loading the CNN, the MediaPipe detectors, the TTS engine and the
+dictionary takes seconds. Startup runs each loader on its own daemon
+thread, so the Tk window and camera preview can appear at once. The app
+polls ready() / result() from its event loop and starts recognition once
+the components it needs have loaded.
+
+Milestones such as "window shown" or "first frame" are recorded with
+mark(). report() lists every component's load time next to them, all
+measured from when the Startup was created.
+"""
+
+import threading
+import time
+import traceback
+
+LOADING, READY, FAILED = 'loading', 'ready', 'failed'
+
+
+class Startup:
+    """Named components loaded in parallel on background threads."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.components = {}
+        self.milestones = {}
+        self._lock = threading.Lock()
+
+    def load(self, name, loader, *args, after=(), **kwargs):
+        """Start ``loader(*args, **kwargs)`` on a thread; its return value becomes ``result(name)``.
+
+        With ``after``, the loader waits for those components and is called
+        with their results first; its load time counts from when they are ready.
+        """
+        component = {'state': LOADING, 'result': None, 'error': None,
+                     'start': time.perf_counter(), 'end': None, 'done': threading.Event()}
+        with self._lock:
+            self.components[name] = component
+        thread = threading.Thread(target=self._run, args=(component, loader, args, kwargs, after),
+                                  name=f"startup-{name}", daemon=True)
+        thread.start()
+        return thread
+
+    def _run(self, component, loader, args, kwargs, after):
+        try:
+            for name in after:
+                self.components[name]['done'].wait()
+                if self.components[name]['state'] != READY:
+                    raise RuntimeError(f"{name} failed to load")
+            component['start'] = time.perf_counter()
+            args = tuple(self.components[name]['result'] for name in after) + tuple(args)
+            component['result'] = loader(*args, **kwargs)
+            component['state'] = READY
+        except Exception:
+            component['error'] = traceback.format_exc()
+            component['state'] = FAILED
+            print("==", component['error'])
+        finally:
+            component['end'] = time.perf_counter()
+            component['done'].set()
+
+    def state(self, name):
+        return self.components[name]['state']
+
+    def ready(self, *names):
+        """True once every named component (all, if none are named) has loaded."""
+        return all(self.components[name]['state'] == READY for name in names or self.components)
+
+    def failed(self):
+        return [name for name, component in self.components.items() if component['state'] == FAILED]
+
+    def pending(self):
+        return [name for name, component in self.components.items() if component['state'] == LOADING]
+
+    def result(self, name, timeout=0):
+        """The loaded component, waiting up to ``timeout`` seconds (None waits forever); None if not ready."""
+        component = self.components[name]
+        component['done'].wait(timeout)
+        return component['result']
+
+    def mark(self, name):
+        """Record a milestone once, e.g. 'window' or 'first_frame'."""
+        self.milestones.setdefault(name, time.perf_counter() - self.started)
+
+    def report(self):
+        """Seconds per component (load duration, and when it finished) and per milestone."""
+        now = time.perf_counter()
+        return {
+            'components': {
+                name: {'state': c['state'],
+                       'load_s': (c['end'] or now) - c['start'],
+                       'ready_at_s': (c['end'] or now) - self.started}
+                for name, c in self.components.items()
+            },
+            'milestones': dict(self.milestones),
+        }
+
+    def print_report(self):
+        report = self.report()
+        print("Startup times:")
+        for name, entry in report['components'].items():
+            print(f"  {name:<12} {entry['load_s']:7.2f}s load, ready at {entry['ready_at_s']:7.2f}s ({entry['state']})")
+        for name, at in sorted(report['milestones'].items(), key=lambda item: item[1]):
+            print(f"  {name:<12} {at:7.2f}s")
@@ -0,0 +1,106 @@
+"""
+Spell suggestions on a background thread, always for the newest word.
+
+enchant's suggest() can take tens of milliseconds on longer words, which
+used to stall the Tk video loop. SuggestionWorker runs it on its own
+thread instead. request() and poll() never block the caller on the
+lookup: the lock they take only guards a few fields and is never held
+while suggesting.
+
+Only the latest request matters. A request replaced before the worker
+picks it up is dropped (superseded), and a result whose request was
+replaced while it was computed is discarded (stale). poll() returns each
+fresh result once.
+"""
+
+import threading
+import time
+import traceback
+
+
+class SuggestionWorker:
+    """Latest-wins background calls of ``suggest(word)``, keeping the first ``limit`` results."""
+
+    def __init__(self, suggest, limit=4):
+        self.suggest = suggest
+        self.limit = limit
+        self._cond = threading.Condition()
+        self._request = None
+        self._result = None
+        self._seq = 0
+        self._delivered = 0
+        self._running = True
+
+        self.requests = 0
+        self.completed = 0
+        self.superseded = 0
+        self.stale = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.suggest_time = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="suggestions", daemon=True)
+        self._thread.start()
+
+    def request(self, word):
+        """Ask for suggestions for ``word``, replacing any request not yet started."""
+        with self._cond:
+            if self._request is not None:
+                self.superseded += 1
+            self._seq += 1
+            self.requests += 1
+            self._request = (self._seq, word, time.perf_counter())
+            self._cond.notify()
+
+    def poll(self):
+        """``(word, suggestions)`` for the latest request once it is ready, else None."""
+        with self._cond:
+            if self._result is None or self._result[0] == self._delivered:
+                return None
+            seq, word, suggestions = self._result
+            self._delivered = seq
+            return word, suggestions
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._request is not None or not self._running)
+                if not self._running:
+                    return
+                seq, word, requested = self._request
+                self._request = None
+
+            start = time.perf_counter()
+            try:
+                suggestions = list(self.suggest(word))[:self.limit]
+            except Exception:
+                print("==", traceback.format_exc())
+                suggestions = []
+            done = time.perf_counter()
+
+            with self._cond:
+                self.suggest_time += done - start
+                if seq != self._seq:
+                    self.stale += 1
+                    continue
+                self._result = (seq, word, suggestions)
+                self.completed += 1
+                self.latency_total += done - requested
+                self.latency_max = max(self.latency_max, done - requested)
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+    def stats(self):
+        calls = self.completed + self.stale
+        return {
+            'requests': self.requests,
+            'completed': self.completed,
+            'superseded': self.superseded,
+            'stale': self.stale,
+            'avg_latency_ms': self.latency_total / self.completed * 1000 if self.completed else 0.0,
+            'max_latency_ms': self.latency_max * 1000,
+            'avg_suggest_ms': self.suggest_time / calls * 1000 if calls else 0.0,
+        }
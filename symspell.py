@@ -0,0 +1,223 @@
+"""
+Spell suggestions from a symmetric-delete (SymSpell) index.
+
+enchant's suggest() generates and scores candidates for every call. This
+module precomputes instead: every word in a frequency list is indexed
+under all the strings left after deleting up to ``max_distance``
+characters of its first ``prefix_length`` letters. A lookup makes the same
+deletes of the typed word, finds the words sharing one of them with a
+binary search, and scores only those.
+
+Scoring is an edit distance (with transpositions) where substituting
+letters the recognizer confuses with each other costs ``CONFUSION_COST``
+instead of 1. Candidates are ranked by that distance, then by frequency.
+
+The index is a directory of .npy files, opened memory-mapped, so loading
+it costs almost nothing. Build it once from a "word count" list (e.g.
+SymSpell's frequency_dictionary_en_82_765.txt):
+
+    python symspell.py --words frequency_dictionary_en_82_765.txt
+
+load_suggester() returns either enchant's dictionary or a SymSpell, per
+SIGNTALK_SUGGESTER; both answer suggest(word).
+"""
+
+import hashlib
+import os
+import time
+from collections import Counter
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.environ.get('SIGNTALK_SPELL_INDEX', os.path.join(BASE_DIR, 'symspell_index'))
+WORDS_PATH = os.environ.get('SIGNTALK_SPELL_WORDS', os.path.join(BASE_DIR, 'frequency_dictionary_en_82_765.txt'))
+SUGGESTER = os.environ.get('SIGNTALK_SUGGESTER', 'enchant')
+SUGGESTERS = ('enchant', 'symspell')
+
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+# Letters the recognizer mixes up; substituting within a group costs CONFUSION_COST
+CONFUSIONS = ('AEMNST', 'GH', 'CO', 'YJ', 'PQZ')
+CONFUSION_COST = float(os.environ.get('SIGNTALK_SPELL_CONFUSION_COST', '0.5'))
+
+
+def key(text):
+    """Stable 64-bit hash of a delete string (Python's hash() changes per process)."""
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'little')
+
+
+def deletes(word, distance):
+    """``word`` and every string left after deleting up to ``distance`` of its characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        found |= frontier
+    return found
+
+
+def substitution_costs(confusions=CONFUSIONS, cost=CONFUSION_COST):
+    """256x256 byte substitution costs: 0 on the diagonal, ``cost`` within a confusion group, else 1."""
+    costs = np.ones((256, 256), dtype=np.float32)
+    np.fill_diagonal(costs, 0)
+    for group in confusions:
+        codes = np.frombuffer(group.lower().encode(), dtype=np.uint8)
+        same = np.ix_(codes, codes)
+        costs[same] = np.where(np.eye(len(codes), dtype=bool), 0, cost)
+    return costs
+
+
+def distances(text, words, lengths, costs):
+    """Edit distance (with adjacent transpositions) from ``text`` to each zero-padded byte row of ``words``.
+
+    One row of the dynamic program per letter of ``text``, computed for
+    every candidate at once; insertions are folded in with a running minimum.
+    """
+    query = np.frombuffer(text.encode(), dtype=np.uint8)
+    n, width = words.shape
+    steps = np.arange(width + 1, dtype=np.float32)
+    previous = None
+    row = np.broadcast_to(steps, (n, width + 1))
+    for i, ch in enumerate(query, 1):
+        current = np.empty((n, width + 1), dtype=np.float32)
+        current[:, 0] = i
+        np.minimum(row[:, :-1] + costs[ch][words], row[:, 1:] + 1, out=current[:, 1:])
+        if previous is not None and width > 1:
+            swapped = (words[:, 1:] == query[i - 2]) & (words[:, :-1] == ch)
+            current[:, 2:] = np.where(swapped, np.minimum(current[:, 2:], previous[:, :-2] + 1), current[:, 2:])
+        current = np.minimum.accumulate(current - steps, axis=1) + steps
+        previous, row = row, current
+    return row[np.arange(n), lengths]
+
+
+def read_words(path):
+    """Word counts from a "word count" or plain one-word-per-line file; letters only, lowercased."""
+    counts = Counter()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if not parts or not parts[0].isascii() or not parts[0].isalpha():
+                continue
+            counts[parts[0].lower()] += int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 1
+    return counts
+
+
+def build(counts, output=INDEX_PATH, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH):
+    """Write the index for ``{word: count}`` to the ``output`` directory."""
+    # Most frequent first, so a lower word id also wins frequency ties
+    words = sorted(counts, key=lambda w: (-counts[w], w))
+    keys = []
+    ids = []
+    for i, word in enumerate(words):
+        for text in deletes(word[:prefix_length], max_distance):
+            keys.append(key(text))
+            ids.append(i)
+    keys = np.array(keys, dtype=np.uint64)
+    order = np.argsort(keys, kind='stable')
+
+    os.makedirs(output, exist_ok=True)
+    np.save(os.path.join(output, 'keys.npy'), keys[order])
+    np.save(os.path.join(output, 'ids.npy'), np.array(ids, dtype=np.int32)[order])
+    np.save(os.path.join(output, 'words.npy'), np.array([w.encode() for w in words]))
+    np.save(os.path.join(output, 'counts.npy'), np.array([counts[w] for w in words], dtype=np.int64))
+    np.save(os.path.join(output, 'lengths.npy'), np.array([len(w) for w in words], dtype=np.int32))
+    np.save(os.path.join(output, 'settings.npy'), np.array([max_distance, prefix_length], dtype=np.int32))
+    return len(words), len(keys)
+
+
+class SymSpell:
+    """Memory-mapped symmetric-delete index with confusion-aware ranking."""
+
+    def __init__(self, path=INDEX_PATH, confusion_cost=CONFUSION_COST):
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"No SymSpell index at {path}; build it with symspell.py first")
+        self.path = path
+        self.keys = np.load(os.path.join(path, 'keys.npy'), mmap_mode='r')
+        self.ids = np.load(os.path.join(path, 'ids.npy'), mmap_mode='r')
+        self.words = np.load(os.path.join(path, 'words.npy'), mmap_mode='r')
+        self.counts = np.load(os.path.join(path, 'counts.npy'), mmap_mode='r')
+        self.lengths = np.load(os.path.join(path, 'lengths.npy'), mmap_mode='r')
+        self.max_distance, self.prefix_length = (int(v) for v in np.load(os.path.join(path, 'settings.npy')))
+        # The fixed-width words as a (words, letters) byte matrix, still memory-mapped
+        self.chars = self.words.view(np.uint8).reshape(len(self.words), -1)
+        self.costs = substitution_costs(cost=confusion_cost)
+
+    def __len__(self):
+        return len(self.words)
+
+    def candidates(self, text):
+        """Ids of the words sharing a delete with ``text``; may include hash collisions."""
+        probes = deletes(text[:self.prefix_length], self.max_distance)
+        hashes = np.fromiter((key(p) for p in probes), dtype=np.uint64, count=len(probes))
+        lo = np.searchsorted(self.keys, hashes, 'left')
+        hi = np.searchsorted(self.keys, hashes, 'right')
+        spans = [self.ids[start:end] for start, end in zip(lo.tolist(), hi.tolist()) if start != end]
+        if not spans:
+            return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate(spans))
+
+    def lookup(self, word, limit=4):
+        """Up to ``limit`` ``(word, distance, count)``, closest first, then most frequent."""
+        text = word.strip().lower()
+        if not text.isascii() or not text.isalpha():
+            return []
+        ids = self.candidates(text)
+        lengths = self.lengths[ids]
+        close = np.abs(lengths - len(text)) <= self.max_distance
+        ids, lengths = ids[close], lengths[close]
+        if not len(ids):
+            return []
+        words = self.chars[ids, :len(text) + self.max_distance]
+        d = distances(text, words, lengths, self.costs)
+        within = d <= self.max_distance
+        ids, d = ids[within], d[within]
+        # Ids run from most to least frequent, so sorting by (distance, id) breaks ties by frequency
+        order = np.lexsort((ids, d))[:limit].tolist()
+        return [(self.words[ids[i]].decode(), float(d[i]), int(self.counts[ids[i]])) for i in order]
+
+    def suggest(self, word, limit=4):
+        """The ``limit`` best corrections of ``word``, like enchant's Dict.suggest."""
+        return [candidate for candidate, _, _ in self.lookup(word, limit)]
+
+    def check(self, word):
+        return any(d == 0 for _, d, _ in self.lookup(word, 1))
+
+
+def load_suggester(name=None):
+    """enchant's en-US dictionary or a SymSpell index, per SIGNTALK_SUGGESTER; both have suggest(word)."""
+    name = (name or SUGGESTER).lower()
+    if name not in SUGGESTERS:
+        raise ValueError(f"Unknown suggester {name!r}; choose from {', '.join(SUGGESTERS)}")
+    if name == 'enchant':
+        import enchant
+        return enchant.Dict("en-US")
+    return SymSpell()
+
+
+def main(words_path=WORDS_PATH, output=INDEX_PATH, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH):
+    if not os.path.exists(words_path):
+        print(f"No word list at {words_path}")
+        return None
+    counts = read_words(words_path)
+    start = time.perf_counter()
+    words, entries = build(counts, output, max_distance, prefix_length)
+    print(f"Indexed {words} words as {entries} deletes in {time.perf_counter() - start:.1f}s")
+    print(f"Index saved to: {output}")
+    return output
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build the SymSpell suggestion index from a word-frequency list')
+    parser.add_argument('--words', default=WORDS_PATH,
+                        help=f'"word count" lines, or one word per line (default: {WORDS_PATH})')
+    parser.add_argument('--output', default=INDEX_PATH, help=f'Index directory (default: {INDEX_PATH})')
+    parser.add_argument('--max-distance', type=int, default=MAX_DISTANCE,
+                        help=f'Largest edit distance suggested (default: {MAX_DISTANCE})')
+    parser.add_argument('--prefix-length', type=int, default=PREFIX_LENGTH,
+                        help=f'Leading letters indexed per word (default: {PREFIX_LENGTH})')
+
+    args = parser.parse_args()
+    main(words_path=args.words, output=args.output, max_distance=args.max_distance, prefix_length=args.prefix_length)
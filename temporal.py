@@ -0,0 +1,112 @@
+"""
+Turns the per-frame letter stream into discrete text events.
+
+Application.predict used to keep the last ten frame letters in a ring
+buffer and re-check it on every frame. LetterCommitter replaces that with
+a small state machine:
+
+- the candidate is the letter holding at least ``majority`` of the last
+  ``window`` frames; it must stay the majority for ``dwell`` frames in a
+  row before a LetterCandidate event announces it
+- when the "next" gesture becomes the candidate, the candidate before it
+  is committed: a letter gives LetterCommitted, "Backspace" gives
+  Backspace, " " gives Space (and WordCompleted when it ends a word)
+
+Events are namedtuples; tell them apart with isinstance, since events of
+the same shape (Backspace() and Space()) compare equal as tuples.
+
+update() returns the events for one frame, usually none, so consumers
+such as the suggestions, the GUI labels and TTS only act on changes.
+It does no I/O and keeps no per-frame history beyond the window, so a
+recorded letter sequence can be replayed through it as fast as Python
+iterates.
+"""
+
+import os
+from collections import Counter, deque, namedtuple
+
+# Frames voted over, share of them the candidate needs, and frames it must lead before it is announced
+WINDOW = int(os.environ.get('SIGNTALK_COMMIT_WINDOW', '5'))
+MAJORITY = float(os.environ.get('SIGNTALK_COMMIT_MAJORITY', '0.6'))
+DWELL = int(os.environ.get('SIGNTALK_COMMIT_DWELL', '2'))
+
+NEXT, BACKSPACE, SPACE = 'next', 'Backspace', ' '
+
+LetterCandidate = namedtuple('LetterCandidate', ['letter'])
+LetterCommitted = namedtuple('LetterCommitted', ['letter'])
+Backspace = namedtuple('Backspace', [])
+Space = namedtuple('Space', [])
+WordCompleted = namedtuple('WordCompleted', ['word'])
+
+
+class LetterCommitter:
+    """Majority-vote and dwell filter over frame letters, with "next"-gesture commits."""
+
+    def __init__(self, window=WINDOW, majority=MAJORITY, dwell=DWELL):
+        self.window = window
+        self.majority = majority
+        self.dwell = dwell
+        self.reset()
+
+    def reset(self):
+        self.frames = deque(maxlen=self.window)
+        self.counts = Counter()
+        self.leader = None
+        self.streak = 0
+        self.candidate = None
+        # The candidate "next" commits; kept while "next" itself is the candidate
+        self.pending = None
+        self.word = []
+
+    def update(self, letter):
+        """Feed one frame's letter (or gesture); returns the list of events it caused."""
+        if len(self.frames) == self.window:
+            old = self.frames[0]
+            self.counts[old] -= 1
+            if not self.counts[old]:
+                del self.counts[old]
+        self.frames.append(letter)
+        self.counts[letter] += 1
+
+        leader, votes = self.counts.most_common(1)[0]
+        if votes < self.majority * self.window:
+            leader = None
+        if leader == self.leader:
+            self.streak += 1
+        else:
+            self.leader = leader
+            self.streak = 1
+        if leader is None or leader == self.candidate or self.streak < self.dwell:
+            return []
+
+        self.candidate = leader
+        events = [LetterCandidate(leader)]
+        if leader == NEXT:
+            events.extend(self.commit(self.pending))
+        else:
+            self.pending = leader
+        return events
+
+    def commit(self, letter):
+        if letter == BACKSPACE:
+            if self.word:
+                self.word.pop()
+            return [Backspace()]
+        if letter == SPACE:
+            events = [Space()]
+            if self.word:
+                events.append(WordCompleted(''.join(self.word)))
+                self.word = []
+            return events
+        # Unresolved groups (ints) and nothing-yet are not text
+        if isinstance(letter, str) and len(letter) == 1:
+            self.word.append(letter)
+            return [LetterCommitted(letter)]
+        return []
+
+    def run(self, letters):
+        """All events for a recorded sequence of frame letters, in order."""
+        events = []
+        for letter in letters:
+            events.extend(self.update(letter))
+        return events
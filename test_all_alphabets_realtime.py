@@ -1,14 +1,20 @@
 import cv2
 import numpy as np
-import math
-import os
-from keras.models import load_model
 from cvzone.HandTrackingModule import HandDetector
 from string import ascii_uppercase
 import tkinter as tk
 from tkinter import ttk
 import threading
 import time
+from frame_grabber import FrameGrabber
+from pipeline import Pipeline, recognition_stages
+from predictor import load_backend
+from rule_engine import classify
+
+# Second findHands pass on the ROI crop; when off, the first-pass landmarks are reused.
+SECOND_PASS = False
+# Seconds between recorded results, so one held sign is not counted on every frame.
+RECORD_INTERVAL = 0.5
 
 class AlphabetTester:
     def __init__(self):
@@ -17,12 +23,11 @@ class AlphabetTester:
         self.vs.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
         
         # Load model
-        BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-        self.model = load_model(os.path.join(BASE_DIR, 'cnn8grps_rad1_model.h5'), compile=False)
+        self.model = load_backend()
         
         # Hand detector
         self.hd = HandDetector(maxHands=1)
-        self.hd2 = HandDetector(maxHands=1)
+        self.hd2 = HandDetector(maxHands=1) if SECOND_PASS else None
         
         # Testing variables
         self.offset = 29
@@ -31,6 +36,7 @@ class AlphabetTester:
         self.results = {letter: {'correct': 0, 'incorrect': 0, 'total': 0} for letter in ascii_uppercase}
         self.current_prediction = ''
         self.confidence = 0.0
+        self.last_record = 0.0
         
         # GUI setup
         self.setup_gui()
@@ -125,10 +131,8 @@ class AlphabetTester:
             else:
                 self.tree.insert('', 'end', values=(letter, 0, 0, 0, "0.0%"))
                 
-    def predict_letter(self, test_image):
-        white = test_image
-        white = white.reshape(1, 400, 400, 3)
-        prob = np.array(self.model.predict(white, verbose=0)[0], dtype='float32')
+    def predict_letter(self, prob):
+        prob = np.array(prob, dtype='float32')
         
         # Get top 3 predictions
         ch1 = np.argmax(prob, axis=0)
@@ -140,211 +144,37 @@ class AlphabetTester:
         # Store confidence
         self.confidence = float(prob[ch1]) if ch1 < len(prob) else 0.0
         
-        pl = [ch1, ch2]
-        
-        # Apply the same rules as in final_pred.py
-        # Group 0: [A, E, M, N, S, T]
-        l = [[5, 2], [5, 3], [3, 5], [3, 6], [3, 0], [3, 2], [6, 4], [6, 1], [6, 2], [6, 6], [6, 7], [6, 0], [6, 5],
-             [4, 1], [1, 0], [1, 1], [6, 3], [1, 6], [5, 6], [5, 1], [4, 5], [1, 4], [1, 5], [2, 0], [2, 6], [4, 6],
-             [1, 0], [5, 7], [1, 6], [6, 1], [7, 6], [2, 5], [7, 1], [5, 4], [7, 0], [7, 5], [7, 2]]
-        if pl in l:
-            if (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]):
-                ch1 = 0
-
-        # Group 2: [C, O]
-        l = [[0, 0], [0, 6], [0, 2], [0, 5], [0, 1], [0, 7], [5, 2], [7, 6], [7, 1]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if (self.pts[0][0] > self.pts[8][0] and self.pts[0][0] > self.pts[4][0] and self.pts[0][0] > self.pts[12][0] and self.pts[0][0] > self.pts[16][0] and self.pts[0][0] > self.pts[20][0]) and self.pts[5][0] > self.pts[4][0]:
-                ch1 = 2
-
-        # Group 3: [G, H]
-        l = [[1, 4], [1, 5], [1, 6], [1, 3], [1, 0]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[6][1] > self.pts[8][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1] and self.pts[0][0] < self.pts[8][0] and self.pts[0][0] < self.pts[12][0] and self.pts[0][0] < self.pts[16][0] and self.pts[0][0] < self.pts[20][0]:
-                ch1 = 3
-
-        # Group 4: [L]
-        l = [[4, 6], [4, 1], [4, 5], [4, 3], [4, 7]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[4][0] > self.pts[0][0]:
-                ch1 = 3
-
-        # Group 5: [P, Q, Z]
-        l = [[5, 3], [5, 0], [5, 7], [5, 4], [5, 2], [5, 1], [5, 5]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.pts[2][1] + 15 < self.pts[16][1]:
-                ch1 = 3
-
-        # Group 6: [X]
-        l = [[6, 4], [6, 1], [6, 2]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if self.distance(self.pts[4], self.pts[11]) > 55:
-                ch1 = 4
-
-        # Group 7: [Y, J]
-        l = [[5, 5], [5, 0], [5, 4], [5, 1], [4, 6], [4, 1], [7, 6], [3, 0], [3, 5]]
-        pl = [ch1, ch2]
-        if pl in l:
-            if ((self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1])) and self.pts[4][1] > self.pts[14][1]:
-                ch1 = 1
-
-        # Map groups to specific letters
-        if ch1 == 0:
-            # Group 0: [A, E, M, N, S, T]
-            if self.pts[4][0] < self.pts[6][0] and self.pts[4][0] < self.pts[10][0] and self.pts[4][0] < self.pts[14][0] and self.pts[4][0] < self.pts[18][0]:
-                ch1 = 'A'
-            elif self.pts[4][0] > self.pts[6][0] and self.pts[4][0] < self.pts[10][0] and self.pts[4][0] < self.pts[14][0] and self.pts[4][0] < self.pts[18][0] and self.pts[4][1] < self.pts[14][1] and self.pts[4][1] < self.pts[18][1]:
-                ch1 = 'T'
-            elif self.pts[4][1] > self.pts[8][1] and self.pts[4][1] > self.pts[12][1] and self.pts[4][1] > self.pts[16][1] and self.pts[4][1] > self.pts[20][1]:
-                ch1 = 'E'
-            elif self.pts[4][0] > self.pts[6][0] and self.pts[4][0] > self.pts[10][0] and self.pts[4][0] > self.pts[14][0] and self.pts[4][1] < self.pts[18][1]:
-                ch1 = 'M'
-            elif self.pts[4][0] > self.pts[6][0] and self.pts[4][0] > self.pts[10][0] and self.pts[4][1] < self.pts[18][1] and self.pts[4][1] < self.pts[14][1]:
-                ch1 = 'N'
-            else:
-                ch1 = 'S'
-        elif ch1 == 2:
-            # Group 2: [C, O]
-            if self.distance(self.pts[12], self.pts[4]) > 42:
-                ch1 = 'C'
-            else:
-                ch1 = 'O'
-        elif ch1 == 3:
-            # Group 3: [G, H]
-            if (self.distance(self.pts[8], self.pts[12])) > 72:
-                ch1 = 'G'
-            else:
-                ch1 = 'H'
-        elif ch1 == 7:
-            # Group 7: [Y, J]
-            if self.distance(self.pts[8], self.pts[4]) > 42:
-                ch1 = 'Y'
-            else:
-                ch1 = 'J'
-        elif ch1 == 4:
-            ch1 = 'L'
-        elif ch1 == 6:
-            ch1 = 'X'
-        elif ch1 == 5:
-            # Group 5: [P, Q, Z]
-            if self.pts[4][0] > self.pts[12][0] and self.pts[4][0] > self.pts[16][0] and self.pts[4][0] > self.pts[20][0]:
-                if self.pts[8][1] < self.pts[5][1]:
-                    ch1 = 'Z'
-                else:
-                    ch1 = 'Q'
-            else:
-                ch1 = 'P'
-        elif ch1 == 1:
-            # Group 1: [B, D, F, I, K, R, U, V, W]
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][1]):
-                ch1 = 'B'
-            elif (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]):
-                ch1 = 'D'
-            elif (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][1]):
-                ch1 = 'F'
-            elif (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] > self.pts[20][1]):
-                ch1 = 'I'
-            elif (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] < self.pts[20][1]):
-                ch1 = 'W'
-            elif (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]) and self.pts[4][1] < self.pts[9][1]:
-                ch1 = 'K'
-            elif ((self.distance(self.pts[8], self.pts[12]) - self.distance(self.pts[6], self.pts[10])) < 8) and (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]):
-                ch1 = 'U'
-            elif ((self.distance(self.pts[8], self.pts[12]) - self.distance(self.pts[6], self.pts[10])) >= 8) and (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]) and (self.pts[4][1] > self.pts[9][1]):
-                ch1 = 'V'
-            elif (self.pts[8][0] > self.pts[12][0]) and (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]):
-                ch1 = 'R'
-            else:
-                ch1 = 'B'  # Default fallback
-        else:
-            ch1 = '?'
-            
-        return ch1
-
-    def distance(self, x, y):
-        return math.sqrt(((x[0] - y[0]) ** 2) + ((x[1] - y[1]) ** 2))
+        letter = classify(ch1, ch2, self.pts)
+        # A group the rules could not resolve (an int) or a gesture is not a letter answer
+        if not (isinstance(letter, str) and len(letter) == 1 and letter.isalpha()):
+            return '?'
+        return letter
 
     def start_video_loop(self):
         def video_loop():
+            pipeline = Pipeline(FrameGrabber(self.vs), recognition_stages(self.hd, self.hd2, self.model, self.offset)).start()
             while self.testing_mode:
                 try:
-                    ok, frame = self.vs.read()
-                    if not ok or frame is None:
+                    packet = pipeline.get(timeout=0.1)
+                    if packet is None:
                         continue
-                        
-                    cv2image = cv2.flip(frame, 1)
-                    hands = self.hd.findHands(cv2image, draw=False, flipType=True)
-                    
-                    if hands and hands[0]:
-                        hand = hands[0]
-                        map = hand[0]
-                        x, y, w, h = map['bbox']
-                        image = cv2image[y - self.offset:y + h + self.offset, x - self.offset:x + w + self.offset]
 
-                        white = np.ones((400, 400, 3), dtype=np.uint8) * 255
-                        
-                        if image is not None and image.size != 0:
-                            handz = self.hd2.findHands(image, draw=False, flipType=True)
-                            if handz and handz[0]:
-                                hand = handz[0]
-                                handmap = hand[0]
-                                self.pts = handmap['lmList']
+                    cv2image = packet['frame']
+                    if packet['prob'] is not None:
+                        self.pts = packet['pts']
 
-                                x_offset = ((400 - w) // 2) - 15
-                                y_offset = ((400 - h) // 2) - 15
-                                
-                                # Draw hand skeleton
-                                for t in range(0, 4, 1):
-                                    cv2.line(white, (self.pts[t][0] + x_offset, self.pts[t][1] + y_offset), 
-                                             (self.pts[t + 1][0] + x_offset, self.pts[t + 1][1] + y_offset), (0, 255, 0), 3)
-                                for t in range(5, 8, 1):
-                                    cv2.line(white, (self.pts[t][0] + x_offset, self.pts[t][1] + y_offset), 
-                                             (self.pts[t + 1][0] + x_offset, self.pts[t + 1][1] + y_offset), (0, 255, 0), 3)
-                                for t in range(9, 12, 1):
-                                    cv2.line(white, (self.pts[t][0] + x_offset, self.pts[t][1] + y_offset), 
-                                             (self.pts[t + 1][0] + x_offset, self.pts[t + 1][1] + y_offset), (0, 255, 0), 3)
-                                for t in range(13, 16, 1):
-                                    cv2.line(white, (self.pts[t][0] + x_offset, self.pts[t][1] + y_offset), 
-                                             (self.pts[t + 1][0] + x_offset, self.pts[t + 1][1] + y_offset), (0, 255, 0), 3)
-                                for t in range(17, 20, 1):
-                                    cv2.line(white, (self.pts[t][0] + x_offset, self.pts[t][1] + y_offset), 
-                                             (self.pts[t + 1][0] + x_offset, self.pts[t + 1][1] + y_offset), (0, 255, 0), 3)
-                                
-                                cv2.line(white, (self.pts[5][0] + x_offset, self.pts[5][1] + y_offset), 
-                                         (self.pts[9][0] + x_offset, self.pts[9][1] + y_offset), (0, 255, 0), 3)
-                                cv2.line(white, (self.pts[9][0] + x_offset, self.pts[9][1] + y_offset), 
-                                         (self.pts[13][0] + x_offset, self.pts[13][1] + y_offset), (0, 255, 0), 3)
-                                cv2.line(white, (self.pts[13][0] + x_offset, self.pts[13][1] + y_offset), 
-                                         (self.pts[17][0] + x_offset, self.pts[17][1] + y_offset), (0, 255, 0), 3)
-                                cv2.line(white, (self.pts[0][0] + x_offset, self.pts[0][0] + y_offset), 
-                                         (self.pts[5][0] + x_offset, self.pts[5][1] + y_offset), (0, 255, 0), 3)
-                                cv2.line(white, (self.pts[0][0] + x_offset, self.pts[0][0] + y_offset), 
-                                         (self.pts[17][0] + x_offset, self.pts[17][1] + y_offset), (0, 255, 0), 3)
+                        # Predict letter
+                        predicted = self.predict_letter(packet['prob'])
+                        self.current_prediction = predicted
 
-                                for i in range(21):
-                                    cv2.circle(white, (self.pts[i][0] + x_offset, self.pts[i][0] + y_offset), 2, (0, 0, 255), 1)
+                        # Update GUI
+                        self.root.after(0, self.update_prediction_display, predicted)
 
-                                # Predict letter
-                                predicted = self.predict_letter(white)
-                                self.current_prediction = predicted
-                                
-                                # Update GUI
-                                self.root.after(0, self.update_prediction_display, predicted)
-                                
-                                # Check if prediction matches current letter
-                                if predicted == self.current_letter:
-                                    # Correct prediction - wait a bit then record
-                                    time.sleep(0.5)  # Small delay to avoid multiple counts
-                                    self.root.after(0, self.record_result, True)
-                                elif predicted != '?' and predicted != ' ':
-                                    # Incorrect prediction - wait a bit then record
-                                    time.sleep(0.5)
-                                    self.root.after(0, self.record_result, False)
+                        # Check if prediction matches current letter, at most once per RECORD_INTERVAL
+                        now = time.monotonic()
+                        if predicted != '?' and now - self.last_record >= RECORD_INTERVAL:
+                            self.last_record = now
+                            self.root.after(0, self.record_result, predicted == self.current_letter)
 
                     # Display frame
                     cv2.imshow("ASL Alphabet Tester", cv2image)
@@ -355,6 +185,7 @@ class AlphabetTester:
                     print(f"Error in video loop: {e}")
                     continue
                     
+            pipeline.stop()
             self.vs.release()
             cv2.destroyAllWindows()
             
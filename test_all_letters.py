@@ -1,274 +1,116 @@
 import os
-import glob
 import cv2
 import numpy as np
-from keras.models import load_model
 from cvzone.HandTrackingModule import HandDetector
+from skeleton_renderer import SkeletonRenderer, render_skeleton
+from predictor import BACKEND, BACKENDS, VARIANT, VARIANTS, load_backend, resolve_model
+from rule_engine import classify
+from batch_eval import DATASET_DIR, evaluate, flatten, list_dataset, load_landmarks, print_timings, top2
+import landmark_cache
 from string import ascii_uppercase
 import json
 import time
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATASET_DIR = os.path.join(BASE_DIR, 'AtoZ_3.1')
-MODEL_PATH = os.path.join(BASE_DIR, 'cnn8grps_rad1_model.h5')
-
 offset = 29
 
-def distance(x, y):
-	return np.sqrt(((x[0] - y[0]) ** 2) + ((x[1] - y[1]) ** 2))
-
-def draw_skeleton_from_pts(pts, w, h):
-	white = np.ones((400, 400, 3), dtype=np.uint8) * 255
-	# Centering offsets
-	x_offset = ((400 - w) // 2) - 15
-	y_offset = ((400 - h) // 2) - 15
-	# Chains
-	for t in range(0, 4):
-		cv2.line(white, (pts[t][0] + x_offset, pts[t][1] + y_offset), (pts[t + 1][0] + x_offset, pts[t + 1][1] + y_offset), (0, 255, 0), 3)
-	for t in range(5, 8):
-		cv2.line(white, (pts[t][0] + x_offset, pts[t][1] + y_offset), (pts[t + 1][0] + x_offset, pts[t + 1][1] + y_offset), (0, 255, 0), 3)
-	for t in range(9, 12):
-		cv2.line(white, (pts[t][0] + x_offset, pts[t][1] + y_offset), (pts[t + 1][0] + x_offset, pts[t + 1][1] + y_offset), (0, 255, 0), 3)
-	for t in range(13, 16):
-		cv2.line(white, (pts[t][0] + x_offset, pts[t][1] + y_offset), (pts[t + 1][0] + x_offset, pts[t + 1][1] + y_offset), (0, 255, 0), 3)
-	for t in range(17, 20):
-		cv2.line(white, (pts[t][0] + x_offset, pts[t][1] + y_offset), (pts[t + 1][0] + x_offset, pts[t + 1][1] + y_offset), (0, 255, 0), 3)
-	cv2.line(white, (pts[5][0] + x_offset, pts[5][1] + y_offset), (pts[9][0] + x_offset, pts[9][1] + y_offset), (0, 255, 0), 3)
-	cv2.line(white, (pts[9][0] + x_offset, pts[9][1] + y_offset), (pts[13][0] + x_offset, pts[13][1] + y_offset), (0, 255, 0), 3)
-	cv2.line(white, (pts[13][0] + x_offset, pts[13][1] + y_offset), (pts[17][0] + x_offset, pts[17][1] + y_offset), (0, 255, 0), 3)
-	cv2.line(white, (pts[0][0] + x_offset, pts[0][1] + y_offset), (pts[5][0] + x_offset, pts[5][1] + y_offset), (0, 255, 0), 3)
-	cv2.line(white, (pts[0][0] + x_offset, pts[0][1] + y_offset), (pts[17][0] + x_offset, pts[17][1] + y_offset), (0, 255, 0), 3)
-	for i in range(21):
-		cv2.circle(white, (pts[i][0] + x_offset, pts[i][1] + y_offset), 2, (0, 0, 255), 1)
-	return white
-
-def predict_letter(model, pts):
-	# Derive width/height from landmarks
-	xs = [p[0] for p in pts]
-	ys = [p[1] for p in pts]
-	w = max(xs) - min(xs) + 1
-	h = max(ys) - min(ys) + 1
-	white = draw_skeleton_from_pts(pts, w, h)
-	inp = white.reshape(1, 400, 400, 3)
-	prob = np.array(model.predict(inp, verbose=0)[0], dtype='float32')
-	ch1 = int(np.argmax(prob, axis=0))
-	prob[ch1] = 0
-	ch2 = int(np.argmax(prob, axis=0))
-	prob[ch2] = 0
-	# ch3 not used in rules beyond masking
-	ch3 = int(np.argmax(prob, axis=0))
-
-	pl = [ch1, ch2]
-	# The following rules mirror final_pred.py (simplified to compute final ch1)
-	# Due to length, we include critical discriminators to map groups to letters.
-	# Group S/A/T/E/M/N
-	l = [[5, 2], [5, 3], [3, 5], [3, 6], [3, 0], [3, 2], [6, 4], [6, 1], [6, 2], [6, 6], [6, 7], [6, 0], [6, 5],
-	     [4, 1], [1, 0], [1, 1], [6, 3], [1, 6], [5, 6], [5, 1], [4, 5], [1, 4], [1, 5], [2, 0], [2, 6], [4, 6],
-	     [1, 0], [5, 7], [1, 6], [6, 1], [7, 6], [2, 5], [7, 1], [5, 4], [7, 0], [7, 5], [7, 2]]
-	if pl in l:
-		if (pts[6][1] < pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]):
-			ch1 = 0
-
-	# c/o
-	l = [[0, 0], [0, 6], [0, 2], [0, 5], [0, 1], [0, 7], [5, 2], [7, 6], [7, 1]]
-	pl = [ch1, ch2]
-	if pl in l:
-		if (pts[0][0] > pts[8][0] and pts[0][0] > pts[4][0] and pts[0][0] > pts[12][0] and pts[0][0] > pts[16][0] and pts[0][0] > pts[20][0]) and pts[5][0] > pts[4][0]:
-			ch1 = 2
-	l = [[6, 0], [6, 6], [6, 2]]
-	pl = [ch1, ch2]
-	if pl in l:
-		if distance(pts[8], pts[16]) < 52:
-			ch1 = 2
-
-	# gh vs others
-	l = [[1, 4], [1, 5], [1, 6], [1, 3], [1, 0]]
-	pl = [ch1, ch2]
-	if pl in l:
-		if pts[6][1] > pts[8][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1] and pts[0][0] < pts[8][0] and pts[0][0] < pts[12][0] and pts[0][0] < pts[16][0] and pts[0][0] < pts[20][0]:
-			ch1 = 3
-
-	# l group
-	l = [[6, 4], [6, 1], [6, 2]]
-	pl = [ch1, ch2]
-	if pl in l:
-		if distance(pts[4], pts[11]) > 55:
-			ch1 = 4
-
-	# z/p/q group
-	l = [[3, 6], [3, 5], [3, 4]]
-	pl = [ch1, ch2]
-	if pl in l and (pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]) and pts[4][1] > pts[10][1]:
-		ch1 = 5
-
-	# x group
-	l = [[0, 4], [0, 2], [0, 3], [0, 1], [0, 6]]
-	pl = [ch1, ch2]
-	if pl in l and pts[5][0] > pts[16][0]:
-		ch1 = 6
-
-	# y/j group
-	l = [[7, 2]]
-	pl = [ch1, ch2]
-	if pl in l and (pts[18][1] < pts[20][1] and pts[8][1] < pts[10][1]):
-		ch1 = 6
-
-	# Map groups to letters based on rules
-	if ch1 == 0:
-		# S/A/T/E/M/N
-		result = 'S'
-		if pts[4][0] < pts[6][0] and pts[4][0] < pts[10][0] and pts[4][0] < pts[14][0] and pts[4][0] < pts[18][0]:
-			result = 'A'
-		elif pts[4][0] > pts[6][0] and pts[4][0] < pts[10][0] and pts[4][0] < pts[14][0] and pts[4][0] < pts[18][0] and pts[4][1] < pts[14][1] and pts[4][1] < pts[18][1]:
-			result = 'T'
-		elif pts[4][1] > pts[8][1] and pts[4][1] > pts[12][1] and pts[4][1] > pts[16][1] and pts[4][1] > pts[20][1]:
-			result = 'E'
-		elif pts[4][0] > pts[6][0] and pts[4][0] > pts[10][0] and pts[4][0] > pts[14][0] and pts[4][1] < pts[18][1]:
-			result = 'M'
-		elif pts[4][0] > pts[6][0] and pts[4][0] > pts[10][0] and pts[4][1] < pts[18][1] and pts[4][1] < pts[14][1]:
-			result = 'N'
-		return result
-	elif ch1 == 2:
-		return 'C' if distance(pts[12], pts[4]) > 42 else 'O'
-	elif ch1 == 3:
-		return 'G' if distance(pts[8], pts[12]) > 72 else 'H'
-	elif ch1 == 7:
-		return 'Y' if distance(pts[8], pts[4]) > 42 else 'J'
-	elif ch1 == 4:
-		return 'L'
-	elif ch1 == 6:
-		return 'X'
-	elif ch1 == 5:
-		if pts[4][0] > pts[12][0] and pts[4][0] > pts[16][0] and pts[4][0] > pts[20][0]:
-			return 'Z' if pts[8][1] < pts[5][1] else 'Q'
-		return 'P'
-	elif ch1 == 1:
-		# B/D/F/I/W/K/U/V/R
-		if (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][1]):
-			return 'B'
-		if (pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]):
-			return 'D'
-		if (pts[6][1] < pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][1]):
-			return 'F'
-		if (pts[6][1] < pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] > pts[20][1]):
-			return 'I'
-		if (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] < pts[20][1]):
-			return 'W'
-		if (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]) and pts[4][1] < pts[9][1]:
-			return 'K'
-		if ((distance(pts[8], pts[12]) - distance(pts[6], pts[10])) < 8) and (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]):
-			return 'U'
-		if ((distance(pts[8], pts[12]) - distance(pts[6], pts[10])) >= 8) and (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]) and (pts[4][1] > pts[9][1]):
-			return 'V'
-		if (pts[8][0] > pts[12][0]) and (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]):
-			return 'R'
-	# Fallback: unknown
-	return '?' 
-
-def test_single_image(model, detector, img_path, expected_letter):
-	"""Test a single image and return prediction results"""
-	try:
-		img = cv2.imread(img_path)
-		if img is None:
-			return {'success': False, 'error': 'Failed to load image', 'prediction': None}
-		
-		hands = detector.findHands(img, draw=False, flipType=True)
-		if not hands or not hands[0]:
-			return {'success': False, 'error': 'No hand detected', 'prediction': None}
-		
-		hand = hands[0]
-		hmap = hand[0] if isinstance(hand, (list, tuple)) else hand
-		pts = hmap['lmList']
-		
-		# Get bounding box
-		bbox = hmap.get('bbox', None)
-		if bbox is not None:
-			x, y, w, h = bbox
-		else:
-			xs = [p[0] for p in pts]
-			ys = [p[1] for p in pts]
-			w = max(xs) - min(xs) + 1
-			h = max(ys) - min(ys) + 1
-		
-		pred = predict_letter(model, pts)
-		correct = pred == expected_letter
-		
-		return {
-			'success': True,
-			'prediction': pred,
-			'expected': expected_letter,
-			'correct': correct,
-			'confidence': 1.0  # Placeholder for confidence
-		}
-		
-	except Exception as e:
-		return {'success': False, 'error': str(e), 'prediction': None}
-
-def main(samples_per_letter=10, save_results=True):
+def main(samples_per_letter=10, save_results=True, backend=None, variant=None, batch_size=32, workers=1,
+	     use_cache=True):
 	"""Main testing function with enhanced reporting"""
-	print("Loading model and detector...")
-	detector = HandDetector(maxHands=1)
-	
-	try:
-		model = load_model(MODEL_PATH)
-		print(f"Model loaded successfully from {MODEL_PATH}")
-	except Exception as e:
-		print(f"Error loading model: {e}")
-		return
-	
 	# Check if dataset directory exists
 	if not os.path.isdir(DATASET_DIR):
 		print(f"Dataset directory not found: {DATASET_DIR}")
 		print("Please ensure the AtoZ_3.1 folder is in the same directory as this script.")
 		return
 	
+	try:
+		backend, model_path = resolve_model(backend, variant)
+	except ValueError as e:
+		print(f"Error loading model: {e}")
+		return
+	
 	report = {}
 	start_time = time.time()
 	
-	print(f"\nStarting comprehensive testing of all alphabets...")
-	print(f"Testing {samples_per_letter} samples per letter")
-	print("=" * 60)
+	def progress(done, total):
+		print(f"  Progress: {done}/{total}")
 	
-	for letter in ascii_uppercase:
-		folder = os.path.join(DATASET_DIR, letter)
-		if not os.path.isdir(folder):
+	dataset = list_dataset(samples_per_letter)
+	paths, letter_idx = flatten(dataset)
+	
+	# Landmarks come from the on-disk cache; only new or changed images are run through the detector
+	cache = None
+	if use_cache:
+		cache, stats = landmark_cache.update(paths)
+		print(f"Landmark cache: {stats['reused']} cached, {stats['extracted']} extracted")
+	
+	if workers > 1:
+		from parallel_eval import run as run_parallel
+		
+		print(f"Evaluating {len(paths)} images on {workers} worker processes ({backend}: {model_path})")
+		print("=" * 60)
+		predictions, failures, timings = run_parallel(paths, workers=workers, backend=backend, variant=variant,
+		                                             batch_size=batch_size, use_cache=use_cache, progress=progress)
+	else:
+		print("Loading model and detector...")
+		detector = None if cache else HandDetector(maxHands=1)
+		try:
+			model = load_backend(backend, variant=variant)
+			print(f"Model loaded successfully from {model.model_path} ({model.name})")
+		except Exception as e:
+			print(f"Error loading model: {e}")
+			return
+		
+		print(f"\nStarting comprehensive testing of all alphabets...")
+		print(f"Testing {samples_per_letter} samples per letter, batch size {batch_size}")
+		print("=" * 60)
+		
+		# Detection and rendering run on the engine's decode thread, so it gets its own canvas
+		batch_renderer = SkeletonRenderer()
+		
+		def prepare(img_path):
+			pts = cache.landmarks_for(img_path) if cache else load_landmarks(detector, img_path)
+			return render_skeleton(pts, batch_renderer).copy(), pts
+		
+		result = evaluate(model, paths, prepare, batch_size=batch_size, progress=progress)
+		groups = top2(result.probs)
+		predictions = [classify(groups[j, 0], groups[j, 1], result.payloads[j]) if result.ok[j] else None
+		               for j in range(len(paths))]
+		failures = result.errors
+		timings = result.timings
+	
+	for i, letter in enumerate(ascii_uppercase):
+		images = dataset[letter]
+		if images is None:
 			print(f"Letter {letter}: No folder found")
 			report[letter] = {'tested': 0, 'correct': 0, 'miss': 0, 'errors': [], 'accuracy': 0.0}
 			continue
-		
-		images = sorted(glob.glob(os.path.join(folder, '*.jpg')))[:samples_per_letter]
 		if not images:
 			print(f"Letter {letter}: No images found")
 			report[letter] = {'tested': 0, 'correct': 0, 'miss': 0, 'errors': [], 'accuracy': 0.0}
 			continue
 		
-		print(f"Testing letter {letter} ({len(images)} images)...")
 		correct = 0
 		miss = 0
 		errors = []
 		
-		for i, img_path in enumerate(images):
-			result = test_single_image(model, detector, img_path, letter)
-			
-			if result['success']:
-				if result['correct']:
+		for j in np.flatnonzero(letter_idx == i):
+			img_path = paths[j]
+			pred = predictions[j]
+			if failures[j] is None:
+				if pred == letter:
 					correct += 1
 				else:
 					errors.append({
 						'image': os.path.basename(img_path),
-						'predicted': result['prediction'],
-						'expected': result['expected']
+						'predicted': pred,
+						'expected': letter
 					})
 			else:
 				miss += 1
 				errors.append({
 					'image': os.path.basename(img_path),
-					'error': result['error']
+					'error': failures[j]
 				})
-			
-			# Progress indicator
-			if (i + 1) % 10 == 0 or (i + 1) == len(images):
-				print(f"  Progress: {i + 1}/{len(images)}")
 		
 		accuracy = (correct / len(images)) * 100 if len(images) > 0 else 0.0
 		report[letter] = {
@@ -318,6 +160,7 @@ def main(samples_per_letter=10, save_results=True):
 	# Performance metrics
 	elapsed_time = time.time() - start_time
 	print(f"\nTesting completed in {elapsed_time:.2f} seconds")
+	print_timings(timings)
 	print(f"Overall accuracy: {overall_accuracy:.1f}%")
 	
 	# Identify problematic letters
@@ -342,8 +185,12 @@ def main(samples_per_letter=10, save_results=True):
 			'timestamp': timestamp,
 			'test_parameters': {
 				'samples_per_letter': samples_per_letter,
+				'batch_size': batch_size,
 				'dataset_path': DATASET_DIR,
-				'model_path': MODEL_PATH
+				'model_path': model_path,
+				'backend': backend,
+				'workers': workers,
+				'landmark_cache': use_cache
 			},
 			'overall_stats': {
 				'total_tested': total_letters,
@@ -352,6 +199,7 @@ def main(samples_per_letter=10, save_results=True):
 				'overall_accuracy': overall_accuracy,
 				'elapsed_time': elapsed_time
 			},
+			'timings': timings,
 			'letter_results': report
 		}
 		
@@ -372,8 +220,19 @@ if __name__ == "__main__":
 					   help='Number of samples to test per letter (default: 10)')
 	parser.add_argument('--no-save', action='store_true',
 					   help='Do not save detailed results to file')
+	parser.add_argument('--backend', default=BACKEND, choices=sorted(BACKENDS),
+					   help=f'Inference backend (default: {BACKEND}, from SIGNTALK_BACKEND)')
+	parser.add_argument('--variant', default=VARIANT, choices=VARIANTS,
+					   help=f'Model variant; float16/int8 need --backend tflite (default: {VARIANT})')
+	parser.add_argument('--batch-size', type=int, default=32,
+					   help='Images per inference call (default: 32)')
+	parser.add_argument('--workers', type=int, default=1,
+					   help='Worker processes, each with its own detector and model (default: 1)')
+	parser.add_argument('--no-cache', action='store_true',
+					   help='Run hand detection on every image instead of reading the landmark cache')
 	
 	args = parser.parse_args()
 	
 	# Run the test
-	main(samples_per_letter=args.samples, save_results=not args.no_save)
+	main(samples_per_letter=args.samples, save_results=not args.no_save, backend=args.backend, variant=args.variant,
+	     batch_size=args.batch_size, workers=args.workers, use_cache=not args.no_cache)
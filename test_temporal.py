@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for temporal.LetterCommitter, fed per-frame letter sequences like
+the ones Application.predict produces: a letter held for a while, flicker
+from neighbouring letters, then the "next" gesture to commit it.
+
+Run directly or through pytest; benchmark_temporal.py measures the
+replay rate.
+"""
+
+import random
+
+from temporal import Backspace, LetterCommitted, LetterCommitter, Space
+
+
+def hold(letter, frames, noise=0.0, rng=None, noise_letters='AEMNST'):
+    """``frames`` of ``letter`` with a ``noise`` share replaced by random confusable letters."""
+    rng = rng or random.Random(0)
+    return [rng.choice(noise_letters) if rng.random() < noise else letter for _ in range(frames)]
+
+
+def spell(text, frames=15, next_frames=10, noise=0.0, seed=0):
+    """The frame sequence that signs ``text``: each character held, then "next"."""
+    rng = random.Random(seed)
+    sequence = []
+    for ch in text:
+        sequence += hold(ch, frames, noise, rng) + hold('next', next_frames, noise, rng)
+    return sequence
+
+
+def named(events):
+    """Events as (type name, fields...) tuples; namedtuples of the same shape compare equal otherwise."""
+    return [(type(event).__name__,) + tuple(event) for event in events]
+
+
+def committed_text(events):
+    text = ''
+    for event in events:
+        if isinstance(event, LetterCommitted):
+            text += event.letter
+        elif isinstance(event, Space):
+            text += ' '
+        elif isinstance(event, Backspace):
+            text = text[:-1]
+    return text
+
+
+def test_held_letters_commit_on_next():
+    events = LetterCommitter().run(spell('HELLO'))
+    assert committed_text(events) == 'HELLO'
+    assert [e.letter for e in events if isinstance(e, LetterCommitted)] == list('HELLO')
+    assert named(events)[:3] == [('LetterCandidate', 'H'), ('LetterCandidate', 'next'), ('LetterCommitted', 'H')]
+
+
+def test_flicker_is_voted_out():
+    events = LetterCommitter().run(spell('CAB', noise=0.15, seed=3))
+    assert committed_text(events) == 'CAB'
+
+
+def test_single_frame_glitch_is_no_candidate():
+    events = LetterCommitter().run(hold('B', 10) + ['X'] + hold('B', 10))
+    assert named(events) == [('LetterCandidate', 'B')]
+
+
+def test_next_held_commits_once():
+    events = LetterCommitter().run(hold('A', 10) + hold('next', 60))
+    assert named(events).count(('LetterCommitted', 'A')) == 1
+
+
+def test_backspace_and_space():
+    sequence = spell('HI') + hold('Backspace', 15) + hold('next', 10) + spell('O ')
+    events = LetterCommitter().run(sequence)
+    assert committed_text(events) == 'HO '
+    assert ('Backspace',) in named(events)
+    assert named(events)[-2:] == [('Space',), ('WordCompleted', 'HO')]
+
+
+def test_unresolved_group_is_not_text():
+    events = LetterCommitter().run(hold(1, 10) + hold('next', 10))
+    assert committed_text(events) == ''
+
+
+if __name__ == "__main__":
+    tests = [(name, fn) for name, fn in sorted(globals().items()) if name.startswith('test_') and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"ok    {name}")
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL  {name}: {e}")
+    raise SystemExit(1 if failed else 0)
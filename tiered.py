@@ -0,0 +1,73 @@
+"""
+Two-tier recognizer: the landmark MLP first, the CNN only when it is unsure.
+
+Most frames are unambiguous from the landmarks alone. TieredRecognizer
+runs the landmark classifier (see landmark_classifier.py) on every frame
+and keeps its answer when the gap between its top two probabilities is
+at least ``margin``. Otherwise the skeleton is rendered and goes to the
+CNN, and Application.predict applies the usual rule cascade. Frames the
+fast tier decides are never rendered.
+
+predict() returns whichever probability vector decided the frame, so
+callers tell the tiers apart by its length as they already do for the
+landmark engines: 26 (or 8 from a groups model) from the fast tier, 8
+from the CNN.
+"""
+
+import os
+import time
+
+import numpy as np
+
+# Top-1 minus top-2 probability the landmark tier needs to skip the CNN
+MARGIN = float(os.environ.get('SIGNTALK_TIER_MARGIN', '0.5'))
+
+
+def margin(prob):
+    """Gap between the two highest probabilities of ``prob``."""
+    top = np.partition(np.asarray(prob), -2)[-2:]
+    return float(top[1] - top[0])
+
+
+class TieredRecognizer:
+    """A landmark classifier in front of a CNN backend, with per-tier counters."""
+
+    name = 'tiered'
+    # Tells the pipeline to pass the landmarks and a skeleton renderer
+    tiered = True
+
+    def __init__(self, fast, cnn, margin=MARGIN):
+        self.fast = fast
+        self.cnn = cnn
+        self.margin = margin
+        self.fast_frames = 0
+        self.cnn_frames = 0
+        self.fast_time = 0.0
+        self.cnn_time = 0.0
+
+    def predict(self, pts, render):
+        """Probabilities for one hand; ``render()`` returns its skeleton and is only called for the CNN."""
+        start = time.perf_counter()
+        prob = self.fast.predict(pts)
+        confident = margin(prob) >= self.margin
+        checked = time.perf_counter()
+        self.fast_time += checked - start
+        if confident:
+            self.fast_frames += 1
+            return prob
+        prob = self.cnn.predict(render())
+        self.cnn_time += time.perf_counter() - checked
+        self.cnn_frames += 1
+        return prob
+
+    def stats(self):
+        frames = self.fast_frames + self.cnn_frames
+        return {
+            'frames': frames,
+            'fast': self.fast_frames,
+            'cnn': self.cnn_frames,
+            'fast_share': self.fast_frames / frames if frames else 0.0,
+            'fast_ms': self.fast_time / frames * 1000 if frames else 0.0,
+            'cnn_ms': self.cnn_time / self.cnn_frames * 1000 if self.cnn_frames else 0.0,
+            'avg_ms': (self.fast_time + self.cnn_time) / frames * 1000 if frames else 0.0,
+        }
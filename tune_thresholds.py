@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Coordinate-descent tuner for the pixel thresholds in rule_engine.THRESHOLDS.
+
+Landmarks come from the AtoZ_3.1 landmark cache (see landmark_cache.py).
+The CNN's top-2 groups for each image are computed once from the rendered
+skeleton and kept in a side file, keyed by image hash and model, so
+reruns only rescore the rules. Scoring uses the batch rule evaluator on
+prebuilt BatchHandFeatures.
+
+The images are split at random into a tuning set and a held-out set.
+Each round sweeps every threshold over its SEARCH_SPACE with the others
+fixed and keeps the value with the best tuning-set letter accuracy. Ties
+keep the current value, or else the one closest to it. Rounds stop when
+nothing changes. The report gives overall and per-letter accuracy on the
+held-out set before and after, plus gesture misfires (' ', 'next',
+'Backspace' predicted on a letter image). It also gives the tuned
+thresholds, which SIGNTALK_THRESHOLDS can point the apps at.
+"""
+
+import json
+import os
+from string import ascii_uppercase
+
+import numpy as np
+
+import landmark_cache
+from batch_eval import evaluate, flatten, list_dataset, top2
+from hand_features import BatchHandFeatures
+from predictor import BACKEND, BACKENDS, VARIANT, VARIANTS, resolve_model
+from rule_engine import THRESHOLDS, RuleEngine
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GROUPS_PATH = os.path.join(BASE_DIR, 'AtoZ_3.1_groups.npz')
+OUTPUT_PATH = os.path.join(BASE_DIR, 'rule_thresholds.json')
+
+# name -> (lowest, highest) candidate value, searched in steps of --step
+SEARCH_SPACE = {
+    'c0_x_index_ring': (20, 100),
+    'x_c0_index_ring': (20, 100),
+    'gh_pqz_thumb_drop': (0, 40),
+    'pq_thumb_drop': (0, 40),
+    'l_x_thumb_gap': (20, 100),
+    'l_d_thumb_gap': (20, 100),
+    'x_l_thumb_gap': (20, 100),
+    'd_l_thumb_gap': (20, 100),
+    'w_thumb_gap': (20, 100),
+    'w_wrist_margin': (0, 40),
+    'x_d_thumb_offset': (0, 40),
+    'd_x_thumb_offset': (0, 40),
+    'yj_thumb_offset': (0, 40),
+    'uv_spread': (0, 30),
+    'co_thumb_middle': (20, 100),
+    'gh_index_middle': (30, 130),
+    'yj_thumb_index': (20, 100),
+}
+
+GESTURES = (' ', 'next', 'Backspace')
+
+
+def cnn_groups(cache, paths, backend=None, variant=None, batch_size=32, groups_path=GROUPS_PATH):
+    """Top-2 CNN groups for ``paths`` (all cached with a hand), reusing ``groups_path`` when it matches."""
+    from skeleton_renderer import render_skeleton
+    from predictor import load_backend
+
+    name, model_path = resolve_model(backend, variant)
+    model_id = os.path.basename(model_path)
+    keys = np.array([cache.key(p) for p in paths], dtype=str)
+    digests = np.array([cache.sha1[cache.row(p)] for p in paths], dtype='S40')
+    if os.path.exists(groups_path):
+        with np.load(groups_path, allow_pickle=False) as data:
+            if (str(data['model']) == model_id and np.array_equal(data['paths'], keys)
+                    and np.array_equal(data['sha1'], digests)):
+                return data['groups']
+
+    model = load_backend(name, model_path)
+
+    def prepare(path):
+        pts = cache.landmarks_for(path)
+        return render_skeleton(pts).copy(), None
+
+    def progress(done, total):
+        if done % 500 < batch_size or done == total:
+            print(f"  CNN {done}/{total}")
+
+    result = evaluate(model, paths, prepare, batch_size=batch_size, progress=progress)
+    groups = top2(result.probs)
+    np.savez(groups_path, model=model_id, paths=keys, sha1=digests, groups=groups)
+    return groups
+
+
+def load_samples(backend=None, variant=None, batch_size=32):
+    """``(landmarks, groups, labels)`` for every dataset image with a detected hand."""
+    paths, _ = flatten(list_dataset())
+    cache, stats = landmark_cache.update(paths)
+    print(f"Landmark cache: {stats['reused']} reused, {stats['extracted']} extracted")
+    index = np.array([cache.row(p) for p in paths], dtype=np.int64)
+    index = index[cache.status[index] == landmark_cache.FOUND]
+    found = [os.path.join(cache.root, p) for p in cache.paths[index]]
+    groups = cnn_groups(cache, found, backend, variant, batch_size)
+    return cache.landmarks[index][:, :, :2], groups, cache.labels[index]
+
+
+class Scorer:
+    """Letter predictions for a fixed set of hands under changing thresholds."""
+
+    def __init__(self, landmarks, groups, labels):
+        self.features = BatchHandFeatures(landmarks)
+        self.groups = np.asarray(groups)
+        self.labels = np.asarray(labels)
+        self.engine = RuleEngine()
+
+    def predict(self, thresholds):
+        self.engine.thresholds = dict(THRESHOLDS, **thresholds)
+        return self.engine.classify_features(self.features, self.groups)
+
+    def accuracy(self, thresholds):
+        return float((self.predict(thresholds) == self.labels).mean()) if len(self.labels) else 0.0
+
+
+def coordinate_descent(scorer, thresholds, step=1, rounds=5, names=None):
+    thresholds = dict(thresholds)
+    best = scorer.accuracy(thresholds)
+    for n in range(rounds):
+        changed = False
+        for name in names or SEARCH_SPACE:
+            lo, hi = SEARCH_SPACE[name]
+            current = thresholds[name]
+            candidates = sorted(set(range(lo, hi + 1, step)) | {current}, key=lambda v: abs(v - current))
+            for value in candidates:
+                accuracy = scorer.accuracy(dict(thresholds, **{name: value}))
+                if accuracy > best:
+                    best = accuracy
+                    thresholds[name] = value
+            if thresholds[name] != current:
+                changed = True
+                print(f"  round {n + 1}: {name} {current} -> {thresholds[name]} (accuracy {best * 100:.2f}%)")
+        if not changed:
+            break
+    return thresholds, best
+
+
+def letter_report(labels, before, after):
+    report = {}
+    for letter in ascii_uppercase:
+        rows = labels == letter
+        if not rows.any():
+            continue
+        acc_before = float((before[rows] == letter).mean() * 100)
+        acc_after = float((after[rows] == letter).mean() * 100)
+        report[letter] = {'samples': int(rows.sum()), 'before': acc_before, 'after': acc_after,
+                          'delta': acc_after - acc_before}
+    return report
+
+
+def summary(labels, letters):
+    return {
+        'samples': int(len(labels)),
+        'accuracy': float((letters == labels).mean() * 100) if len(labels) else 0.0,
+        'gesture_misfires': int(np.isin(letters, GESTURES).sum()),
+    }
+
+
+def main(backend=None, variant=None, batch_size=32, held_out=0.3, seed=0, step=1, rounds=5,
+         names=None, output=OUTPUT_PATH):
+    landmarks, groups, labels = load_samples(backend, variant, batch_size)
+    if not len(labels):
+        print("No cached hands to tune on")
+        return None
+    rng = np.random.default_rng(seed)
+    tune = rng.random(len(labels)) >= held_out
+    print(f"Samples: {int(tune.sum())} tuning, {int((~tune).sum())} held out")
+
+    tuner = Scorer(landmarks[tune], groups[tune], labels[tune])
+    tuned, _ = coordinate_descent(tuner, THRESHOLDS, step=step, rounds=rounds, names=names)
+
+    # Held-out figures are only meaningful when something was held out
+    check = Scorer(landmarks[~tune], groups[~tune], labels[~tune]) if (~tune).any() else tuner
+    before = check.predict(THRESHOLDS)
+    after = check.predict(tuned)
+    report = {
+        'thresholds': tuned,
+        'changed': {name: [THRESHOLDS[name], value] for name, value in tuned.items() if value != THRESHOLDS[name]},
+        'backend': backend or BACKEND,
+        'variant': variant or VARIANT,
+        'seed': seed,
+        'tuning': {'before': summary(tuner.labels, tuner.predict(THRESHOLDS)),
+                   'after': summary(tuner.labels, tuner.predict(tuned))},
+        'held_out': {'before': summary(check.labels, before), 'after': summary(check.labels, after)},
+        'per_letter': letter_report(check.labels, before, after),
+    }
+
+    print("\n" + "=" * 60)
+    for name, (old, new) in report['changed'].items():
+        print(f"{name:<20} {old:>4} -> {new}")
+    if not report['changed']:
+        print("All thresholds already optimal on the tuning set")
+    print(f"\n{'Letter':<8}{'Samples':>8}{'Before':>9}{'After':>9}{'Delta':>9}")
+    for letter, res in report['per_letter'].items():
+        print(f"{letter:<8}{res['samples']:>8}{res['before']:>8.1f}%{res['after']:>8.1f}%{res['delta']:>+8.1f}")
+    for split in ('tuning', 'held_out'):
+        b, a = report[split]['before'], report[split]['after']
+        print(f"{split:<9} accuracy {b['accuracy']:.2f}% -> {a['accuracy']:.2f}%, "
+              f"gesture misfires {b['gesture_misfires']} -> {a['gesture_misfires']}")
+
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nTuned config saved to: {output} (use with SIGNTALK_THRESHOLDS={output})")
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Tune the rule cascade thresholds on AtoZ_3.1')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=None,
+                        help=f'Inference backend for the CNN groups (default: {BACKEND})')
+    parser.add_argument('--variant', choices=VARIANTS, default=None,
+                        help=f'Model variant (default: {VARIANT})')
+    parser.add_argument('--batch-size', type=int, default=32, help='Images per inference call (default: 32)')
+    parser.add_argument('--held-out', type=float, default=0.3, help='Fraction of images held out (default: 0.3)')
+    parser.add_argument('--seed', type=int, default=0, help='Split seed (default: 0)')
+    parser.add_argument('--step', type=int, default=1, help='Search step in pixels (default: 1)')
+    parser.add_argument('--rounds', type=int, default=5, help='Maximum coordinate-descent rounds (default: 5)')
+    parser.add_argument('--only', action='append', choices=sorted(SEARCH_SPACE),
+                        help='Threshold to tune; repeatable (default: all)')
+    parser.add_argument('--output', default=OUTPUT_PATH, help=f'Report / config path (default: {OUTPUT_PATH})')
+
+    args = parser.parse_args()
+    main(backend=args.backend, variant=args.variant, batch_size=args.batch_size, held_out=args.held_out,
+         seed=args.seed, step=args.step, rounds=args.rounds, names=args.only, output=args.output)
@@ -0,0 +1,91 @@
+"""
+Warm-up passes that take first-call costs off the user's first sign.
+
+The first CNN call builds the graph and materializes weights, and the
+first findHands call starts the MediaPipe graph. Both happen here
+instead, on the startup threads: synthetic skeletons go through the
+recognition engine and the letter rules, and blank frames go through
+every detector. Each warm-up returns its duration in seconds, so the
+startup report shows it as a component of its own.
+"""
+
+import math
+import time
+
+import numpy as np
+
+from rule_engine import classify, classify_letter
+from skeleton_renderer import SkeletonRenderer
+
+# Synthetic hand template: wrist, then per finger (thumb first)
+# the direction from the wrist in degrees off vertical and the joint radii.
+WRIST = (170, 300)
+FINGERS = (
+    (-55, (45, 80, 105, 125)),
+    (-22, (110, 150, 175, 195)),
+    (-5, (115, 160, 188, 210)),
+    (12, (110, 152, 178, 198)),
+    (28, (100, 132, 152, 170)),
+)
+
+
+def synthetic_hand(rng):
+    """One plausible lmList: the template with random curl and jitter per finger."""
+    pts = [[WRIST[0], WRIST[1], 0]]
+    for angle, radii in FINGERS:
+        curl = rng.uniform(0.35, 1.0)
+        angle = math.radians(angle + rng.uniform(-6, 6))
+        for i, radius in enumerate(radii):
+            # The knuckle stays put; the joints beyond it fold back towards the palm
+            r = radius if i == 0 else radii[0] + (radius - radii[0]) * curl
+            pts.append([int(WRIST[0] + r * math.sin(angle)), int(WRIST[1] - r * math.cos(angle)), 0])
+    return pts
+
+
+def synthetic_skeletons(count=4, seed=0, offset=29):
+    """``(pts, white)`` pairs rendered the way the realtime pipeline renders them."""
+    rng = np.random.default_rng(seed)
+    renderer = SkeletonRenderer()
+    samples = []
+    for _ in range(count):
+        pts = synthetic_hand(rng)
+        # Place the hand as locate_hand crops it: ``offset`` pixels in from the ROI corner
+        x0 = min(p[0] for p in pts) - offset
+        y0 = min(p[1] for p in pts) - offset
+        pts = [[p[0] - x0, p[1] - y0, p[2]] for p in pts]
+        xs = [p[0] for p in pts]
+        ys = [p[1] for p in pts]
+        white = renderer.render(pts, max(xs) - min(xs) + 1, max(ys) - min(ys) + 1).copy()
+        samples.append((pts, white))
+    return samples
+
+
+def warm_model(model, count=4):
+    """Run synthetic skeletons through ``model`` and the letter rules; returns seconds taken."""
+    start = time.perf_counter()
+    for pts, white in synthetic_skeletons(count):
+        if getattr(model, 'tiered', False):
+            model.fast.predict(pts)
+            prob = model.cnn.predict(white)
+        elif getattr(model, 'from_landmarks', False):
+            prob = model.predict(pts)
+        else:
+            prob = model.predict(white)
+        ch1, ch2 = np.argsort(-np.asarray(prob), kind='stable')[:2]
+        if len(prob) == 26:
+            classify_letter(chr(ord('A') + int(ch1)), pts)
+        else:
+            classify(ch1, ch2, pts)
+    return time.perf_counter() - start
+
+
+def warm_detectors(*detectors, frame_shape=(480, 640, 3)):
+    """Run a blank frame and a blank ROI-sized crop through each detector; returns seconds taken."""
+    start = time.perf_counter()
+    frame = np.zeros(frame_shape, dtype=np.uint8)
+    for detector in detectors:
+        if detector is None:
+            continue
+        detector.findHands(frame, draw=False, flipType=True)
+        detector.findHands(frame[:frame_shape[0] // 2, :frame_shape[1] // 2], draw=False, flipType=True)
+    return time.perf_counter() - start